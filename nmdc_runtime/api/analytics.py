@@ -3,68 +3,187 @@ Based on <https://github.com/tom-draper/api-analytics/tree/main/analytics/python
 under MIT License <https://github.com/tom-draper/api-analytics/blob/main/analytics/python/fastapi/LICENSE>
 """
 
+import asyncio
+import logging
 from datetime import datetime
-import threading
-from time import time
-from typing import Dict, List
+from time import perf_counter
+from typing import Dict, List, Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
-from toolz import merge
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from nmdc_runtime.api.db.mongo import get_mongo_db
 
-_requests = []
-_last_posted = datetime.now()
+# Maximum number of request events waiting to be written. Events beyond this are dropped rather than delaying requests.
+ANALYTICS_QUEUE_MAXSIZE = 10_000
 
+# Number of request events that triggers a write, even if `ANALYTICS_FLUSH_INTERVAL_S` has not elapsed.
+ANALYTICS_BATCH_SIZE = 500
 
-def _post_requests(collection: str, requests_data: List[Dict], source: str):
-    mdb = get_mongo_db()
-    mdb[collection].insert_many([merge(d, {"source": source}) for d in requests_data])
+# Maximum number of seconds a request event waits before being written.
+ANALYTICS_FLUSH_INTERVAL_S = 10.0
 
 
-def log_request(collection: str, request_data: Dict, source: str = "FastAPI"):
-    global _requests, _last_posted
-    _requests.append(request_data)
-    now = datetime.now()
-    # flush queue every minute at most
-    if (now - _last_posted).total_seconds() > 60.0:
-        threading.Thread(
-            target=_post_requests, args=(collection, _requests, source)
-        ).start()
-        _requests = []
-        _last_posted = now
+class Analytics:
+    r"""
+    A pure-ASGI middleware that records a description of each HTTP request (path, status, response time, etc.) in
+    the specified collection.
 
+    Each request only puts an event on a bounded queue (dropping the event if the queue is full). A single writer
+    task drains the queue, writing a batch (in one unordered `insert_many`) whenever `batch_size` events have
+    accumulated or `flush_interval_s` seconds have passed since the first event of the batch. Any events still
+    queued when the application shuts down are written then.
 
-class Analytics(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp, collection: str = "_runtime.analytics"):
-        super().__init__(app)
+    Since responses pass through untouched, streaming responses keep streaming.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        collection: str = "_runtime.analytics",
+        source: str = "FastAPI",
+        max_queued: int = ANALYTICS_QUEUE_MAXSIZE,
+        batch_size: int = ANALYTICS_BATCH_SIZE,
+        flush_interval_s: float = ANALYTICS_FLUSH_INTERVAL_S,
+    ):
+        self.app = app
         self.collection = collection
+        self.source = source
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_queued = max_queued
+        self.n_dropped = 0
+        self.queue: Optional[asyncio.Queue] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, self._receive_until_shutdown(receive), send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._ensure_writer()
+        start = perf_counter()
+        status_code = 500
+
+        async def send_and_note_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_note_status)
+        finally:
+            # Build a dictionary that describes the incoming request.
+            headers = Headers(scope=scope)
+            client = scope.get("client")
+            self.record(
+                {
+                    "hostname": headers.get("host", "").rsplit(":", 1)[0] or None,
+                    "ip_address": client[0] if client else None,
+                    "path": scope["path"],
+                    "user_agent": headers.get("user-agent"),
+                    "method": scope["method"],
+                    "status": status_code,
+                    "response_time": int((perf_counter() - start) * 1000),
+                    "created_at": datetime.now().isoformat(),
+                    "source": self.source,
+                }
+            )
+
+    def _ensure_writer(self):
+        r"""
+        Creates the queue and starts the writer task, if not yet done for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self.queue = asyncio.Queue(maxsize=self.max_queued)
+            self._flush_requested = asyncio.Event()
+            self._flush_timer = None
+            self._writer = loop.create_task(self._write_batches())
+
+    def record(self, request_data: Dict):
+        r"""
+        Queues the specified request event to be written, or drops it if the queue is full.
+        """
+        try:
+            self.queue.put_nowait(request_data)
+        except asyncio.QueueFull:
+            self.n_dropped += 1
+            return
+        if self.queue.qsize() >= self.batch_size:
+            self._flush_requested.set()
+        elif self._flush_timer is None:
+            self._flush_timer = self._loop.call_later(
+                self.flush_interval_s, self._flush_requested.set
+            )
+
+    def _receive_until_shutdown(self, receive: Receive) -> Receive:
+        r"""
+        Returns a `receive` callable for the ASGI "lifespan" protocol that writes any queued events, and stops the
+        writer task, before passing the "shutdown" message on to the application.
+        """
+
+        async def wrapped_receive() -> Message:
+            message = await receive()
+            if message["type"] == "lifespan.shutdown":
+                await self.aclose()
+            return message
+
+        return wrapped_receive
+
+    async def aclose(self):
+        r"""
+        Stops the writer task, and writes any events still queued.
+        """
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer, self._loop = None, None
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        await self._write_queued()
+
+    async def _write_batches(self):
+        r"""
+        Writes the queued events whenever a flush is requested, i.e. when `batch_size` events have been queued or
+        `flush_interval_s` seconds after the first event queued since the last flush.
+        """
+        while True:
+            await self._flush_requested.wait()
+            self._flush_requested.clear()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            await self._write_queued()
+
+    async def _write_queued(self):
+        while self.queue is not None and not self.queue.empty():
+            await self._write(
+                [
+                    self.queue.get_nowait()
+                    for _ in range(min(self.batch_size, self.queue.qsize()))
+                ]
+            )
+
+    async def _write(self, batch: List[Dict]):
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self.insert_many, batch)
+        except Exception as e:
+            logging.warning(f"Failed to write {len(batch)} analytics events: {e}")
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        start = time()
-        response = await call_next(request)
-
-        # Build a dictionary that describes the incoming request.
-        #
-        # Note: `request.headers` is an instance of `MultiDict`. References:
-        #       - https://www.starlette.io/requests/#headers
-        #       - https://multidict.aio-libs.org/en/stable/multidict/
-        #
-        request_data = {
-            "hostname": request.url.hostname,
-            "ip_address": request.client.host,
-            "path": request.url.path,
-            "user_agent": request.headers.get("user-agent"),
-            "method": request.method,
-            "status": response.status_code,
-            "response_time": int((time() - start) * 1000),
-            "created_at": datetime.now().isoformat(),
-        }
-
-        log_request(self.collection, request_data, "FastAPI")
-        return response
+    def insert_many(self, batch: List[Dict]):
+        get_mongo_db()[self.collection].insert_many(batch, ordered=False)
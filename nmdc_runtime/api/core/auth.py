@@ -21,6 +21,8 @@ from starlette import status
 from starlette.requests import Request
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
 
+from nmdc_runtime.api.core.util import TTLCache, hash_from_str
+
 ORCID_PRODUCTION_BASE_URL = "https://orcid.org"
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -90,6 +92,73 @@ credentials_exception = HTTPException(
 )
 
 
+# How long (in seconds) to reuse the principal (user or site) that a bearer token was resolved to.
+#
+# Note: `forget_cached_principals` only empties the cache of the process that changed a user or site, so in a
+#       deployment with several API processes, a change (e.g. disabling a user, or revoking a permission or site
+#       client) takes up to this long to take effect in the other processes. This is kept as short as the window
+#       for token invalidation (`INVALIDATED_TOKEN_CHECK_TTL_S`).
+PRINCIPAL_CACHE_TTL_S = 5
+
+# How long (in seconds) to reuse the result of checking whether a token has been invalidated. A token
+# invalidated (in the `invalidated_tokens` collection) is rejected by every process within this time.
+INVALIDATED_TOKEN_CHECK_TTL_S = 5
+
+# Maps (principal kind, token hash) to (principal, expiration timestamp of token).
+_principal_cache = TTLCache(maxsize=10_000, ttl=PRINCIPAL_CACHE_TTL_S)
+
+# Maps token hash to whether the token has been invalidated.
+_token_invalidated = TTLCache(maxsize=10_000, ttl=INVALIDATED_TOKEN_CHECK_TTL_S)
+
+
+def token_hash(token: str) -> str:
+    return hash_from_str(token, algo="sha256")
+
+
+def get_cached_principal(kind: str, token: str):
+    r"""
+    Returns the principal of the specified kind (e.g. "user" or "site") that the specified token was
+    recently resolved to, if any, provided the token has not expired in the meantime.
+    """
+    entry = _principal_cache.get((kind, token_hash(token)))
+    if entry is None:
+        return None
+    principal, expires_at = entry
+    if expires_at is not None and expires_at <= datetime.now(timezone.utc).timestamp():
+        return None
+    return principal
+
+
+def cache_principal(kind: str, token: str, principal, expires_at: Optional[float]):
+    _principal_cache.set((kind, token_hash(token)), (principal, expires_at))
+
+
+def forget_cached_principals():
+    r"""
+    Empties this process's principal cache. Call this after changing users or sites (e.g. their permissions),
+    so that the change takes effect immediately in this process for bearer tokens that were already in use (other
+    processes pick it up within `PRINCIPAL_CACHE_TTL_S` seconds).
+    """
+    _principal_cache.clear()
+
+
+def is_token_invalidated(mdb, token: str) -> bool:
+    r"""
+    Returns `True` if the specified token has been invalidated (e.g. upon logout).
+
+    The result for a given token is reused for `INVALIDATED_TOKEN_CHECK_TTL_S` seconds, so that a burst of requests
+    bearing the same token makes a single lookup in the `invalidated_tokens` collection.
+    """
+    key = token_hash(token)
+    invalidated = _token_invalidated.get(key)
+    if invalidated is None:
+        invalidated = (
+            mdb.invalidated_tokens.find_one({"_id": token}, ["_id"]) is not None
+        )
+        _token_invalidated.set(key, invalidated)
+    return invalidated
+
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -1,8 +1,16 @@
+import random
+import threading
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import List
 
 import base32_lib as base32
+from base32_lib.base32 import ENCODING_CHARS as BASE32_CHARS
+from pymongo.collection import Collection as MongoCollection
 from pymongo.database import Database as MongoDatabase
+from pymongo.errors import BulkWriteError
+
+from nmdc_runtime.api.core.util import TTLCache
 
 
 def generate_id(length=10, split_every=4, checksum=True) -> str:
@@ -24,6 +32,46 @@ def generate_id(length=10, split_every=4, checksum=True) -> str:
     return base32.generate(length=length, split_every=split_every, checksum=checksum)
 
 
+_system_random = random.SystemRandom()
+
+# Maps each 10-bit number to its two-character base32 encoding.
+_BASE32_PAIRS = [a + b for a in BASE32_CHARS for b in BASE32_CHARS]
+
+# Maps `number % 97` to the ISO 7064 checksum digits that `base32.encode` appends for `number`.
+_CHECKSUM_DIGITS = ["{:02d}".format(97 - ((100 * r) % 97) + 1) for r in range(97)]
+
+
+def generate_ids_batch(n: int, length=8, checksum=True) -> List[str]:
+    """Generate `n` random base32 strings, equivalent to `n` calls of `generate_id(length, split_every=0, checksum)`.
+
+    Draws the random bits for the whole batch at once and encodes them with precomputed lookup tables, which is much
+    faster than generating one ID at a time when minting in bulk. The returned strings are not necessarily distinct.
+
+    >>> blades = generate_ids_batch(3, length=8)
+    >>> len(blades), all(len(b) == 8 for b in blades)
+    (3, True)
+    >>> all(isinstance(decode_id(b), int) for b in blades)  # checksums validate
+    True
+    """
+    n_chars = length - 2 if checksum else length
+    n_bits = n_chars * 5
+    n_bytes = (n_bits + 7) // 8
+    mask = (1 << n_bits) - 1
+    pair_shifts = range((n_chars // 2) * 10 - 10, -1, -10)
+    lead_shift = n_bits - 5 if n_chars % 2 else None
+    raw = _system_random.randbytes(n * n_bytes)
+    blades = []
+    for i in range(0, n * n_bytes, n_bytes):
+        number = int.from_bytes(raw[i : i + n_bytes], "big") & mask
+        blade = "".join([_BASE32_PAIRS[(number >> s) & 1023] for s in pair_shifts])
+        if lead_shift is not None:
+            blade = BASE32_CHARS[number >> lead_shift] + blade
+        if checksum:
+            blade += _CHECKSUM_DIGITS[number % 97]
+        blades.append(blade)
+    return blades
+
+
 def decode_id(encoded: str, checksum=True) -> int:
     """Decodes generated string ID (via `generate_id`) to a number.
 
@@ -55,6 +103,8 @@ def encode_id(number: int, split_every=4, min_length=10, checksum=True) -> int:
     )
 
 
+DUPLICATE_KEY_ERROR_CODE = 11000
+
 # sping: "semi-opaque string" (https://n2t.net/e/n2t_apidoc.html).
 SPING_SIZE_THRESHOLDS = [(n, (2 ** (5 * n)) // 2) for n in [2, 4, 6, 8, 10]]
 
@@ -63,6 +113,26 @@ def collection_name(naa, shoulder):
     return f"ids_{naa}_{shoulder}"
 
 
+# How long (in seconds) to reuse the estimated number of ids minted on a shoulder.
+ID_COUNT_TTL_S = 60
+
+# Maps (database name, collection name) to the estimated number of ids in that collection.
+_estimated_id_counts = TTLCache(maxsize=1_000, ttl=ID_COUNT_TTL_S)
+
+
+def estimated_id_count(collection: MongoCollection) -> int:
+    r"""
+    Returns an estimate of the number of ids in the specified collection (which only informs the length of
+    newly-generated ids), taken from the collection's metadata and reused for `ID_COUNT_TTL_S` seconds.
+    """
+    key = (collection.database.name, collection.name)
+    count = _estimated_id_counts.get(key)
+    if count is None:
+        count = collection.estimated_document_count()
+        _estimated_id_counts.set(key, count)
+    return count
+
+
 def generate_ids(
     mdb: MongoDatabase,
     owner: str,
@@ -72,56 +142,83 @@ def generate_ids(
     naa: str = "nmdc",
     shoulder: str = "fk4",
 ) -> List[str]:
+    return [
+        d["where"]
+        for d in _mint_id_docs(mdb, owner, populator, number, ns, naa, shoulder)
+    ]
+
+
+def _mint_id_docs(
+    mdb: MongoDatabase,
+    owner: str,
+    populator: str,
+    number: int,
+    ns: str = "",
+    naa: str = "nmdc",
+    shoulder: str = "fk4",
+) -> List[dict]:
     collection = mdb.get_collection(collection_name(naa, shoulder))
     n_chars = next(
         (
             n
             for n, t in SPING_SIZE_THRESHOLDS
-            if (number + collection.count_documents({})) < t
+            if (number + estimated_id_count(collection)) < t
         ),
         12,
     )
     collected = []
 
-    while True:
+    while len(collected) < number:
         eids = set()
         n_to_generate = number - len(collected)
         while len(eids) < n_to_generate:
-            eids.add(generate_id(length=(n_chars + 2), split_every=0, checksum=True))
-        eids = list(eids)
-        deids = [decode_id(eid) for eid in eids]
-        taken = {d["_id"] for d in collection.find({"_id": {"$in": deids}}, {"_id": 1})}
-        not_taken = [
-            (eid, eid_decoded)
-            for eid, eid_decoded in zip(eids, deids)
-            if eid_decoded not in taken
+            eids.update(
+                generate_ids_batch(n_to_generate - len(eids), length=(n_chars + 2))
+            )
+        # All attribute names beginning with "__a" are reserved...
+        # https://github.com/jkunze/n2t-eggnog/blob/0f0f4c490e6dece507dba710d3557e29b8f6627e/egg#L1882
+        # XXX mongo is a pain with '.'s in field names, so not using e.g. "_.e" names.
+        when = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        docs = [
+            {
+                "@context": "https://n2t.net/e/n2t_apidoc.html#identifier-metadata",
+                "_id": decode_id(eid),
+                "who": populator,
+                "what": (f"{ns}/{eid}" if ns else "(:tba) Work in progress"),
+                "when": when,
+                "how": shoulder,
+                "where": f"{naa}:{shoulder}{eid}",
+                "__as": "reserved",  # status, public|reserved|unavailable
+                "__ao": owner,  # owner
+                "__ac": when,  # created
+            }
+            for eid in eids
         ]
-        if not_taken:
-            # All attribute names beginning with "__a" are reserved...
-            # https://github.com/jkunze/n2t-eggnog/blob/0f0f4c490e6dece507dba710d3557e29b8f6627e/egg#L1882
-            # XXX mongo is a pain with '.'s in field names, so not using e.g. "_.e" names.
-            docs = [
-                {
-                    "@context": "https://n2t.net/e/n2t_apidoc.html#identifier-metadata",
-                    "_id": eid_decoded,
-                    "who": populator,
-                    "what": (f"{ns}/{eid}" if ns else "(:tba) Work in progress"),
-                    "when": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-                    "how": shoulder,
-                    "where": f"{naa}:{shoulder}{eid}",
-                    "__as": "reserved",  # status, public|reserved|unavailable
-                    "__ao": owner,  # owner
-                    "__ac": datetime.now(timezone.utc).isoformat(
-                        timespec="seconds"
-                    ),  # created
-                }
-                for eid, eid_decoded in not_taken
-            ]
-            collection.insert_many(docs)
+        # Let the unique `_id` index detect ids that are already taken, rather than checking beforehand.
+        try:
+            collection.insert_many(docs, ordered=False)
             collected.extend(docs)
-        if len(collected) == number:
-            break
-    return [d["where"] for d in collected]
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            if e.details.get("writeConcernErrors") or any(
+                err["code"] != DUPLICATE_KEY_ERROR_CODE for err in write_errors
+            ):
+                raise
+            taken = {err["index"] for err in write_errors}
+            collected.extend(d for i, d in enumerate(docs) if i not in taken)
+    return collected
+
+
+# Number of system ids each process reserves at a time, per shoulder, for `generate_one_id`.
+#
+# Note: The ids a process has reserved but not handed out are released (deleted) by `release_reserved_ids` when
+#       the API shuts down. If a process exits without shutting down (e.g. it crashes or is killed), up to this
+#       many ids per shoulder remain reserved but are never handed out, so this is kept small.
+ID_BLOCK_SIZE = 20
+
+# Maps (database name, shoulder) to ids reserved by this process but not yet handed out.
+_reserved_id_docs = defaultdict(list)
+_reserved_id_docs_lock = threading.Lock()
 
 
 def generate_one_id(
@@ -133,16 +230,48 @@ def generate_one_id(
 
     Can associate ID with namespace ns to facilitate ID deletion/recycling.
 
+    IDs are reserved in blocks of `ID_BLOCK_SIZE`, so most calls take an ID from memory (and, if `ns` is specified,
+    record the association in a single update). IDs are random, so those handed out by different processes (or by
+    one process over time) are in no particular order.
+    """
+    key = (mdb.name, shoulder)
+    with _reserved_id_docs_lock:
+        if not _reserved_id_docs[key]:
+            _reserved_id_docs[key] = _mint_id_docs(
+                mdb,
+                owner="_system",
+                populator="_system",
+                number=ID_BLOCK_SIZE,
+                naa="nmdc",
+                shoulder=shoulder,
+            )
+        doc = _reserved_id_docs[key].pop()
+    if ns:
+        eid = doc["where"].split(":", maxsplit=1)[1][len(shoulder) :]
+        mdb.get_collection(collection_name("nmdc", shoulder)).update_one(
+            {"_id": doc["_id"]}, {"$set": {"what": f"{ns}/{eid}"}}
+        )
+    return doc["where"]
+
+
+def release_reserved_ids(mdb: MongoDatabase) -> int:
+    r"""
+    Deletes the system ids that this process reserved (see `generate_one_id`) in the specified database but did not
+    hand out, so that they are not left reserved forever, and returns the number of ids released.
     """
-    return generate_ids(
-        mdb,
-        owner="_system",
-        populator="_system",
-        number=1,
-        ns=ns,
-        naa="nmdc",
-        shoulder=shoulder,
-    )[0]
+    n_released = 0
+    with _reserved_id_docs_lock:
+        for db_name, shoulder in list(_reserved_id_docs):
+            if db_name != mdb.name:
+                continue
+            docs = _reserved_id_docs.pop((db_name, shoulder))
+            if docs:
+                n_released += (
+                    mdb.get_collection(collection_name("nmdc", shoulder))
+                    .delete_many({"_id": {"$in": [d["_id"] for d in docs]}})
+                    .deleted_count
+                )
+    return n_released
 
 
 def local_part(id_):
@@ -1,27 +1,38 @@
 import builtins
 import inspect
-import json
 from collections import defaultdict, namedtuple
 from functools import lru_cache
 from io import StringIO
 from pathlib import Path
 from types import ModuleType
-from typing import Optional, Dict, List, Tuple, Any, Union
+from typing import Callable, Optional, Dict, List, Tuple, Any, Union
 
-from bson.json_util import dumps as bson_dumps
+from bson import ObjectId
 import pandas as pd
 import pandas as pds
 from fastapi import HTTPException
-from jsonschema import Draft7Validator
+import fastjsonschema
 from linkml_runtime.utils.schemaview import SchemaView
 from nmdc_schema import nmdc
 from nmdc_schema.nmdc_data import get_nmdc_schema_definition
+from pymongo import UpdateOne
+from pymongo.collection import Collection
 from pymongo.database import Database as MongoDatabase
+from pymongo.errors import BulkWriteError
 from starlette import status
-from toolz.dicttoolz import dissoc, assoc_in, get_in
+from toolz.dicttoolz import assoc_in, get_in
 
+from nmdc_runtime.api.core.util import now
+from nmdc_runtime.api.db.mongo import (
+    get_collection_name_for_id,
+    get_collection_names_for_ids,
+)
 from nmdc_runtime.api.models.metadata import ChangesheetIn
-from nmdc_runtime.util import get_nmdc_jsonschema_dict, collection_name_to_class_names
+from nmdc_runtime.util import (
+    collection_name_to_class_names,
+    get_nmdc_jsonschema_collection_validator,
+    get_nmdc_jsonschema_draft7_validator,
+)
 
 # custom named tuple to hold path property information
 SchemaPathProperties = namedtuple(
@@ -66,161 +77,182 @@ def load_changesheet(
     """
     # load dataframe replacing NaN with ''
     df = pds.read_csv(filename, sep=sep, dtype="string").fillna("")
-    # df = pds.read_csv(filename, sep=sep, dtype="string")
-
-    # add a group id column, but copy only IRIs (has ":" in it)
-    try:
-        df["group_id"] = df["id"].map(lambda x: x if ":" in x else "")
-    except KeyError:
-        raise ValueError("change sheet lacks 'id' column.")
-
-    # fill in blank group ids
-    for i in range(len(df)):
-        if len(str(df.loc[i, "group_id"]).strip()) < 1:
-            df.loc[i, "group_id"] = df.loc[i - 1, "group_id"]
-
-    # fill in blank action columns
-    try:
-        for i in range(len(df)):
-            if len(str(df.loc[i, "action"]).strip()) < 1:
-                df.loc[i, "action"] = df.loc[i - 1, "action"]
-    except KeyError:
-        raise ValueError("change sheet lacks 'action' column.")
+    for column in ("id", "action", "attribute"):
+        if column not in df.columns:
+            raise ValueError(f"change sheet lacks '{column}' column.")
+
+    # add a group id column, but copy only IRIs (has ":" in it),
+    # and fill in blank group ids and blank action columns from the rows above
+    df["group_id"] = forward_fill_blanks(
+        df["id"].where(df["id"].str.contains(":", regex=False), "")
+    )
+    df["action"] = forward_fill_blanks(df["action"])
 
     # build dict to hold variables that have been defined
     # in the id column of the change sheet
-    try:
-        # collect vars in the id column
-        var_dict = {
-            id_val: None
-            for id_val, attr in df[["id", "attribute"]].values
-            if len(id_val) > 0 and ":" not in id_val
-        }
-    except KeyError:
-        # note the presence of the id column is checked above
-        raise ValueError("change sheet lacks 'attribute' column.")
+    ids, attributes, values = (
+        df["id"].tolist(),
+        df["attribute"].tolist(),
+        df["value"].tolist(),
+    )
+    var_dict = {id_val: None for id_val in ids if len(id_val) > 0 and ":" not in id_val}
 
     # add group_var column to hold values from the id column
     # that are being used varialbe/blank nodes
-    # df["group_var"] = df["id"].map(lambda x: x if not (":" in x) else "")
-    df["group_var"] = ""
-    for ix, id_val, attr, value in df[["id", "attribute", "value"]].itertuples():
-        if id_val in var_dict.keys() and value in var_dict.keys():
+    group_vars = []
+    for id_val, attr, value in zip(ids, attributes, values):
+        if id_val in var_dict and value in var_dict:
             var_dict[value] = f"{var_dict[id_val]}.{attr}"
             var_dict[f"{id_val}.{value}"] = f"{var_dict[id_val]}.{attr}"
-            df.loc[ix, "group_var"] = f"{id_val}.{value}"
-        elif value in var_dict.keys():
+            group_vars.append(f"{id_val}.{value}")
+        elif value in var_dict:
             var_dict[value] = attr
-            df.loc[ix, "group_var"] = value
-        elif id_val in var_dict.keys():
-            df.loc[ix, "group_var"] = id_val
+            group_vars.append(value)
+        elif id_val in var_dict:
+            group_vars.append(id_val)
+        else:
+            group_vars.append("")
+    df["group_var"] = group_vars
 
     # add path column used to hold the path in the data to the data that will be changed
     # e.g. principal_investigator.name
-    df["path"] = ""
-    # split into id groups, this allow each id group to have its own local variables
-    # i.e., same var name can be used with different ids
-    group_ids = df.groupby("group_id")
+    # - if group_var is empty, it is a simple property
+    # - otherwise, it is a nested property, and if the value is not a var, then we are at bottom level
+    df["path"] = [
+        (
+            attr
+            if group_var == ""
+            else (f"{var_dict[group_var]}.{attr}" if value not in var_dict else "")
+        )
+        for attr, value, group_var in zip(attributes, values, group_vars)
+    ]
+
+    # add collection for each id, resolving all ids at once
+    group_ids = df["group_id"].unique().tolist()
+    collection_name_for_id = get_collection_names_for_ids(mongodb, group_ids)
     for group_id in group_ids:
-        df_id = group_id[1]  # dataframe for value group_id
-
-        # split into var groups
-        var_groups = df_id.groupby("group_var")
-        for var_group in var_groups:
-            # var = var_group[0]  # value of group_var
-            df_var = var_group[1]  # dataframe for value group_var
-
-            for ix, attr, value, group_var in df_var[
-                ["attribute", "value", "group_var"]
-            ].itertuples():
-                # if group_var is empty, it is a simple property
-                if "" == group_var:
-                    df.loc[ix, "path"] = attr
-
-                # otherwise, it is a nested property
-                # if the value is not a var, then we are at bottom level
-                elif value not in var_dict.keys():
-                    df.loc[ix, "path"] = f"{var_dict[group_var]}.{attr}"
-
-    # create map between id and collection
-    id_dict = map_id_to_collection(mongodb)
-    # add collection for each id
-    df["collection_name"] = ""
-    prev_id = ""
-    for ix, group_id in df[["group_id"]].itertuples():
-        # check if there is a new id
-        if group_id != prev_id:
-            prev_id = group_id  # update prev id
-            collection_name = get_collection_for_id(group_id, id_dict)
-
-            if collection_name is None:
-                raise Exception("Cannot find ID", group_id, "in any collection")
-
-        df.loc[ix, "collection_name"] = collection_name
-
-    # add linkml class name for each id
-    df["linkml_class"] = ""
+        if group_id not in collection_name_for_id:
+            raise Exception("Cannot find ID", group_id, "in any collection")
+    df["collection_name"] = df["group_id"].map(collection_name_for_id)
+
+    # add linkml class name for each id, reading the `type` of all documents in a collection at once
     class_name_dict = map_schema_class_names(nmdc)
-    for ix, id_, collection_name in df[["group_id", "collection_name"]].itertuples():
-        data = mongodb[collection_name].find_one({"id": id_})
-
-        # find the type of class the data instantiates
-        if "type" in list(data.keys()):
-            # get part after the ":"
-            class_name = data["type"].split(":")[-1]
-            class_name = class_name_dict[class_name]
-        else:
-            class_names = collection_name_to_class_names[collection_name]
-            if len(class_names) > 1:
-                raise ValueError(
-                    "cannot unambiguously infer class of document"
-                    f" with `id` {id_} in collection {collection_name}."
-                    " Please ensure explicit `type` is present in document."
-                )
-            class_name = class_name_dict[class_names[0]]
-
-        # set class name for id
-        df["linkml_class"] = class_name
-
-    # info about properties of slots in the property path
-    df["linkml_slots"] = ""
-    df["ranges"] = ""
-    df["multivalues"] = ""
-    sd = get_nmdc_schema_definition()
-    view = SchemaView(sd)
-    for ix, attribute, path, class_name in df[
-        ["attribute", "path", "linkml_class"]
-    ].itertuples():
-        # fetch the properites for the path
-        if len(path) > 0:
-            spp = fetch_schema_path_properties(view, path, class_name)
-        else:
-            spp = fetch_schema_path_properties(view, attribute, class_name)
+    ids_by_collection_name = defaultdict(list)
+    for id_, collection_name in collection_name_for_id.items():
+        ids_by_collection_name[collection_name].append(id_)
+    class_name_for_id = {}
+    for collection_name, ids_in_collection in ids_by_collection_name.items():
+        for data in mongodb[collection_name].find(
+            {"id": {"$in": ids_in_collection}}, {"_id": 0, "id": 1, "type": 1}
+        ):
+            # find the type of class the data instantiates
+            if "type" in data:
+                # get part after the ":"
+                class_name = class_name_dict[data["type"].split(":")[-1]]
+            else:
+                class_names = collection_name_to_class_names[collection_name]
+                if len(class_names) > 1:
+                    raise ValueError(
+                        "cannot unambiguously infer class of document"
+                        f" with `id` {data['id']} in collection {collection_name}."
+                        " Please ensure explicit `type` is present in document."
+                    )
+                class_name = class_name_dict[class_names[0]]
+            class_name_for_id[data["id"]] = class_name
+    df["linkml_class"] = df["group_id"].map(class_name_for_id)
+
+    # info about properties of slots in the property path, fetched once per (path, class) pair
+    view = get_changesheet_schema_view()
+    path_keys = [
+        (path if len(path) > 0 else attribute, class_name)
+        for attribute, path, class_name in df[
+            ["attribute", "path", "linkml_class"]
+        ].itertuples(index=False)
+    ]
+    path_properties = {
+        key: fetch_schema_path_properties(view, *key)
+        for key in dict.fromkeys(path_keys)
+    }
+    df["linkml_slots"] = [str.join("|", path_properties[k].slots) for k in path_keys]
+    df["ranges"] = [str.join("|", path_properties[k].ranges) for k in path_keys]
+    df["multivalues"] = [
+        str.join("|", path_properties[k].multivalues) for k in path_keys
+    ]
 
-        df.loc[ix, "linkml_slots"] = str.join("|", spp.slots)
-        df.loc[ix, "ranges"] = str.join("|", spp.ranges)
-        df.loc[ix, "multivalues"] = str.join("|", spp.multivalues)
+    # coerce each value to the python builtin type for its range, determined once per range
+    coercers = {
+        ranges: get_value_coercer(view, ranges.rsplit("|", maxsplit=1)[-1])
+        for ranges in df["ranges"].unique()
+    }
     df = df.astype({"value": object})
-    for ix, value, ranges in list(df[["value", "ranges"]].itertuples()):
-        # Infer python builtin type for coercion via <https://w3id.org/linkml/base>.
-        # If base is member of builtins module, e.g. `int` or `float`, coercion will succeed.
-        # Otherwise, keep value as is (as a `str`).
-        # Note: Mongo BSON has a decimal type,
-        # but e.g. <https://w3id.org/nmdc/DecimalDegree> has a specified `base` of `float`
-        # and I think it's best to not "re-interpret" what LinkML specifies. Can revisit this decision
-        # by e.g. overriding `base` when `uri` is a "known" type (`xsd:decimal` in the case of DecimalDegree).
-        try:
-            base_type = view.induced_type(ranges.rsplit("|", maxsplit=1)[-1]).base
-            if base_type == "Decimal":
-                # Note: Use of bson.decimal128.Decimal128 here would require changing JSON encoding/decoding.
-                # Choosing to use `float` to preserve existing (expected) behavior.
-                df.at[ix, "value"] = float(value)
-            df.at[ix, "value"] = getattr(builtins, base_type)(value)
-        except:
-            continue
+    df["value"] = [
+        coerce_value(value, coercers[ranges])
+        for value, ranges in zip(df["value"].tolist(), df["ranges"].tolist())
+    ]
     return df
 
 
+def forward_fill_blanks(column: pds.Series) -> pds.Series:
+    r"""
+    Returns a copy of the specified column in which each blank (empty or whitespace-only) value is replaced with the
+    nearest non-blank value above it (or with "" if there is none).
+
+    >>> forward_fill_blanks(pds.Series(["a", "", " ", "b", ""], dtype="string")).tolist()
+    ['a', 'a', 'a', 'b', 'b']
+    """
+    return column.mask(column.str.strip() == "").ffill().fillna("")
+
+
+@lru_cache
+def get_changesheet_schema_view() -> SchemaView:
+    r"""
+    Returns a `SchemaView` of the NMDC Schema, shared by all changesheets (so that the results of
+    `fetch_schema_path_properties`, which is memoized per view, are shared too).
+    """
+    return SchemaView(get_nmdc_schema_definition())
+
+
+def get_value_coercer(view: SchemaView, range_name: str) -> Optional[Callable]:
+    r"""
+    Returns the python builtin type that values of the specified range should be coerced to, or `None` if they should
+    be kept as they are (as `str`s).
+
+    The type is inferred via <https://w3id.org/linkml/base>. If the base is a member of the builtins module, e.g.
+    `int` or `float`, coercion will succeed. Otherwise, the value is kept as is.
+
+    Note: Mongo BSON has a decimal type, but e.g. <https://w3id.org/nmdc/DecimalDegree> has a specified `base` of
+          `float` and I think it's best to not "re-interpret" what LinkML specifies. Can revisit this decision by e.g.
+          overriding `base` when `uri` is a "known" type (`xsd:decimal` in the case of DecimalDegree).
+    """
+    try:
+        base_type = view.induced_type(range_name).base
+    except Exception:
+        return None
+    if base_type == "Decimal":
+        # Note: Use of bson.decimal128.Decimal128 here would require changing JSON encoding/decoding.
+        # Choosing to use `float` to preserve existing (expected) behavior.
+        return float
+    if not isinstance(base_type, str):
+        return None
+    return getattr(builtins, base_type, None)
+
+
+def coerce_value(value: Any, coercer: Optional[Callable]) -> Any:
+    r"""
+    Returns the specified value coerced via the specified coercer (see `get_value_coercer`), or the value as is if
+    there is no coercer or coercion fails.
+
+    >>> coerce_value("5.58", float), coerce_value("n/a", float), coerce_value("x", None)
+    (5.58, 'n/a', 'x')
+    """
+    if coercer is None:
+        return value
+    try:
+        return coercer(value)
+    except Exception:
+        return value
+
+
 def map_schema_class_names(nmdc_mod: ModuleType) -> Dict[str, str]:
     """Returns dict that maps the classes in the nmdc.py module (within the NMDC Schema PyPI library)
        to the class names used in the linkml schema.
@@ -336,26 +368,24 @@ def make_vargroup_updates(df: pds.DataFrame) -> List:
     List
         A list of Mongo update commands for that grouping variable.
     """
-    id_ = df["group_id"].values[0]
+    return _make_vargroup_updates(
+        df["group_id"].values[0],
+        df[["action", "attribute", "value", "path", "multivalues"]].itertuples(
+            index=False
+        ),
+    )
+
+
+def _make_vargroup_updates(id_: str, rows) -> List:
+    r"""
+    Does the work of `make_vargroup_updates`, given the `id` and the `(action, attribute, value, path, multivalues)`
+    rows of the grouping variable.
+    """
     path_multivalued_dict = {}
     update_key = ""
     path_lists = []
     obj_dict = {}
-    for (
-        action,
-        attribute,
-        value,
-        path,
-        multivalues,
-    ) in df[
-        [
-            "action",
-            "attribute",
-            "value",
-            "path",
-            "multivalues",
-        ]
-    ].itertuples(index=False):
+    for action, attribute, value, path, multivalues in rows:
         if len(path) < 1:
             update_key = attribute
         else:
@@ -428,21 +458,17 @@ def make_updates(var_group: Tuple) -> List:
     # group_var = var_group[0]  # the value (if any) in the group_var column
     df = var_group[1]  # dataframe with group_var variables
     id_ = df["group_id"].values[0]  # get id for group
+    return _make_updates(
+        id_, df[["action", "value", "path", "multivalues"]].itertuples(index=False)
+    )
+
 
+def _make_updates(id_: str, rows) -> List:
+    r"""
+    Does the work of `make_updates`, given the `id` and the `(action, value, path, multivalues)` rows of the group.
+    """
     updates = []  # collected properties/values to updated
-    for (
-        action,
-        value,
-        path,
-        multivalues,
-    ) in df[
-        [
-            "action",
-            "value",
-            "path",
-            "multivalues",
-        ]
-    ].itertuples(index=False):
+    for action, value, path, multivalues in rows:
         # note: if a path is present, there is a value to be updated
         if len(path) > 0:
             update_dict = {}  # holds the values for the update query
@@ -538,34 +564,8 @@ def make_mongo_update_command_dict(
     return update_dict
 
 
-def map_id_to_collection(mongodb: MongoDatabase) -> Dict:
-    """Returns dict using the collection name as a key and the ids of documents as values.
-
-    Parameters
-    ----------
-    mongodb : MongoDatabase
-        The Mongo database on which to build the dict.
-
-    Returns
-    -------
-    Dict
-        Dict mapping collection names to the set of document ids in the collection.
-        key: collection name
-        value: set(id of document)
-    """
-    collection_names = [
-        name for name in mongodb.list_collection_names() if name.endswith("_set")
-    ]
-    id_dict = {
-        name: set(mongodb[name].distinct("id"))
-        for name in collection_names
-        if "id_1" in mongodb[name].index_information()
-    }
-    return id_dict
-
-
 def get_collection_for_id(
-    id_: str, id_map: Dict, replace_underscore: bool = False
+    id_: str, mongodb: MongoDatabase, replace_underscore: bool = False
 ) -> Optional[str]:
     """
     Returns the name of the collect that contains the document idenfied by the id.
@@ -574,10 +574,10 @@ def get_collection_for_id(
     ----------
     id_ : str
         The identifier of the document.
-    id_map : Dict
-        A dict mapping collection names to document ids.
-        key: collection name
-        value: set of document ids
+    mongodb : MongoDatabase
+        The Mongo database containing the document. Its id-routing collection
+        (see `nmdc_runtime.api.db.mongo.get_collection_name_for_id`) is used to
+        resolve the collection name.
     replace_underscore : bool
         If true, underscores in the collection name are replaced with spaces.
 
@@ -587,13 +587,10 @@ def get_collection_for_id(
         Collection name containing the document.
         None if the id was not found.
     """
-    for collection_name in id_map:
-        if id_ in id_map[collection_name]:
-            if replace_underscore is True:
-                return collection_name.replace("_", " ")
-            else:
-                return collection_name
-    return None
+    collection_name = get_collection_name_for_id(mongodb, id_)
+    if collection_name is not None and replace_underscore is True:
+        return collection_name.replace("_", " ")
+    return collection_name
 
 
 def mongo_update_command_for(df_change: pds.DataFrame) -> Dict[str, list]:
@@ -612,36 +609,60 @@ def mongo_update_command_for(df_change: pds.DataFrame) -> Dict[str, list]:
         key: collection name
         value: list of update commands
     """
-    update_cmd = {}  # list of dicts to hold mongo update queries
-
-    # split data into groups by values in the group_id column (e.g., gold:Gs0103573)
-    id_group = df_change.groupby("group_id")
-    for ig in id_group:
-        # ig[0] -> id_: group_id for data
-        # ig[1] -> df_id: dataframe with rows having the group_id
-        id_, df_id = ig
+    # split data into groups by values in the group_id column (e.g., gold:Gs0103573),
+    # and then by values in the group_var column (e.g, v1, v2), in a single pass over the rows
+    rows_by_group = defaultdict(lambda: defaultdict(list))
+    collection_name_for_id = {}
+    for row in df_change[
+        [
+            "group_id",
+            "group_var",
+            "collection_name",
+            "action",
+            "attribute",
+            "value",
+            "path",
+            "multivalues",
+        ]
+    ].itertuples(index=False):
+        rows_by_group[row.group_id][row.group_var].append(row)
+        collection_name_for_id.setdefault(row.group_id, row.collection_name)
 
-        # split data into groups by values in the group_var column (e.g, v1, v2)
-        var_group = df_id.groupby("group_var")
+    update_cmd = {}  # list of dicts to hold mongo update queries
+    for id_ in sorted(rows_by_group):
         ig_updates = []  # update commands for the id group
-        for vg in var_group:
-            # vg[0] -> group_var for data
-            # vg[1] -> dataframe with rows having the group_var
-            if len(vg[0].strip()) > 0:
-                ig_updates.extend(make_vargroup_updates(vg[1]))
+        for group_var, rows in sorted(rows_by_group[id_].items()):
+            if len(group_var.strip()) > 0:
+                ig_updates.extend(
+                    _make_vargroup_updates(
+                        id_,
+                        (
+                            (r.action, r.attribute, r.value, r.path, r.multivalues)
+                            for r in rows
+                        ),
+                    )
+                )
             else:
-                ig_updates.extend(make_updates(vg))
+                ig_updates.extend(
+                    _make_updates(
+                        id_, ((r.action, r.value, r.path, r.multivalues) for r in rows)
+                    )
+                )
 
         # add update commands for the group id to dict
         update_cmd[id_] = {
-            "update": df_id["collection_name"].values[0],
+            "update": collection_name_for_id[id_],
             "updates": ig_updates,
         }
     return update_cmd
 
 
 def copy_docs_in_update_cmd(
-    update_cmd, mdb_from: MongoDatabase, mdb_to: MongoDatabase, drop_mdb_to: bool = True
+    update_cmd,
+    mdb_from: MongoDatabase,
+    mdb_to: MongoDatabase,
+    drop_mdb_to: bool = True,
+    collection_name_prefix: str = "",
 ) -> Dict[str, str]:
     """
     Copies data between Mongo databases.
@@ -653,6 +674,8 @@ def copy_docs_in_update_cmd(
         Database from which data being copied (i.e., source).
     mdb_to: MongoDatabase
         Datbase which data is being copied into (i.e., destination).
+    collection_name_prefix : str
+        Prefix of the names of the collections (in `mdb_to`) which data is being copied into.
 
     Returns
     -------
@@ -668,78 +691,221 @@ def copy_docs_in_update_cmd(
         mdb_to.client.drop_database(mdb_to.name)
     results = {}
     for collection_name, ids in doc_specs.items():
-        docs = [
-            dissoc(d, "_id")
-            for d in mdb_from[collection_name].find({"id": {"$in": ids}})
-        ]
-        results[collection_name] = (
-            f"{len(mdb_to[collection_name].insert_many(docs).inserted_ids)} docs inserted"
-        )
+        docs = list(mdb_from[collection_name].find({"id": {"$in": ids}}, {"_id": 0}))
+        to_collection = mdb_to[collection_name_prefix + collection_name]
+        n_inserted = len(to_collection.insert_many(docs).inserted_ids) if docs else 0
+        results[collection_name] = f"{n_inserted} docs inserted"
     return results
 
 
-def update_mongo_db(mdb: MongoDatabase, update_cmd: Dict):
+# Maximum number of update statements sent to the database in one `bulk_write` call.
+CHANGESHEET_BULK_WRITE_BATCH_SIZE = 1_000
+
+
+def update_mongo_db(
+    mdb: MongoDatabase,
+    update_cmd: Dict,
+    batch_size: int = CHANGESHEET_BULK_WRITE_BATCH_SIZE,
+    collection_name_prefix: str = "",
+):
     """
     Updates the Mongo database using commands in the update_cmd dict.
 
+    The documents are read (before and after the updates) with one query per collection, and the update statements
+    are sent in ordered `bulk_write` batches of up to `batch_size` statements. As with a Mongo "update" command per
+    document, a statement that fails is reported in that document's `update_info["writeErrors"]`, and the
+    document's remaining statements are skipped.
+
+    Since a `bulk_write` only reports counts for a batch as a whole, the `update_info` of a document reports the
+    number of its statements that were executed (`statements_applied`) and whether the document changed
+    (`doc_modified`). For compatibility with the per-document Mongo "update" commands used previously, it also
+    reports `n` (the number of executed statements, or 0 if the document does not exist) and `nModified` (1 if
+    the document changed, else 0).
+
     Parameters
     ----------
     mdb : MongoDatabase
         Mongo database to be updated.
     update_cmd : Dict
         Contians update commands to be executed.
+    batch_size : int
+        Maximum number of update statements per `bulk_write` call.
+    collection_name_prefix : str
+        Prefix of the names of the collections (in `mdb`) to be updated, e.g. scratch copies of schema collections.
 
     Returns
     -------
     results: Dict
         Information about what was updated in the Mongo database.
     """
-    results = []
-    validator_strict = Draft7Validator(get_nmdc_jsonschema_dict())
-    validator_noidpatterns = Draft7Validator(
-        get_nmdc_jsonschema_dict(enforce_id_patterns=False)
-    )
-
+    ids_by_collection_name = defaultdict(list)
     for id_, update_cmd_doc in update_cmd.items():
-        collection_name = update_cmd_doc["update"]
-        doc_before = dissoc(mdb[collection_name].find_one({"id": id_}), "_id")
-        update_result = json.loads(bson_dumps(mdb.command(update_cmd_doc)))
-        doc_after = dissoc(mdb[collection_name].find_one({"id": id_}), "_id")
-        if collection_name in {
-            "study_set",
-            "biosample_set",
-            "omics_processing_set",
-        } and id_.split(":")[0] in {"gold", "emsl", "igsn"}:
-            validator = validator_noidpatterns
-        else:
-            validator = validator_strict
-        errors = list(validator.iter_errors({collection_name: [doc_after]}))
-        results.append(
-            {
+        ids_by_collection_name[update_cmd_doc["update"]].append(id_)
+
+    results = {}
+    for collection_name, ids in ids_by_collection_name.items():
+        collection = mdb[collection_name_prefix + collection_name]
+        docs_before = {
+            d["id"]: d for d in collection.find({"id": {"$in": ids}}, {"_id": 0})
+        }
+        update_infos = _bulk_write_updates(
+            collection, [(id_, update_cmd[id_]["updates"]) for id_ in ids], batch_size
+        )
+        docs_after = {
+            d["id"]: d for d in collection.find({"id": {"$in": ids}}, {"_id": 0})
+        }
+        validation_errors = _validation_errors_for(
+            collection_name, {id_: docs_after.get(id_) for id_ in ids}
+        )
+        for id_ in ids:
+            doc_before, doc_after = docs_before.get(id_), docs_after.get(id_)
+            update_info = update_infos[id_]
+            update_info["doc_modified"] = doc_after != doc_before
+            update_info["n"] = (
+                update_info["statements_applied"] if doc_before is not None else 0
+            )
+            update_info["nModified"] = int(update_info["doc_modified"])
+            results[id_] = {
                 "id": id_,
                 "doc_before": doc_before,
-                "update_info": update_result,
+                "update_info": update_info,
                 "doc_after": doc_after,
-                "validation_errors": [e.message for e in errors],
+                "validation_errors": validation_errors[id_],
             }
+
+    return [results[id_] for id_ in update_cmd]
+
+
+def _bulk_write_updates(
+    collection: Collection, updates_by_id: List[Tuple[str, List[Dict]]], batch_size: int
+) -> Dict[str, Dict]:
+    r"""
+    Applies the update statements (`{"q": ..., "u": ...}` dicts) of each document, in order, in ordered
+    `bulk_write` batches, and returns, for each document, the number of its statements that were executed and the
+    error (if any) that stopped them.
+
+    When a statement fails, the document's remaining statements are skipped, and the next batch starts with the
+    statements of the next document.
+    """
+    statements = [
+        (id_, index, UpdateOne(update["q"], update["u"]))
+        for id_, updates in updates_by_id
+        for index, update in enumerate(updates)
+    ]
+    update_infos = {
+        id_: {"statements_applied": len(updates), "ok": 1.0}
+        for id_, updates in updates_by_id
+    }
+    start = 0
+    while start < len(statements):
+        batch = statements[start : start + batch_size]
+        try:
+            collection.bulk_write([op for _, _, op in batch], ordered=True)
+            start += len(batch)
+        except BulkWriteError as e:
+            write_error = e.details["writeErrors"][0]
+            id_, index, _ = batch[write_error["index"]]
+            update_infos[id_]["statements_applied"] = index
+            update_infos[id_]["writeErrors"] = [
+                {
+                    "index": index,
+                    "code": write_error["code"],
+                    "errmsg": write_error["errmsg"],
+                }
+            ]
+            start += write_error["index"] + 1
+            while start < len(statements) and statements[start][0] == id_:
+                start += 1
+    return update_infos
+
+
+def _validation_errors_for(
+    collection_name: str, docs_by_id: Dict[str, Optional[Dict]]
+) -> Dict[str, List[str]]:
+    r"""
+    Returns the JSON Schema validation error messages for each of the specified documents of the specified
+    collection.
+
+    Each document is validated with the (cached) compiled validator for the collection, and only the documents that
+    fail are validated (again) with the Draft 7 validator, to collect error messages.
+    Documents in the study, biosample, and omics processing collections whose `id`s are GOLD, EMSL, or IGSN
+    identifiers are validated without enforcing `id` patterns.
+    """
+    ids_by_enforce_id_patterns = defaultdict(list)
+    for id_ in docs_by_id:
+        enforce_id_patterns = not (
+            collection_name in {"study_set", "biosample_set", "omics_processing_set"}
+            and id_.split(":")[0] in {"gold", "emsl", "igsn"}
         )
+        ids_by_enforce_id_patterns[enforce_id_patterns].append(id_)
 
-    return results
+    validation_errors = {}
+    for enforce_id_patterns, ids in ids_by_enforce_id_patterns.items():
+        validate = get_nmdc_jsonschema_collection_validator(
+            collection_name, enforce_id_patterns=enforce_id_patterns
+        )
+        validator = get_nmdc_jsonschema_draft7_validator(
+            enforce_id_patterns=enforce_id_patterns
+        )
+        for id_ in ids:
+            try:
+                validate([docs_by_id[id_]])
+                validation_errors[id_] = []
+            except fastjsonschema.JsonSchemaException:
+                errors = validator.iter_errors({collection_name: [docs_by_id[id_]]})
+                validation_errors[id_] = [e.message for e in errors]
+    return validation_errors
+
+
+# Name of the database in which changesheets are applied to copies of the documents they update, for inspection.
+CHANGESHEET_SCRATCH_DB_NAME = "nmdc_changesheet_submission_results"
+
+# How long (in seconds) after its creation a changesheet's scratch collection is considered abandoned (e.g. by a
+# process that died before dropping it).
+CHANGESHEET_SCRATCH_COLLECTION_MAX_AGE_S = 3600
+
+
+def _drop_abandoned_changesheet_scratch_collections(mdb_to_inspect: MongoDatabase):
+    r"""
+    Drops the scratch collections (named `"{ObjectId}.{collection name}"`) of changesheets validated more than
+    `CHANGESHEET_SCRATCH_COLLECTION_MAX_AGE_S` seconds ago.
+    """
+    now_ = now()
+    for name in mdb_to_inspect.list_collection_names():
+        request_oid = name.split(".", 1)[0]
+        if (
+            ObjectId.is_valid(request_oid)
+            and (now_ - ObjectId(request_oid).generation_time).total_seconds()
+            > CHANGESHEET_SCRATCH_COLLECTION_MAX_AGE_S
+        ):
+            mdb_to_inspect.drop_collection(name)
 
 
 def _validate_changesheet(df_change: pd.DataFrame, mdb: MongoDatabase):
     update_cmd = mongo_update_command_for(df_change)
-    mdb_to_inspect = mdb.client["nmdc_changesheet_submission_results"]
-    results_of_copy = copy_docs_in_update_cmd(
-        update_cmd,
-        mdb_from=mdb,
-        mdb_to=mdb_to_inspect,
-    )
-    results_of_updates = update_mongo_db(mdb_to_inspect, update_cmd)
+    # Apply the updates to copies of the documents, in collections of this request's own in the scratch database.
+    mdb_to_inspect = mdb.client[CHANGESHEET_SCRATCH_DB_NAME]
+    _drop_abandoned_changesheet_scratch_collections(mdb_to_inspect)
+    collection_name_prefix = f"{ObjectId()}."
+    try:
+        results_of_copy = copy_docs_in_update_cmd(
+            update_cmd,
+            mdb_from=mdb,
+            mdb_to=mdb_to_inspect,
+            drop_mdb_to=False,
+            collection_name_prefix=collection_name_prefix,
+        )
+        results_of_updates = update_mongo_db(
+            mdb_to_inspect, update_cmd, collection_name_prefix=collection_name_prefix
+        )
+    finally:
+        for collection_name in {cmd["update"] for cmd in update_cmd.values()}:
+            mdb_to_inspect.drop_collection(collection_name_prefix + collection_name)
     rv = {
         "update_cmd": update_cmd,
         "inspection_info": {
             "mdb_name": mdb_to_inspect.name,
+            "collection_name_prefix": collection_name_prefix,
             "results_of_copy": results_of_copy,
         },
         "results_of_updates": results_of_updates,
@@ -1,17 +1,24 @@
+import base64
 import hashlib
+import hmac
 import json
 import os
 import secrets
 import string
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 from importlib import import_module
+from time import monotonic
 
+from bson import json_util
 from fastapi import HTTPException, status
 from pydantic import BaseModel
 from toolz import keyfilter
 
 API_SITE_ID = os.getenv("API_SITE_ID")
 API_SITE_CLIENT_ID = os.getenv("API_SITE_CLIENT_ID")
+PAGE_TOKEN_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 
 
 def omit(blacklist, d):
@@ -104,3 +111,98 @@ def json_clean(data, model, exclude_unset=False) -> dict:
         raise TypeError("`data` must be a pydantic model or its .model_dump()")
     m = model(**data) if isinstance(data, dict) else data
     return json.loads(m.json(exclude_unset=exclude_unset))
+
+
+def _urlsafe_b64encode(b: bytes) -> str:
+    return base64.urlsafe_b64encode(b).rstrip(b"=").decode("ascii")
+
+
+def _urlsafe_b64decode(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _get_page_token_secret_key() -> bytes:
+    r"""
+    Returns the key page tokens are signed with. Raises `RuntimeError` if there is none, rather than issuing or
+    accepting tokens signed with an empty (i.e. public) key, which anyone could forge.
+    """
+    if not PAGE_TOKEN_SECRET_KEY:
+        raise RuntimeError("JWT_SECRET_KEY must be set to sign page tokens")
+    return PAGE_TOKEN_SECRET_KEY.encode("utf-8")
+
+
+def encode_page_token(payload: dict) -> str:
+    """Encode `payload` as a self-contained, HMAC-signed, URL-safe pagination token.
+
+    Values are serialized via `bson.json_util`, so e.g. `ObjectId`s and `datetime`s survive a round trip.
+
+    >>> decode_page_token(encode_page_token({"ns": "biosample_set", "last_id": "nmdc:bsm-11-abc123"}))
+    {'ns': 'biosample_set', 'last_id': 'nmdc:bsm-11-abc123'}
+    """
+    body = json_util.dumps(payload, separators=(",", ":")).encode("utf-8")
+    signature = hmac.digest(_get_page_token_secret_key(), body, "sha256")
+    return f"{_urlsafe_b64encode(body)}.{_urlsafe_b64encode(signature)}"
+
+
+def decode_page_token(token: str) -> dict:
+    """Decode a token made by `encode_page_token`. Raises `ValueError` if the token is malformed or was tampered with.
+
+    >>> decode_page_token("e30.not-the-signature")
+    Traceback (most recent call last):
+    ...
+    ValueError: invalid page token
+    """
+    try:
+        encoded_body, encoded_signature = token.split(".")
+        body = _urlsafe_b64decode(encoded_body)
+        signature = _urlsafe_b64decode(encoded_signature)
+    except (ValueError, TypeError):
+        raise ValueError("invalid page token")
+    expected = hmac.digest(_get_page_token_secret_key(), body, "sha256")
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("invalid page token")
+    payload = json_util.loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError("invalid page token")
+    return payload
+
+
+class TTLCache:
+    """A bounded, thread-safe, in-process cache whose entries expire `ttl` seconds after being set.
+
+    When the cache is full, the least-recently-used entry is evicted.
+
+    >>> cache = TTLCache(maxsize=2, ttl=60)
+    >>> cache.set("a", 1); cache.set("b", 2); cache.get("a")
+    1
+    >>> cache.set("c", 3); cache.get("b") is None  # "b" was the least-recently-used entry
+    True
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key → (expiration time, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if monotonic() >= entry[0]:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,10 +1,13 @@
 import gzip
 import json
 import os
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AbstractContextManager
+from datetime import datetime, timedelta, timezone
 from functools import lru_cache
-from typing import Set, Dict, Any, Iterable
+from typing import Set, Dict, Any, Iterable, List, Optional
 from uuid import uuid4
 
 import bson
@@ -17,14 +20,16 @@ from pydantic import BaseModel, conint
 from tenacity import wait_random_exponential, retry, retry_if_exception_type
 from toolz import concat, merge, unique, dissoc
 
+from nmdc_runtime.api.core.util import TTLCache
 from nmdc_runtime.config import DATABASE_CLASS_NAME
 from nmdc_runtime.util import (
     get_nmdc_jsonschema_dict,
     schema_collection_names_with_id_field,
     nmdc_schema_view,
     collection_name_to_class_names,
+    populated_schema_collection_names_with_id_field,
 )
-from pymongo import MongoClient, ReplaceOne
+from pymongo import MongoClient, ReplaceOne, UpdateOne
 from pymongo.database import Database as MongoDatabase
 
 
@@ -124,6 +129,299 @@ def get_planned_process_collection_names() -> Set[str]:
     return collection_names
 
 
+@lru_cache
+def supports_transactions(mdb: MongoDatabase) -> bool:
+    r"""
+    Returns `True` if the MongoDB deployment hosting the specified database supports multi-document transactions,
+    i.e. if the server is a replica set member or a `mongos` router (as opposed to a standalone `mongod`).
+
+    Note: The deployment is asked (via the `hello` command) rather than the client's topology, because clients that
+          use `directConnection=True` report a "Single" topology even when connected to a replica set member.
+    """
+    hello = mdb.client.admin.command("hello")
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+
+ID_ROUTES_COLLECTION_NAME = "_runtime.id_routes"
+r"""
+Name of the collection that maps each document `id` (stored as the `_id` of a route document)
+to the name of the schema collection containing that document (and records when the route was recorded).
+"""
+
+
+def record_id_routes(mdb: MongoDatabase, collection_name: str, ids: Iterable[str]):
+    r"""
+    Records that the documents having the specified `id`s reside in the specified collection.
+    """
+    recorded_at = datetime.now(timezone.utc)
+    operations = [
+        UpdateOne(
+            {"_id": id_},
+            {"$set": {"collection_name": collection_name, "recorded_at": recorded_at}},
+            upsert=True,
+        )
+        for id_ in set(ids)
+        if id_ is not None
+    ]
+    if operations:
+        mdb[ID_ROUTES_COLLECTION_NAME].bulk_write(operations, ordered=False)
+
+
+def forget_id_routes(mdb: MongoDatabase, ids: Iterable[str]):
+    r"""
+    Removes the routes, if any, for the specified `id`s (e.g. because those documents were deleted).
+    """
+    ids = [id_ for id_ in set(ids) if id_ is not None]
+    if ids:
+        mdb[ID_ROUTES_COLLECTION_NAME].delete_many({"_id": {"$in": ids}})
+
+
+def log_txns(
+    mdb: MongoDatabase, collection_name: str, ids: Iterable[str], txn_type: str
+):
+    r"""
+    Appends an entry to the transaction log (`txn_log`) for each of the specified `id`s, recording that the
+    documents having those `id`s in the specified collection were written (`txn_type` "upsert" or "update")
+    or removed (`txn_type` "delete").
+
+    Consumers of the transaction log (e.g. the incremental materialization of `alldocs`) track how far they have
+    read via `get_txn_log_checkpoint` and `set_txn_log_checkpoint`, re-reading `TXN_LOG_OVERLAP` before their
+    checkpoint each time, since timestamps are assigned here rather than when the entries become visible.
+    """
+    ts = datetime.now(timezone.utc)
+    entries = [
+        {"tgt": {"id": id_, "c": collection_name}, "type": txn_type, "ts": ts}
+        for id_ in ids
+    ]
+    if entries:
+        mdb.txn_log.insert_many(entries)
+
+
+TXN_LOG_OVERLAP = timedelta(minutes=5)
+r"""
+How far before its checkpoint a consumer of the transaction log re-reads the log. An entry's timestamp is assigned
+by the process appending the entry, before the entry becomes visible to readers (and by a clock that may be skewed
+relative to other hosts' clocks), so an entry can become visible only after a consumer has read past its timestamp.
+Re-reading this window catches such entries, so consumers must apply entries idempotently.
+"""
+
+TXN_LOG_CHECKPOINTS_COLLECTION_NAME = "_runtime.txn_log_checkpoints"
+r"""
+Name of the collection that maps the name of each consumer of the transaction log (stored as the `_id` of a
+checkpoint document) to the timestamp of the latest transaction that consumer has processed.
+"""
+
+
+def get_txn_log_checkpoint(mdb: MongoDatabase, consumer: str) -> Optional[datetime]:
+    r"""
+    Returns the timestamp of the latest transaction processed by the specified consumer of the transaction log,
+    or `None` if that consumer has no checkpoint.
+    """
+    doc = mdb[TXN_LOG_CHECKPOINTS_COLLECTION_NAME].find_one({"_id": consumer})
+    return doc["ts"] if doc else None
+
+
+def set_txn_log_checkpoint(mdb: MongoDatabase, consumer: str, ts: datetime):
+    r"""
+    Records that the specified consumer of the transaction log has processed all transactions up to (and including)
+    the specified timestamp.
+    """
+    mdb[TXN_LOG_CHECKPOINTS_COLLECTION_NAME].replace_one(
+        {"_id": consumer}, {"_id": consumer, "ts": ts}, upsert=True
+    )
+
+
+def refresh_id_routes(mdb: MongoDatabase, collection_names=None) -> int:
+    r"""
+    (Re-)populates the id-routing collection from the specified collections (by default, from all
+    populated schema collections having an `id` field) and returns the number of routes.
+
+    Stale routes are then removed, i.e. routes (into the specified collections, or, by default, into any
+    collection) that were neither refreshed nor recorded since the refresh began, such as routes for documents
+    that were deleted, or moved, by a writer that does not maintain the routes.
+
+    The work is done server-side via a `$merge` aggregation stage, so no `id` values are transferred
+    to (or held in memory by) this process.
+    """
+    refreshed_at = datetime.now(timezone.utc)
+    stale_routes_filter = {"recorded_at": {"$not": {"$gte": refreshed_at}}}
+    if collection_names is None:
+        collection_names = populated_schema_collection_names_with_id_field(mdb)
+    else:
+        stale_routes_filter["collection_name"] = {"$in": list(collection_names)}
+    for collection_name in collection_names:
+        mdb[collection_name].aggregate(
+            [
+                {"$match": {"id": {"$exists": True}}},
+                {
+                    "$project": {
+                        "_id": "$id",
+                        "collection_name": {"$literal": collection_name},
+                        "recorded_at": {"$literal": refreshed_at},
+                    }
+                },
+                {
+                    "$merge": {
+                        "into": ID_ROUTES_COLLECTION_NAME,
+                        "on": "_id",
+                        "whenMatched": "replace",
+                        "whenNotMatched": "insert",
+                    }
+                },
+            ],
+            allowDiskUse=True,
+        )
+    mdb[ID_ROUTES_COLLECTION_NAME].delete_many(stale_routes_filter)
+    return mdb[ID_ROUTES_COLLECTION_NAME].estimated_document_count()
+
+
+def get_collection_name_for_id(mdb: MongoDatabase, id_: str) -> Optional[str]:
+    r"""
+    Returns the name of the schema collection containing the document having the specified `id`,
+    or `None` if no such document exists.
+
+    The route is looked up by `_id` in the id-routing collection and confirmed with a single indexed
+    query. If the route is missing or stale, the schema collections having an `id` field are probed
+    (one indexed `find_one` each) and the route is (re-)recorded, so the routing collection heals
+    itself even if some write path did not maintain it.
+    """
+    route = mdb[ID_ROUTES_COLLECTION_NAME].find_one({"_id": id_})
+    if route is not None:
+        collection_name = route["collection_name"]
+        if mdb[collection_name].find_one({"id": id_}, {"_id": 1}) is not None:
+            return collection_name
+        forget_id_routes(mdb, [id_])
+
+    for collection_name in sorted(schema_collection_names_with_id_field()):
+        if mdb[collection_name].find_one({"id": id_}, {"_id": 1}) is not None:
+            record_id_routes(mdb, collection_name, [id_])
+            return collection_name
+    return None
+
+
+def get_collection_names_for_ids(
+    mdb: MongoDatabase, ids: Iterable[str]
+) -> Dict[str, str]:
+    r"""
+    Returns a dictionary mapping each of the specified `id`s, of documents that exist, to the name of the schema
+    collection containing that document.
+
+    This is the batched counterpart of `get_collection_name_for_id`: the routes are looked up in one `$in` query,
+    confirmed with one `$in` query per routed collection and, for any `id`s whose route is missing or stale, the
+    schema collections having an `id` field are probed (one `$in` query each) and the routes are (re-)recorded.
+    """
+    ids = {id_ for id_ in ids if id_}
+    routed_ids = defaultdict(list)
+    for route in mdb[ID_ROUTES_COLLECTION_NAME].find({"_id": {"$in": list(ids)}}):
+        routed_ids[route["collection_name"]].append(route["_id"])
+
+    collection_names = {}
+    for collection_name, ids_in_collection in routed_ids.items():
+        for doc in mdb[collection_name].find(
+            {"id": {"$in": ids_in_collection}}, {"_id": 0, "id": 1}
+        ):
+            collection_names[doc["id"]] = collection_name
+    forget_id_routes(
+        mdb,
+        [
+            id_
+            for ids_ in routed_ids.values()
+            for id_ in ids_
+            if id_ not in collection_names
+        ],
+    )
+
+    unresolved_ids = ids - collection_names.keys()
+    for collection_name in sorted(schema_collection_names_with_id_field()):
+        if not unresolved_ids:
+            break
+        found_ids = [
+            doc["id"]
+            for doc in mdb[collection_name].find(
+                {"id": {"$in": list(unresolved_ids)}}, {"_id": 0, "id": 1}
+            )
+        ]
+        record_id_routes(mdb, collection_name, found_ids)
+        collection_names.update((id_, collection_name) for id_ in found_ids)
+        unresolved_ids -= set(found_ids)
+    return collection_names
+
+
+# Maximum number of collections whose statistics are gathered at the same time.
+COLLECTION_STATS_MAX_WORKERS = 8
+
+# How long (in seconds) to reuse the statistics of the schema collections.
+COLLECTION_STATS_TTL_S = 30
+
+# Maps a database name to the statistics of the schema collections in that database.
+_schema_collection_stats = TTLCache(maxsize=100, ttl=COLLECTION_STATS_TTL_S)
+_schema_collection_stats_lock = threading.Lock()
+
+
+def gather_collection_stats(
+    mdb: MongoDatabase, collection_names: Iterable[str], scale: int = 1
+) -> List[dict]:
+    r"""
+    Returns the storage statistics (the `ns` and the `storageStats` summary of a `$collStats` aggregation stage) of
+    each of the specified collections, in the order specified. The statistics of different collections are gathered
+    concurrently.
+
+    Reference: https://www.mongodb.com/docs/manual/reference/operator/aggregation/collStats/
+    """
+
+    def stats_for(collection_name: str) -> dict:
+        return next(
+            mdb[collection_name].aggregate(
+                [
+                    {"$collStats": {"storageStats": {"scale": scale}}},
+                    {
+                        "$project": {
+                            "ns": 1,
+                            "storageStats.size": 1,
+                            "storageStats.count": 1,
+                            "storageStats.avgObjSize": 1,
+                            "storageStats.storageSize": 1,
+                            "storageStats.totalIndexSize": 1,
+                            "storageStats.totalSize": 1,
+                            "storageStats.scaleFactor": 1,
+                        }
+                    },
+                ]
+            )
+        )
+
+    collection_names = list(collection_names)
+    if not collection_names:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=min(COLLECTION_STATS_MAX_WORKERS, len(collection_names))
+    ) as executor:
+        return list(executor.map(stats_for, collection_names))
+
+
+def get_schema_collection_stats(mdb: MongoDatabase) -> List[dict]:
+    r"""
+    Returns the storage statistics (see `gather_collection_stats`) of each schema collection present in the database.
+
+    The statistics are reused for `COLLECTION_STATS_TTL_S` seconds, and concurrent callers wait for a single refresh
+    rather than each gathering them, so polling this is cheap.
+    """
+    stats = _schema_collection_stats.get(mdb.name)
+    if stats is None:
+        with _schema_collection_stats_lock:
+            stats = _schema_collection_stats.get(mdb.name)
+            if stats is None:
+                stats = gather_collection_stats(
+                    mdb,
+                    sorted(
+                        set(get_collection_names_from_schema())
+                        & set(mdb.list_collection_names())
+                    ),
+                )
+                _schema_collection_stats.set(mdb.name, stats)
+    return stats
+
+
 def mongodump_excluded_collections():
     _mdb = get_mongo_db()
     excluded_collections = " ".join(
@@ -145,6 +443,8 @@ def mongorestore_collection(mdb, collection_name, bson_file_path):
         if data:
             mdb.drop_collection(collection_name)
             mdb[collection_name].insert_many(data)
+            if collection_name in schema_collection_names_with_id_field():
+                refresh_id_routes(mdb, [collection_name])
             print(
                 f"mongorestore_collection: {len(data)} documents into {collection_name} after drop"
             )
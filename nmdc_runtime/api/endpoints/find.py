@@ -1,15 +1,16 @@
+from collections import defaultdict
+from itertools import chain
 from operator import itemgetter
-from typing import List, Annotated
+from typing import List, Annotated, Dict
 
 from fastapi import APIRouter, Depends, Form, Path, Query
 from jinja2 import Environment, PackageLoader, select_autoescape
-from nmdc_runtime.minter.config import typecodes
-from nmdc_runtime.util import get_nmdc_jsonschema_dict
+from nmdc_runtime.minter.config import get_schema_class_name_for_id
+from nmdc_runtime.util import get_nmdc_jsonschema_dict, nmdc_schema_view
 from pymongo.database import Database as MongoDatabase
 from starlette.responses import HTMLResponse
-from toolz import merge, assoc_in
+from toolz import merge, assoc_in, partition_all
 
-from nmdc_schema.get_nmdc_view import ViewGetter
 from nmdc_runtime.api.core.util import raise404_if_none
 from nmdc_runtime.api.db.mongo import (
     get_mongo_db,
@@ -32,6 +33,9 @@ from nmdc_runtime.util import get_class_names_from_collection_spec
 
 router = APIRouter()
 
+# Maximum number of values in the `$in` list of any one query issued while traversing the `alldocs` graph.
+IN_QUERY_BATCH_SIZE = 10_000
+
 
 @router.get(
     "/studies",
@@ -135,12 +139,7 @@ def get_classname_from_typecode(doc_id: str) -> str:
     >>> get_classname_from_typecode("nmdc:sty-11-r2h77870")
     'Study'
     """
-    typecode = doc_id.split(":")[1].split("-")[0]
-    class_map_data = typecodes()
-    class_map = {
-        entry["name"]: entry["schema_class"].split(":")[1] for entry in class_map_data
-    }
-    return class_map.get(typecode)
+    return get_schema_class_name_for_id(doc_id)
 
 
 @router.get(
@@ -175,7 +174,6 @@ def find_data_objects_for_study(
         is the `Biosample`'s `id`. The value of the `data_object_set` entry
         is a list of the `DataObject`s associated with that `Biosample`.
     """
-    biosample_data_objects = []
     study = raise404_if_none(
         mdb.study_set.find_one({"id": study_id}, ["id"]), detail="Study not found"
     )
@@ -185,95 +183,98 @@ def find_data_objects_for_study(
     biosamples = mdb.biosample_set.find({"associated_studies": study["id"]}, ["id"])
     biosample_ids = [biosample["id"] for biosample in biosamples]
 
-    # SchemaView interface to NMDC Schema
-    nmdc_view = ViewGetter()
-    nmdc_sv = nmdc_view.get_view()
-    dg_descendants = nmdc_sv.class_descendants("DataGeneration")
+    data_objects_by_biosample_id = find_data_objects_by_biosample_id(mdb, biosample_ids)
+    return [
+        {"biosample_id": biosample_id, "data_objects": data_objects}
+        for biosample_id, data_objects in data_objects_by_biosample_id.items()
+        if data_objects
+    ]
 
-    def collect_data_objects(doc_ids, collected_objects, unique_ids):
-        """Helper function to collect data objects from `has_input` and `has_output` references."""
+
+def find_data_objects_by_biosample_id(
+    mdb: MongoDatabase, biosample_ids: List[str]
+) -> Dict[str, List[dict]]:
+    r"""
+    Returns a dictionary mapping each of the specified `Biosample` `id`s to the list of `DataObject`s
+    reachable from that `Biosample` via the `has_input`/`has_output` graph in the `alldocs` collection.
+
+    Another way in which `DataObject`s can be related to `Biosample`s is through the `was_informed_by`
+    slot: records in the `workflow_execution_set` collection that are "informed" by a reachable
+    `DataGeneration` record contribute their `has_input` and `has_output` `DataObject`s, too.
+
+    The graph is traversed breadth-first for all biosamples at once. Each hop issues one `$in` query
+    for the entire frontier (rather than one query per `id` per biosample), while tracking which
+    biosamples each frontier `id` was reached from. The `DataObject`s themselves are fetched in bulk
+    at the end, so a `DataObject` shared by many biosamples is fetched only once.
+    """
+    dg_descendants = set(nmdc_schema_view().class_descendants("DataGeneration"))
+
+    # Map each biosample `id` to the (insertion-ordered) `id`s of the `DataObject`s found for it.
+    data_object_ids = {biosample_id: {} for biosample_id in biosample_ids}
+
+    def collect_data_object_ids(doc_ids, origins):
         for doc_id in doc_ids:
-            if (
-                get_classname_from_typecode(doc_id) == "DataObject"
-                and doc_id not in unique_ids
+            if get_classname_from_typecode(doc_id) == "DataObject":
+                for origin in origins:
+                    data_object_ids[origin][doc_id] = None
+
+    # Map each `id` on the frontier to the `id`s of the biosamples from which it was reached.
+    frontier = {biosample_id: {biosample_id} for biosample_id in biosample_ids}
+    expanded = defaultdict(set)  # guards against re-expanding (e.g. cyclic) paths
+    while frontier:
+        for current_id, origins in frontier.items():
+            expanded[current_id] |= origins
+
+        next_frontier = defaultdict(set)
+        informing_origins = defaultdict(set)
+        for ids in partition_all(IN_QUERY_BATCH_SIZE, frontier):
+            for doc in mdb.alldocs.find(
+                {"has_input": {"$in": list(ids)}},
+                ["id", "has_input", "has_output", "_type_and_ancestors"],
+            ):
+                origins = set().union(
+                    *(frontier[i] for i in doc.get("has_input", []) if i in frontier)
+                )
+                has_output = doc.get("has_output", [])
+                collect_data_object_ids(has_output, origins)
+                for output_id in has_output:
+                    if get_classname_from_typecode(output_id) != "DataObject":
+                        if new_origins := origins - expanded[output_id]:
+                            next_frontier[output_id] |= new_origins
+
+                if any(t in dg_descendants for t in doc.get("_type_and_ancestors", [])):
+                    informing_origins[doc["id"]] |= origins
+
+        for ids in partition_all(IN_QUERY_BATCH_SIZE, informing_origins):
+            for informed_doc in mdb.workflow_execution_set.find(
+                {"was_informed_by": {"$in": list(ids)}},
+                ["was_informed_by", "has_input", "has_output"],
             ):
-                data_obj = mdb.data_object_set.find_one({"id": doc_id})
-                if data_obj:
-                    collected_objects.append(strip_oid(data_obj))
-                    unique_ids.add(doc_id)
-
-    # Another way in which DataObjects can be related to Biosamples is through the
-    # `was_informed_by` key/slot. We need to link records from the `workflow_execution_set`
-    # collection that are "informed" by the same DataGeneration records that created
-    # the outputs above. Then we need to get additional DataObject records that are
-    # created by this linkage.
-    def process_informed_by_docs(doc, collected_objects, unique_ids):
-        """Process documents linked by `was_informed_by` and collect relevant data objects."""
-        informed_by_docs = mdb.workflow_execution_set.find(
-            {"was_informed_by": doc["id"]}
-        )
-        for informed_doc in informed_by_docs:
-            collect_data_objects(
-                informed_doc.get("has_input", []), collected_objects, unique_ids
-            )
-            collect_data_objects(
-                informed_doc.get("has_output", []), collected_objects, unique_ids
-            )
-
-    biosample_data_objects = []
-
-    for biosample_id in biosample_ids:
-        current_ids = [biosample_id]
-        collected_data_objects = []
-        unique_ids = set()
-
-        # Iterate over records in the `alldocs` collection. Look for
-        # records that have the given biosample_id as value on the
-        # `has_input` key/slot. The retrieved documents might also have a
-        # `has_output` key/slot associated with them. Get the value of the
-        # `has_output` key and check if it's type is `nmdc:DataObject`. If
-        # it's not, repeat the process till it is.
-        while current_ids:
-            new_current_ids = []
-            for current_id in current_ids:
-                # Query to find all documents with current_id as the value on
-                # `has_input` slot
-                for doc in mdb.alldocs.find({"has_input": current_id}):
-                    has_output = doc.get("has_output", [])
-
-                    # Process `DataGeneration` type documents linked by `was_informed_by`
-                    if not has_output and any(
-                        t in dg_descendants for t in doc.get("_type_and_ancestors", [])
-                    ):
-                        process_informed_by_docs(
-                            doc, collected_data_objects, unique_ids
-                        )
-                        continue
-
-                    collect_data_objects(has_output, collected_data_objects, unique_ids)
-                    new_current_ids.extend(
-                        op
-                        for op in has_output
-                        if get_classname_from_typecode(op) != "DataObject"
+                was_informed_by = informed_doc.get("was_informed_by", [])
+                if not isinstance(was_informed_by, list):
+                    was_informed_by = [was_informed_by]
+                origins = set().union(
+                    *(
+                        informing_origins[i]
+                        for i in was_informed_by
+                        if i in informing_origins
                     )
+                )
+                collect_data_object_ids(informed_doc.get("has_input", []), origins)
+                collect_data_object_ids(informed_doc.get("has_output", []), origins)
 
-                    if any(
-                        t in dg_descendants for t in doc.get("_type_and_ancestors", [])
-                    ):
-                        process_informed_by_docs(
-                            doc, collected_data_objects, unique_ids
-                        )
+        frontier = next_frontier
 
-            current_ids = new_current_ids
+    data_objects = {}
+    all_data_object_ids = set(chain.from_iterable(data_object_ids.values()))
+    for ids in partition_all(IN_QUERY_BATCH_SIZE, all_data_object_ids):
+        for data_object in mdb.data_object_set.find({"id": {"$in": list(ids)}}):
+            data_objects[data_object["id"]] = strip_oid(data_object)
 
-        if collected_data_objects:
-            result = {
-                "biosample_id": biosample_id,
-                "data_objects": collected_data_objects,
-            }
-            biosample_data_objects.append(result)
-
-    return biosample_data_objects
+    return {
+        biosample_id: [data_objects[i] for i in ids if i in data_objects]
+        for biosample_id, ids in data_object_ids.items()
+    }
 
 
 @router.get(
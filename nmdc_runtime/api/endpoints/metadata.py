@@ -43,7 +43,7 @@ from toolz import merge
 router = APIRouter()
 
 
-async def raw_changesheet_from_uploaded_file(uploaded_file: UploadFile):
+def raw_changesheet_from_uploaded_file(uploaded_file: UploadFile):
     """
     Extract utf8-encoded text from fastapi.UploadFile object, and
     construct ChangesheetIn object for subsequent processing.
@@ -54,13 +54,13 @@ async def raw_changesheet_from_uploaded_file(uploaded_file: UploadFile):
         content_type = "text/csv"
     elif name.endswith(".tsv"):
         content_type = "text/tab-separated-values"
-    contents: bytes = await uploaded_file.read()
+    contents: bytes = uploaded_file.file.read()
     text = contents.decode()
     return ChangesheetIn(name=name, content_type=content_type, text=text)
 
 
 @router.post("/metadata/changesheets:validate")
-async def validate_changesheet(
+def validate_changesheet(
     uploaded_file: UploadFile = File(
         ..., description="The changesheet you want the server to validate"
     ),
@@ -70,13 +70,13 @@ async def validate_changesheet(
     Validates a [changesheet](https://microbiomedata.github.io/nmdc-runtime/howto-guides/author-changesheets/)
     that is in either CSV or TSV format.
     """
-    sheet_in = await raw_changesheet_from_uploaded_file(uploaded_file)
+    sheet_in = raw_changesheet_from_uploaded_file(uploaded_file)
     df_change = df_from_sheet_in(sheet_in, mdb)
     return _validate_changesheet(df_change, mdb)
 
 
 @router.post("/metadata/changesheets:submit", response_model=DrsObjectWithTypes)
-async def submit_changesheet(
+def submit_changesheet(
     uploaded_file: UploadFile = File(
         ..., description="The changesheet you want the server to apply"
     ),
@@ -101,7 +101,7 @@ async def submit_changesheet(
                 "are allowed to apply changesheets at this time."
             ),
         )
-    sheet_in = await raw_changesheet_from_uploaded_file(uploaded_file)
+    sheet_in = raw_changesheet_from_uploaded_file(uploaded_file)
     df_change = df_from_sheet_in(sheet_in, mdb)
     _ = _validate_changesheet(df_change, mdb)
 
@@ -123,7 +123,7 @@ async def submit_changesheet(
 
 
 @router.get("/metadata/stored_files/{object_id}", include_in_schema=False)
-async def get_stored_metadata_object(
+def get_stored_metadata_object(
     object_id: Annotated[
         str,
         Path(
@@ -167,7 +167,7 @@ async def get_stored_metadata_object(
 
 
 @router.post("/metadata/json:validate", name="Validate JSON")
-async def validate_json_nmdcdb(docs: dict, mdb: MongoDatabase = Depends(get_mongo_db)):
+def validate_json_nmdcdb(docs: dict, mdb: MongoDatabase = Depends(get_mongo_db)):
     r"""
     Validate a NMDC JSON Schema "nmdc:Database" object.
 
@@ -181,7 +181,7 @@ async def validate_json_nmdcdb(docs: dict, mdb: MongoDatabase = Depends(get_mong
 
 
 @router.post("/metadata/json:submit", name="Submit JSON")
-async def submit_json_nmdcdb(
+def submit_json_nmdcdb(
     docs: dict,
     user: User = Depends(get_current_active_user),
     mdb: MongoDatabase = Depends(get_mongo_db),
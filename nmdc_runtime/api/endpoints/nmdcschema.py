@@ -1,27 +1,28 @@
+import json
+import zlib
 from importlib.metadata import version
-import re
-from typing import List, Dict, Annotated
+from typing import List, Dict, Annotated, Iterable, Iterator, Literal
 
+import bson.json_util
 import pymongo
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 
-from nmdc_runtime.config import DATABASE_CLASS_NAME
-from nmdc_runtime.minter.config import typecodes
-from nmdc_runtime.util import nmdc_database_collection_names
+from nmdc_runtime.minter.config import typecodes, typecode_table, get_typecode_for_id
 from pymongo.database import Database as MongoDatabase
 from starlette import status
-from toolz import dissoc
-from linkml_runtime.utils.schemaview import SchemaView
-from nmdc_schema.nmdc_data import get_nmdc_schema_definition
+from starlette.responses import PlainTextResponse, StreamingResponse
+from toolz import dissoc, merge, partition_all
 
-from nmdc_runtime.api.core.metadata import map_id_to_collection, get_collection_for_id
+from nmdc_runtime.api.core.metadata import get_collection_for_id
 from nmdc_runtime.api.core.util import raise404_if_none
 from nmdc_runtime.api.db.mongo import (
     get_mongo_db,
     get_nonempty_nmdc_schema_collection_names,
     get_collection_names_from_schema,
+    get_schema_collection_stats,
 )
 from nmdc_runtime.api.endpoints.util import (
+    check_filter,
     list_resources,
     strip_oid,
     comma_separated_values,
@@ -77,36 +78,182 @@ def get_nmdc_database_collection_stats(
     To get the NMDC Database MongoDB collection statistics, like the total count of records in a collection or the size
     of the collection, try executing the GET /nmdcschema/collection_stats endpoint
 
+    The statistics are cached briefly (for up to 30 seconds), so they may lag the database a little.
+
     Field reference: <https://www.mongodb.com/docs/manual/reference/command/collStats/#std-label-collStats-output>.
     """
-    # Take set intersection of
-    #   (1) all collections defined by the NMDC schema, and
-    #   (2) all runtime collections
-    # Thus, only retrieve collections from the schema that are present (i.e. having actual documents) in the runtime.
-    present_collection_names = set(nmdc_database_collection_names()) & set(
-        mdb.list_collection_names()
+    # Only retrieve stats for collections from the schema that are present in the runtime.
+    return get_schema_collection_stats(mdb)
+
+
+# Maps each field of a collection's `storageStats` to the name and description of the gauge that reports it.
+COLLECTION_STATS_GAUGES = {
+    "count": ("nmdc_collection_documents", "Number of documents in the collection."),
+    "size": (
+        "nmdc_collection_size_bytes",
+        "Uncompressed size of the documents in the collection.",
+    ),
+    "avgObjSize": (
+        "nmdc_collection_avg_document_size_bytes",
+        "Average uncompressed size of a document in the collection.",
+    ),
+    "storageSize": (
+        "nmdc_collection_storage_size_bytes",
+        "Storage allocated to the documents in the collection.",
+    ),
+    "totalIndexSize": (
+        "nmdc_collection_index_size_bytes",
+        "Storage allocated to the indexes of the collection.",
+    ),
+    "totalSize": (
+        "nmdc_collection_total_size_bytes",
+        "Storage allocated to the documents and indexes of the collection.",
+    ),
+}
+
+
+def collection_stats_as_gauges(stats: List[dict]) -> str:
+    r"""
+    Renders the specified collection statistics (see `get_schema_collection_stats`) as gauges in the Prometheus text
+    exposition format, labeled by collection name.
+
+    >>> print(collection_stats_as_gauges([{"ns": "nmdc.study_set", "storageStats": {"count": 3}}]), end="")
+    # HELP nmdc_collection_documents Number of documents in the collection.
+    # TYPE nmdc_collection_documents gauge
+    nmdc_collection_documents{collection="study_set"} 3
+    """
+    lines = []
+    for field, (name, description) in COLLECTION_STATS_GAUGES.items():
+        samples = [
+            (s["ns"].split(".", 1)[1], s["storageStats"][field])
+            for s in stats
+            if s.get("storageStats", {}).get(field) is not None
+        ]
+        if samples:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(
+                f'{name}{{collection="{collection_name}"}} {value}'
+                for collection_name, value in samples
+            )
+    return "".join(f"{line}\n" for line in lines)
+
+
+@router.get("/nmdcschema/collection_stats/metrics", response_class=PlainTextResponse)
+def get_nmdc_database_collection_stats_metrics(
+    mdb: MongoDatabase = Depends(get_mongo_db),
+):
+    """
+    Returns the same statistics as the GET /nmdcschema/collection_stats endpoint, as gauges in the
+    [Prometheus text format](https://prometheus.io/docs/instrumenting/exposition_formats/), for scraping.
+    """
+    return PlainTextResponse(
+        collection_stats_as_gauges(get_schema_collection_stats(mdb)),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+# Number of documents MongoDB returns per batch when exporting a collection.
+EXPORT_BATCH_SIZE = 1_000
+
+
+def iter_export_chunks(docs: Iterable[dict], format_: str) -> Iterator[bytes]:
+    r"""
+    Yields the specified documents encoded in the specified format, either as newline-delimited JSON (`ndjson`) or
+    as a gzip-compressed JSON array (`json.gz`), a few documents at a time.
+
+    >>> b"".join(iter_export_chunks([{"id": "a"}, {"id": "b"}], "ndjson"))
+    b'{"id":"a"}\n{"id":"b"}\n'
+    >>> import gzip
+    >>> gzip.decompress(b"".join(iter_export_chunks([{"id": "a"}, {"id": "b"}], "json.gz")))
+    b'[{"id":"a"},\n{"id":"b"}]'
+    """
+    encode = json.JSONEncoder(
+        default=bson.json_util.default, separators=(",", ":")
+    ).encode
+    if format_ == "ndjson":
+        for batch in partition_all(EXPORT_BATCH_SIZE, docs):
+            yield "".join(encode(doc) + "\n" for doc in batch).encode("utf-8")
+    else:
+        compressor = zlib.compressobj(wbits=31)  # i.e. gzip container
+        separator = "["
+        for batch in partition_all(EXPORT_BATCH_SIZE, docs):
+            text = ",\n".join(encode(doc) for doc in batch)
+            yield compressor.compress((separator + text).encode("utf-8"))
+            separator = ",\n"
+        yield compressor.compress(b"[]" if separator == "[" else b"]")
+        yield compressor.flush()
+
+
+@router.get("/nmdcschema/{collection_name}:export")
+def export_collection(
+    collection_name: Annotated[
+        str,
+        Path(
+            title="Collection name",
+            description="The name of the collection.\n\n_Example_: `biosample_set`",
+            examples=["biosample_set"],
+        ),
+    ],
+    filter_: Annotated[
+        str | None,
+        Query(
+            alias="filter",
+            title="Filter",
+            description="""The criteria by which you want to filter the resources, in the same format as the
+                `filter` parameter of the `/nmdcschema/{collection_name}` endpoint.\n\n_Example:_
+                `{"ecosystem_category": "Plants"}`""",
+            examples=[r'{"ecosystem_category": "Plants"}'],
+        ),
+    ] = None,
+    projection: Annotated[
+        str | None,
+        Query(
+            title="Projection",
+            description="""Comma-delimited list of the names of the fields you want the resources to include.
+                In addition to those fields, the resources will also include the `id` field.\n\n_Example_:
+                `name, ecosystem_type`""",
+            examples=["name, ecosystem_type"],
+        ),
+    ] = None,
+    format_: Annotated[
+        Literal["ndjson", "json.gz"],
+        Query(
+            alias="format",
+            title="Format",
+            description="""`ndjson` for newline-delimited JSON (one resource per line), or `json.gz` for a
+                gzip-compressed JSON array of resources.""",
+        ),
+    ] = "ndjson",
+    mdb: MongoDatabase = Depends(get_mongo_db),
+):
+    r"""
+    Streams all resources that match the specified filter criteria and reside in the specified collection.
+
+    Unlike the `/nmdcschema/{collection_name}` endpoint, this endpoint does not paginate. Use it to download
+    an entire collection (or an entire filtered subset of one).
+    """
+    ensure_collection_name_is_known_to_schema(collection_name)
+    mongo_filter = bson.json_util.loads(check_filter(filter_)) if filter_ else {}
+    mongo_projection = (
+        dict.fromkeys(set(comma_separated_values(projection)) | {"id"}, 1)
+        if projection
+        else {}
+    )
+    cursor = mdb[collection_name].find(
+        filter=mongo_filter,
+        projection=merge(mongo_projection, {"_id": 0}),
+        batch_size=EXPORT_BATCH_SIZE,
+    )
+    if format_ == "ndjson":
+        media_type, filename = "application/x-ndjson", f"{collection_name}.ndjson"
+    else:
+        media_type, filename = "application/gzip", f"{collection_name}.json.gz"
+    return StreamingResponse(
+        iter_export_chunks(cursor, format_),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
-    stats = []
-    for n in present_collection_names:
-        for doc in mdb[n].aggregate(
-            [
-                {"$collStats": {"storageStats": {}}},
-                {
-                    "$project": {
-                        "ns": 1,
-                        "storageStats.size": 1,
-                        "storageStats.count": 1,
-                        "storageStats.avgObjSize": 1,
-                        "storageStats.storageSize": 1,
-                        "storageStats.totalIndexSize": 1,
-                        "storageStats.totalSize": 1,
-                        "storageStats.scaleFactor": 1,
-                    }
-                },
-            ]
-        ):
-            stats.append(doc)
-    return stats
 
 
 @router.get(
@@ -177,8 +324,7 @@ def get_by_id(
     r"""
     Retrieves the document having the specified `id`, regardless of which schema-described collection it resides in.
     """
-    id_dict = map_id_to_collection(mdb)
-    collection_name = get_collection_for_id(doc_id, id_dict)
+    collection_name = get_collection_for_id(doc_id, mdb)
     return strip_oid(
         raise404_if_none(
             collection_name and (mdb[collection_name].find_one({"id": doc_id}))
@@ -209,10 +355,9 @@ def get_collection_name_by_doc_id(
     If it finds one, it responds with the name of the collection containing the document.
     If it does not find one, it response with an `HTTP 404 Not Found` response.
     """
-    # Note: The `nmdc_runtime.api.core.metadata.map_id_to_collection` function is
-    #       not used here because that function (a) only processes collections whose
-    #       names end with `_set` and (b) only works for `id` values that are in
-    #       use in the database (as opposed to hypothetical `id` values).
+    # Note: The `nmdc_runtime.api.core.metadata.get_collection_for_id` function is
+    #       not used here because that function only works for `id` values that are
+    #       in use in the database (as opposed to hypothetical `id` values).
 
     # Extract the typecode portion, if any, of the specified `id`.
     #
@@ -220,9 +365,7 @@ def get_collection_name_by_doc_id(
     # - "nmdc:foo-123-456" → "foo"
     # - "foo:nmdc-123-456" → `None`
     #
-    pattern = re.compile(r"^nmdc:(\w+)?-")
-    match = pattern.search(doc_id)
-    typecode_portion = match.group(1) if match else None
+    typecode_portion = get_typecode_for_id(doc_id)
 
     if typecode_portion is None:
         raise HTTPException(
@@ -230,38 +373,17 @@ def get_collection_name_by_doc_id(
             detail=f"The typecode portion of the specified `id` is invalid.",
         )
 
-    # Determine the schema class, if any, of which the specified `id` could belong to an instance.
-    schema_class_name = None
-    for typecode in typecodes():
-        if typecode_portion == typecode["name"]:
-            schema_class_name_prefixed = typecode["schema_class"]
-            schema_class_name = schema_class_name_prefixed.replace("nmdc:", "", 1)
-            break
+    # Determine the schema class, if any, of which the specified `id` could belong to an instance,
+    # and the Mongo collection(s) in which instances of that schema class can reside.
+    typecode_entry = typecode_table().get(typecode_portion)
 
-    if schema_class_name is None:
+    if typecode_entry is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"The specified `id` is not compatible with any schema classes.",
         )
 
-    # Determine the Mongo collection(s) in which instances of that schema class can reside.
-    collection_names = []
-    schema_view = SchemaView(get_nmdc_schema_definition())
-    for slot_name in schema_view.class_slots(DATABASE_CLASS_NAME):
-        slot_definition = schema_view.induced_slot(slot_name, DATABASE_CLASS_NAME)
-
-        # If this slot doesn't represent a Mongo collection, abort this iteration.
-        if not (slot_definition.multivalued and slot_definition.inlined_as_list):
-            continue
-
-        # Determine the names of the classes whose instances can be stored in this collection.
-        name_of_eligible_class = slot_definition.range
-        names_of_eligible_classes = schema_view.class_descendants(
-            name_of_eligible_class
-        )
-        if schema_class_name in names_of_eligible_classes:
-            collection_names.append(slot_name)
-
+    collection_names = typecode_entry["collection_names"]
     if len(collection_names) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -273,7 +395,7 @@ def get_collection_name_by_doc_id(
     containing_collection_name = None
     for collection_name in collection_names:
         collection = mdb.get_collection(name=collection_name)
-        if collection.count_documents(dict(id=doc_id), limit=1) > 0:
+        if collection.find_one({"id": doc_id}, {"_id": 1}) is not None:
             containing_collection_name = collection_name
             break
 
@@ -1,16 +1,31 @@
 import json
-from typing import List
+import os
+import threading
+from time import monotonic
+from typing import Callable, List, Optional, Tuple
 
 import bson.json_util
-from fastapi import APIRouter, Depends, status, HTTPException
+from bson import Int64
+from fastapi import APIRouter, Depends, status, HTTPException, Query as QueryParam
+from pymongo import DeleteMany, DeleteOne, UpdateMany, UpdateOne
+from pymongo.client_session import ClientSession
+from pymongo.collection import Collection as MongoCollection
 from pymongo.database import Database as MongoDatabase
+from pymongo.errors import BulkWriteError, OperationFailure
+from pymongo.results import BulkWriteResult
+from starlette.responses import Response, StreamingResponse
 
 from nmdc_runtime.api.core.idgen import generate_one_id
 from nmdc_runtime.api.core.util import now, raise404_if_none
 from nmdc_runtime.api.db.mongo import (
     get_mongo_db,
     get_nonempty_nmdc_schema_collection_names,
+    forget_id_routes,
+    log_txns,
+    record_id_routes,
+    supports_transactions,
 )
+from nmdc_runtime.api.endpoints.nmdcschema import iter_export_chunks
 from nmdc_runtime.api.endpoints.util import (
     check_action_permitted,
     strip_oid,
@@ -24,6 +39,11 @@ from nmdc_runtime.api.models.query import (
     command_response_for,
     QueryCmd,
     UpdateCommand,
+    FindCommand,
+    AggregateCommand,
+    GetMoreCommand,
+    GetMoreCommandResponse,
+    QueryNextRequest,
 )
 from nmdc_runtime.api.models.user import get_current_active_user, User
 from nmdc_runtime.util import OverlayDB, validate_json
@@ -31,9 +51,151 @@ from nmdc_runtime.util import OverlayDB, validate_json
 router = APIRouter()
 
 
-def unmongo(d: dict) -> dict:
-    """Ensure a dict with e.g. mongo ObjectIds will serialize as JSON."""
-    return json.loads(bson.json_util.dumps(d))
+_encode_json = json.JSONEncoder(default=bson.json_util.default).encode
+
+
+def unmongo(d: dict) -> Response:
+    """Encode a dict with e.g. mongo ObjectIds directly as a JSON response, in a single pass."""
+    return Response(content=_encode_json(d), media_type="application/json")
+
+
+# Whether to hold the cursors of `find` and `aggregate` queries open for `/queries:next`.
+#
+# Note: Cursors (and the sessions they are pinned to) are held by the API process that opened them, so a
+#       `/queries:next` request only finds its cursor if it is served by that same process. Only enable this (by
+#       setting the `QUERY_CURSORS_ENABLED` environment variable to "true") when the API runs as a single process,
+#       e.g. a single uvicorn worker. Otherwise, results that do not fit in the first batch are available via
+#       `/queries:run?stream=true`.
+QUERY_CURSORS_ENABLED = os.getenv("QUERY_CURSORS_ENABLED", "false").lower() == "true"
+
+# How long (in seconds) a query cursor may be idle before it is closed (and its session ended).
+QUERY_CURSOR_IDLE_TIMEOUT_S = 300
+
+# Maps the id of each open query cursor to the session it is pinned to (getMore commands must use the session that
+# created the cursor), its database and collection, the user who opened it, when it was last used, and how many
+# requests are using it (an idle cursor is only closed if none are).
+_query_cursors = {}
+_query_cursors_lock = threading.Lock()
+
+
+def _end_query_cursor(cursor_id: int, entry: dict, kill: bool = False):
+    try:
+        if kill:
+            entry["db"].command(
+                {"killCursors": entry["collection"], "cursors": [Int64(cursor_id)]},
+                session=entry["session"],
+            )
+    finally:
+        entry["session"].end_session()
+
+
+def _close_query_cursor(cursor_id: int, kill: bool = False):
+    with _query_cursors_lock:
+        entry = _query_cursors.pop(cursor_id, None)
+    if entry is not None:
+        _end_query_cursor(cursor_id, entry, kill=kill)
+
+
+def _close_idle_query_cursors():
+    # Idle cursors are unregistered while holding the lock, so that no request can start using one in the meantime.
+    with _query_cursors_lock:
+        idle_cursors = [
+            (cursor_id, entry)
+            for cursor_id, entry in _query_cursors.items()
+            if monotonic() - entry["last_used"] > QUERY_CURSOR_IDLE_TIMEOUT_S
+            and entry["n_in_use"] == 0
+        ]
+        for cursor_id, _ in idle_cursors:
+            del _query_cursors[cursor_id]
+    for cursor_id, entry in idle_cursors:
+        try:
+            _end_query_cursor(cursor_id, entry, kill=True)
+        except Exception:
+            pass  # the server will time out the cursor anyway
+
+
+def _run_cursor_command(cmd: dict, mdb: MongoDatabase, username: Optional[str]) -> dict:
+    r"""
+    Runs a `find` or `aggregate` command in a dedicated session, keeping that session (and thus the ability to get
+    more results from the command's cursor) around until the cursor is exhausted or idle.
+
+    If query cursors are not enabled (see `QUERY_CURSORS_ENABLED`), the cursor is closed right away instead, and a
+    response whose first batch does not hold all results has a `cursor.id` of 0 and `partialResultsReturned` set.
+    """
+    _close_idle_query_cursors()
+    session: ClientSession = mdb.client.start_session()
+    try:
+        q_response = mdb.command(cmd, session=session)
+    except Exception:
+        session.end_session()
+        raise
+    cursor_id = q_response.get("cursor", {}).get("id", 0)
+    if cursor_id and not QUERY_CURSORS_ENABLED:
+        try:
+            _end_query_cursor(
+                cursor_id,
+                {
+                    "session": session,
+                    "db": mdb,
+                    "collection": q_response["cursor"]["ns"].split(".", 1)[1],
+                },
+                kill=True,
+            )
+        except OperationFailure:
+            pass  # the server will time out the cursor anyway
+        q_response["cursor"]["id"] = 0
+        q_response["cursor"]["partialResultsReturned"] = True
+    elif cursor_id:
+        with _query_cursors_lock:
+            _query_cursors[cursor_id] = {
+                "session": session,
+                "db": mdb,
+                "collection": q_response["cursor"]["ns"].split(".", 1)[1],
+                "username": username,
+                "last_used": monotonic(),
+                "n_in_use": 0,
+                "lock": threading.Lock(),
+            }
+    else:
+        session.end_session()
+    return q_response
+
+
+def _get_more(
+    cursor_id: int, batch_size: Optional[int], username: Optional[str]
+) -> dict:
+    r"""Runs a `getMore` command for an open query cursor, in the session that cursor is pinned to."""
+    _close_idle_query_cursors()
+    cursor_not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Cursor {cursor_id} is unknown, exhausted, or expired.",
+    )
+    with _query_cursors_lock:
+        entry = _query_cursors.get(cursor_id)
+        if entry is None or entry["username"] != username:
+            raise cursor_not_found
+        entry["n_in_use"] += 1
+    cmd = {"getMore": Int64(cursor_id), "collection": entry["collection"]}
+    if batch_size is not None:
+        cmd["batchSize"] = batch_size
+    try:
+        with entry["lock"]:
+            # A concurrent request for the same cursor may have exhausted (and closed) it in the meantime.
+            with _query_cursors_lock:
+                if _query_cursors.get(cursor_id) is not entry:
+                    raise cursor_not_found
+            try:
+                q_response = entry["db"].command(cmd, session=entry["session"])
+            except OperationFailure:
+                _close_query_cursor(cursor_id)
+                raise
+            entry["last_used"] = monotonic()
+    finally:
+        with _query_cursors_lock:
+            entry["n_in_use"] -= 1
+    if not q_response["cursor"].get("id"):
+        _close_query_cursor(cursor_id)
+    return q_response
 
 
 def check_can_update_and_delete(user: User):
@@ -50,15 +212,22 @@ def check_can_update_and_delete(user: User):
 @router.post("/queries:run", response_model=QueryResponseOptions)
 def run_query(
     query_cmd: QueryCmd,
+    stream: bool = QueryParam(
+        False,
+        description="For `find` and `aggregate`, stream *all* results as newline-delimited JSON (NDJSON).",
+    ),
     mdb: MongoDatabase = Depends(get_mongo_db),
     user: User = Depends(get_current_active_user),
 ):
     """
     Allows `find`, `aggregate`, `update`, and `delete` commands for users with permissions.
 
-    For `find` and `aggregate`, note that cursor batching/pagination does *not*
-    work via this API, so ensure that you construct a command that will return
-    what you need in the "first batch". Also, the maximum size of the returned payload is 16MB.
+    For `find` and `aggregate`, the response includes the "first batch" of results. Use `?stream=true` to get all
+    results as one NDJSON response instead.
+
+    If this API runs as a single process with query cursors enabled, and there are more results, `cursor.id` is
+    nonzero, and you can get subsequent batches via `/queries:next`. Cursors are closed after five minutes of
+    inactivity. Otherwise, if there are more results, `cursor.partialResultsReturned` is `true`.
 
     Examples:
     ```
@@ -100,10 +269,34 @@ def run_query(
         saved_at=saved_at,
     )
     mdb.queries.insert_one(query.model_dump(exclude_unset=True))
-    cmd_response = _run_query(query, mdb)
+    if stream and isinstance(query_cmd, (FindCommand, AggregateCommand)):
+        # The command runs (and fails, if invalid) here; the run is recorded before its results are streamed.
+        cursor = mdb.cursor_command(query_cmd.model_dump(exclude_unset=True))
+        query_run = QueryRun(qid=query.id, ran_at=now(), result={"ok": 1})
+        mdb.query_runs.insert_one(query_run.model_dump(exclude_unset=True))
+        return StreamingResponse(
+            iter_export_chunks(cursor, "ndjson"),
+            media_type="application/x-ndjson",
+        )
+    cmd_response = _run_query(query, mdb, user.username)
     return unmongo(cmd_response.model_dump(exclude_unset=True))
 
 
+@router.post("/queries:next", response_model=GetMoreCommandResponse)
+def get_next_query_batch(
+    req: QueryNextRequest,
+    user: User = Depends(get_current_active_user),
+):
+    """
+    Gets the next batch of results from the cursor of a `find` or `aggregate` command run via `/queries:run`.
+
+    The cursor is exhausted (and closed) once the returned `cursor.id` is zero. This is only available if this
+    API runs as a single process with query cursors enabled.
+    """
+    q_response = _get_more(req.cursor_id, req.batchSize, user.username)
+    return unmongo(GetMoreCommandResponse(**q_response).model_dump(exclude_unset=True))
+
+
 @router.get("/queries/{query_id}", response_model=Query)
 def get_query(
     query_id: str,
@@ -130,13 +323,119 @@ def rerun_query(
     if isinstance(query, DeleteCommand):
         check_can_update_and_delete(user)
 
-    cmd_response = _run_query(query, mdb)
+    cmd_response = _run_query(query, mdb, user.username)
     return unmongo(cmd_response.model_dump(exclude_unset=True))
 
 
-def _run_query(query, mdb) -> CommandResponse:
+# Top-level query operators that may be combined in an `$or` of filters without changing the filters' meaning.
+# A filter with any other top-level operator (e.g. `$text`, which `$or` may only wrap if every clause is indexed,
+# or `$where` and `$expr`) is run as its own query.
+_OR_MERGEABLE_OPERATORS = {"$and", "$or", "$nor"}
+
+
+def _find_affected_docs(
+    collection: MongoCollection,
+    specs: List[dict],
+    session: Optional[ClientSession] = None,
+) -> List[dict]:
+    r"""
+    Returns the distinct documents in the specified collection that are matched by the specified find specs (each
+    having a `filter` and a `limit` of 0 or 1), i.e. the documents that a delete or update command having
+    corresponding statements would affect.
+
+    The documents matched by unlimited specs are fetched in a single `$or` query, except for filters that have a
+    top-level operator an `$or` cannot wrap, which are queried on their own; each limited spec costs a `find_one`.
+    """
+    docs = {}
+    mergeable_filters, own_query_filters = [], []
+    for spec in specs:
+        if spec["limit"] == 0:
+            if all(
+                not k.startswith("$") or k in _OR_MERGEABLE_OPERATORS
+                for k in spec["filter"]
+            ):
+                mergeable_filters.append(spec["filter"])
+            else:
+                own_query_filters.append(spec["filter"])
+    if len(mergeable_filters) > 1:
+        mergeable_filters = [{"$or": mergeable_filters}]
+    for filter_ in mergeable_filters + own_query_filters:
+        for doc in collection.find(filter_, session=session):
+            docs.setdefault(doc["_id"], doc)
+    for spec in specs:
+        if spec["limit"] != 0 and (
+            doc := collection.find_one(spec["filter"], session=session)
+        ):
+            docs.setdefault(doc["_id"], doc)
+    return list(docs.values())
+
+
+def _backup_and_bulk_write(
+    mdb: MongoDatabase,
+    collection_name: str,
+    specs: List[dict],
+    backup_db_name: str,
+    backup_doc_for: Callable[[dict], dict],
+    requests: list,
+    comment=None,
+    read_ids_after_write: bool = False,
+) -> Tuple[List[dict], BulkWriteResult, List[Optional[str]]]:
+    r"""
+    Finds the documents in the specified collection that are matched by the specified find specs (see
+    `_find_affected_docs`), inserts a backup document (made by `backup_doc_for`) for each of them into the
+    same-named collection in the specified backup database, and then performs the specified bulk write on the
+    specified collection.
+
+    Returns the affected documents (as they were before the write), the result of the bulk write, and, if
+    `read_ids_after_write` is true, the `id`s of the affected and upserted documents as they are after the write.
+
+    All steps happen in a single multi-document transaction if the deployment supports transactions (see
+    `supports_transactions`), so the affected documents are exactly the ones that were backed up and written;
+    otherwise, they happen one after the other.
+    """
+
+    def backup_and_write(session: Optional[ClientSession] = None):
+        docs = _find_affected_docs(mdb[collection_name], specs, session=session)
+        if docs:
+            mdb.client[backup_db_name][collection_name].insert_many(
+                [backup_doc_for(d) for d in docs], session=session
+            )
+        result = mdb[collection_name].bulk_write(
+            requests, session=session, comment=comment
+        )
+        ids_after_write = []
+        if read_ids_after_write:
+            # Documents created by upserts, and `id`s changed by the write, only show up after the write.
+            written_oids = [d["_id"] for d in docs] + list(result.upserted_ids.values())
+            ids_after_write = [
+                d.get("id")
+                for d in mdb[collection_name].find(
+                    {"_id": {"$in": written_oids}}, {"id": 1}, session=session
+                )
+            ]
+        return docs, result, ids_after_write
+
+    try:
+        if supports_transactions(mdb):
+            with mdb.client.start_session() as session:
+                return session.with_transaction(backup_and_write)
+        return backup_and_write()
+    except BulkWriteError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Failed to apply command: {e.details.get('writeErrors')}",
+        )
+
+
+def _hint(statement) -> Optional[list]:
+    return list(statement.hint.items()) if statement.hint else None
+
+
+def _run_query(query, mdb, username: Optional[str] = None) -> CommandResponse:
     q_type = type(query.cmd)
     ran_at = now()
+    deleted_ids = []
+    ids_before_update, ids_after_update = [], []
     if q_type is DeleteCommand:
         collection_name = query.cmd.delete
         if collection_name not in get_nonempty_nmdc_schema_collection_names(mdb):
@@ -144,22 +443,25 @@ def _run_query(query, mdb) -> CommandResponse:
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Can only delete documents in nmdc-schema collections.",
             )
-        delete_specs = [
-            {"filter": del_statement.q, "limit": del_statement.limit}
-            for del_statement in query.cmd.deletes
-        ]
-        for spec in delete_specs:
-            docs = list(mdb[collection_name].find(**spec))
-            if not docs:
-                continue
-            insert_many_result = mdb.client["nmdc_deleted"][
-                collection_name
-            ].insert_many({"doc": d, "deleted_at": ran_at} for d in docs)
-            if len(insert_many_result.inserted_ids) != len(docs):
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to back up to-be-deleted documents. operation aborted.",
+        docs, result, _ = _backup_and_bulk_write(
+            mdb,
+            collection_name,
+            [
+                {"filter": del_statement.q, "limit": del_statement.limit}
+                for del_statement in query.cmd.deletes
+            ],
+            "nmdc_deleted",
+            lambda d: {"doc": d, "deleted_at": ran_at},
+            [
+                (DeleteOne if del_statement.limit == 1 else DeleteMany)(
+                    del_statement.q, hint=_hint(del_statement)
                 )
+                for del_statement in query.cmd.deletes
+            ],
+            comment=query.cmd.comment,
+        )
+        deleted_ids = [d.get("id") for d in docs]
+        q_response = {"ok": 1, "n": result.deleted_count}
     elif q_type is UpdateCommand:
         collection_name = query.cmd.update
         if collection_name not in get_nonempty_nmdc_schema_collection_names(mdb):
@@ -171,64 +473,89 @@ def _run_query(query, mdb) -> CommandResponse:
             {"filter": up_statement.q, "limit": 0 if up_statement.multi else 1}
             for up_statement in query.cmd.updates
         ]
-        # Execute this "update" command on a temporary "overlay" database so we can
-        # validate its outcome before executing it on the real database. If its outcome
-        # is invalid, we will abort and raise an "HTTP 422" exception.
+        # Execute this "update" command on a temporary "overlay" database, seeded with the affected documents,
+        # so we can validate its outcome before executing it on the real database. If its outcome is invalid,
+        # we will abort and raise an "HTTP 422" exception.
         #
-        # TODO: Consider wrapping this entire "preview-then-apply" sequence within a
-        #       MongoDB transaction so as to avoid race conditions where the overlay
-        #       database at "preview" time does not reflect the state of the database
-        #       at "apply" time. This will be necessary once the "preview" step
-        #       accounts for referential integrity.
+        # Note: The overlay collection ends up containing exactly the documents the command would write (including
+        #       any it would upsert), so those are the documents we validate.
         #
         with OverlayDB(mdb) as odb:
             odb.apply_updates(
                 collection_name,
                 [u.model_dump(mode="json", exclude="hint") for u in query.cmd.updates],
-            )
-            _ids_to_check = set()
-            for spec in update_specs:
-                for doc in mdb[collection_name].find(
-                    filter=spec["filter"],
-                    limit=spec["limit"],
-                    projection={
-                        "_id": 1
-                    },  # unique `id` not guaranteed (see e.g. `functional_annotation_agg`)
-                ):
-                    _ids_to_check.add(doc["_id"])
-            docs_to_check = odb._top_db[collection_name].find(
-                {"_id": {"$in": list(_ids_to_check)}}
+                bottom_docs=_find_affected_docs(mdb[collection_name], update_specs),
             )
             rv = validate_json(
-                {collection_name: [strip_oid(d) for d in docs_to_check]}, mdb
+                {
+                    collection_name: [
+                        strip_oid(d) for d in odb._top_db[collection_name].find()
+                    ]
+                },
+                mdb,
+                instantiate_dataclasses=False,
             )
             if rv["result"] == "errors":
                 raise HTTPException(
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                     detail=f"Schema document(s) would be invalid after proposed update: {rv['detail']}",
                 )
-        for spec in update_specs:
-            docs = list(mdb[collection_name].find(**spec))
-            if not docs:
-                continue
-            insert_many_result = mdb.client["nmdc_updated"][
-                collection_name
-            ].insert_many({"doc": d, "updated_at": ran_at} for d in docs)
-            if len(insert_many_result.inserted_ids) != len(docs):
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to back up to-be-updated documents. operation aborted.",
+        docs, result, ids_after_update = _backup_and_bulk_write(
+            mdb,
+            collection_name,
+            update_specs,
+            "nmdc_updated",
+            lambda d: {"doc": d, "updated_at": ran_at},
+            [
+                (UpdateMany if up_statement.multi else UpdateOne)(
+                    up_statement.q,
+                    up_statement.u,
+                    upsert=up_statement.upsert,
+                    hint=_hint(up_statement),
                 )
-
-    q_response = mdb.command(query.cmd.model_dump(exclude_unset=True))
+                for up_statement in query.cmd.updates
+            ],
+            comment=query.cmd.comment,
+            read_ids_after_write=True,
+        )
+        ids_before_update = [d.get("id") for d in docs]
+        q_response = {
+            "ok": 1,
+            "n": result.matched_count + result.upserted_count,
+            "nModified": result.modified_count,
+        }
+        if result.upserted_ids:
+            q_response["upserted"] = [
+                {"index": index, "_id": _id}
+                for index, _id in sorted(result.upserted_ids.items())
+            ]
+    elif q_type is GetMoreCommand:
+        q_response = _get_more(query.cmd.getMore, query.cmd.batchSize, username)
+    elif q_type in (FindCommand, AggregateCommand):
+        q_response = _run_cursor_command(
+            query.cmd.model_dump(exclude_unset=True), mdb, username
+        )
+    else:
+        q_response = mdb.command(query.cmd.model_dump(exclude_unset=True))
     cmd_response: CommandResponse = command_response_for(q_type)(**q_response)
     query_run = (
         QueryRun(qid=query.id, ran_at=ran_at, result=cmd_response)
         if cmd_response.ok
         else QueryRun(qid=query.id, ran_at=ran_at, error=cmd_response)
     )
+    if q_type is DeleteCommand and cmd_response.ok:
+        forget_id_routes(mdb, deleted_ids)
+        log_txns(mdb, collection_name, deleted_ids, "delete")
+    if q_type is UpdateCommand and cmd_response.ok:
+        record_id_routes(mdb, collection_name, ids_after_update)
+        forget_id_routes(mdb, set(ids_before_update) - set(ids_after_update))
+        log_txns(
+            mdb,
+            collection_name,
+            dict.fromkeys(ids_before_update + ids_after_update),
+            "update",
+        )
     if q_type in (DeleteCommand, UpdateCommand):
-        # TODO `_request_dagster_run` of `ensure_alldocs`?
         if cmd_response.n == 0:
             raise HTTPException(
                 status_code=status.HTTP_418_IM_A_TEAPOT,
@@ -8,6 +8,7 @@ from starlette.status import HTTP_403_FORBIDDEN
 from nmdc_runtime.api.core.auth import (
     ClientCredentials,
     get_password_hash,
+    forget_cached_principals,
 )
 from nmdc_runtime.api.core.idgen import generate_one_id, local_part
 from nmdc_runtime.api.core.util import (
@@ -62,6 +63,7 @@ def create_site(
         {"username": user.username},
         {"$addToSet": {"site_admin": site.id}},
     )
+    forget_cached_principals()
     if rv.modified_count != 1:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -223,6 +225,7 @@ def generate_credentials_for_site_client(
         {"id": site_id},
         {"$push": {"clients": {"id": client_id, "hashed_secret": hashed_secret}}},
     )
+    forget_cached_principals()
 
     return {
         "client_id": client_id,
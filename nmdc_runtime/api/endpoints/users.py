@@ -22,7 +22,7 @@ from nmdc_runtime.api.core.auth import (
     ORCID_NMDC_CLIENT_SECRET,
     ORCID_BASE_URL,
 )
-from nmdc_runtime.api.core.auth import get_password_hash
+from nmdc_runtime.api.core.auth import get_password_hash, forget_cached_principals
 from nmdc_runtime.api.core.util import generate_secret
 from nmdc_runtime.api.db.mongo import get_mongo_db
 from nmdc_runtime.api.endpoints.util import BASE_URL_EXTERNAL
@@ -212,4 +212,5 @@ def update_user(
         ).model_dump(exclude_unset=True)
 
     mdb.users.update_one({"username": username}, {"$set": user_dict})
+    forget_cached_principals()
     return mdb.users.find_one({"username": user_in.username})
@@ -1,9 +1,12 @@
+import heapq
 import logging
 import os
 import re
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import lru_cache
+from itertools import islice, takewhile
 from json import JSONDecodeError
 from pathlib import Path
 from time import time_ns
@@ -11,15 +14,19 @@ from typing import List, Optional, Set, Tuple
 from urllib.parse import parse_qs, urlparse
 from zoneinfo import ZoneInfo
 
-from bson import json_util
+from bson import Binary, Decimal128, Int64, ObjectId, Regex, Timestamp, json_util
 from dagster import DagsterRunStatus
 from dagster_graphql import DagsterGraphQLClientError
 from fastapi import HTTPException
 from gridfs import GridFS
 from nmdc_runtime.api.core.idgen import generate_one_id, local_part
 from nmdc_runtime.api.core.util import (
+    TTLCache,
+    decode_page_token,
     dotted_path_for,
+    encode_page_token,
     expiry_dt_from_now,
+    hash_from_str,
     raise404_if_none,
 )
 from nmdc_runtime.api.db.mongo import activity_collection_names, get_mongo_db
@@ -51,7 +58,7 @@ from pymongo.collection import Collection as MongoCollection
 from pymongo.database import Database as MongoDatabase
 from pymongo.errors import DuplicateKeyError
 from starlette import status
-from toolz import assoc_in, concat, dissoc, get_in, merge
+from toolz import assoc_in, dissoc, get_in, merge
 
 BASE_URL_INTERNAL = os.getenv("API_HOST")
 BASE_URL_EXTERNAL = os.getenv("API_HOST_EXTERNAL")
@@ -76,6 +83,28 @@ def check_filter(filter_: str):
     return filter_
 
 
+# How long (in seconds) to reuse what we learned about a collection's indexes.
+INDEX_INFO_TTL_S = 60
+
+# Maps (database name, collection name) to whether that collection has an `id` index.
+_id_index_info = TTLCache(maxsize=1_000, ttl=INDEX_INFO_TTL_S)
+
+
+def has_id_index(mdb: MongoDatabase, collection_name: str) -> bool:
+    r"""
+    Returns `True` if the specified collection has an index on its `id` field.
+
+    The answer is reused for `INDEX_INFO_TTL_S` seconds, so that paging through a collection does not
+    fetch its index information once per page.
+    """
+    key = (mdb.name, collection_name)
+    answer = _id_index_info.get(key)
+    if answer is None:
+        answer = "id_1" in mdb[collection_name].index_information()
+        _id_index_info.set(key, answer)
+    return answer
+
+
 def list_resources(req: ListRequest, mdb: MongoDatabase, collection_name: str):
     r"""
     Returns a dictionary containing the requested MongoDB documents, maybe alongside pagination information.
@@ -84,10 +113,13 @@ def list_resources(req: ListRequest, mdb: MongoDatabase, collection_name: str):
           filter criteria is _larger_ than that number, this function will paginate the resources. Paginating the
           resources currently involves MongoDB sorting _all_ matching documents, which can take a long time, especially
           when the collection involved contains many documents.
+
+    The `next_page_token` is self-contained and signed (see `encode_page_token`), so listing a collection page by
+    page writes nothing to the database, and a page can be re-requested with the same token.
     """
 
     id_field = "id"
-    if "id_1" not in mdb[collection_name].index_information():
+    if not has_id_index(mdb, collection_name):
         logging.warning(
             f"list_resources: no index set on 'id' for collection {collection_name}"
         )
@@ -101,14 +133,18 @@ def list_resources(req: ListRequest, mdb: MongoDatabase, collection_name: str):
         if req.projection
         else None
     )
+    # The token is bound to the collection and filter it was issued for.
+    query_hash = hash_from_str(json_util.dumps([collection_name, filter_]))
     if req.page_token:
-        doc = mdb.page_tokens.find_one({"_id": req.page_token, "ns": collection_name})
-        if doc is None:
+        try:
+            token = decode_page_token(req.page_token)
+        except ValueError:
+            token = None
+        if token is None or token.get("q") != query_hash:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Bad page_token"
             )
-        last_id = doc["last_id"]
-        mdb.page_tokens.delete_one({"_id": req.page_token})
+        last_id = token["last_id"]
     else:
         last_id = None
     if last_id is not None:
@@ -118,29 +154,28 @@ def list_resources(req: ListRequest, mdb: MongoDatabase, collection_name: str):
             filter_ = merge(filter_, {id_field: {"$gt": last_id}})
 
     # If limit is 0, the response will include all results (bypassing pagination altogether).
-    if (limit == 0) or (mdb[collection_name].count_documents(filter=filter_) <= limit):
-        rv = {
+    if limit == 0:
+        return {
             "resources": list(
                 mdb[collection_name].find(filter=filter_, projection=projection)
             )
         }
-        return rv
-    else:
-        resources = list(
-            mdb[collection_name].find(
-                filter=filter_,
-                projection=projection,
-                limit=limit,
-                sort=[(id_field, 1)],
-                allow_disk_use=True,
-            )
-        )
-        last_id = resources[-1][id_field]
-        token = generate_one_id(mdb, "page_tokens")
-        mdb.page_tokens.insert_one(
-            {"_id": token, "ns": collection_name, "last_id": last_id}
+
+    # Fetch one more resource than requested, to learn whether there is a next page.
+    resources = list(
+        mdb[collection_name].find(
+            filter=filter_,
+            projection=projection,
+            limit=limit + 1,
+            sort=[(id_field, 1)],
+            allow_disk_use=True,
         )
-        return {"resources": resources, "next_page_token": token}
+    )
+    if len(resources) <= limit:
+        return {"resources": resources}
+    resources = resources[:limit]
+    token = encode_page_token({"q": query_hash, "last_id": resources[-1][id_field]})
+    return {"resources": resources, "next_page_token": token}
 
 
 def coerce_to_float_if_possible(val):
@@ -240,6 +275,89 @@ def strip_oid(doc: dict) -> dict:
     return dissoc(doc, "_id")
 
 
+# How long (in seconds) to reuse a collection's estimated document count.
+ESTIMATED_COUNT_TTL_S = 60
+
+# Maps (database name, collection name) to that collection's estimated document count.
+_estimated_counts = TTLCache(maxsize=1_000, ttl=ESTIMATED_COUNT_TTL_S)
+
+
+def count_resources(
+    mdb: MongoDatabase, collection_name: str, filter_: dict, count: str = "exact"
+) -> Optional[int]:
+    r"""
+    Returns the number of documents in the specified collection that match the specified filter, computed the way
+    the specified `count` mode (`exact`, `estimated`, or `none`) says to compute it.
+
+    For the `estimated` mode with an empty filter, the count comes from the collection's metadata, and is
+    reused for `ESTIMATED_COUNT_TTL_S` seconds. With a non-empty filter, there is no cheap estimate, so the count
+    is computed exactly.
+    """
+    if count == "none":
+        return None
+    if count == "estimated" and not filter_:
+        key = (mdb.name, collection_name)
+        estimated_count = _estimated_counts.get(key)
+        if estimated_count is None:
+            estimated_count = mdb[collection_name].estimated_document_count()
+            _estimated_counts.set(key, estimated_count)
+        return estimated_count
+    return mdb[collection_name].count_documents(filter=filter_)
+
+
+def get_keyset_filter(sort: List[Tuple[str, int]], last_values: list) -> dict:
+    r"""
+    Returns a MongoDB filter matching the documents that come _after_ the document having the specified values of
+    the sort fields, in the specified sort order. The last sort field must be unique (e.g. `id`), so that the order is
+    total.
+
+    MongoDB's comparison operators (`$gt`, `$lt`) only match values of the same BSON type as the operand, whereas a
+    sort orders values of different types by type (see `bson_sort_rank`). So, for a sort field whose values are of
+    mixed types, the documents coming after a value also include those whose value is of a type sorting after that
+    value's type, which are matched via `$type`.
+
+    Note: MongoDB orders a missing or `null` value before any other value. Array-valued sort fields are not
+          supported, since MongoDB sorts an array by one of its elements.
+
+    >>> get_keyset_filter([("id", 1)], ["nmdc:bsm-11-abc123"])  # doctest: +NORMALIZE_WHITESPACE
+    {'$or': [{'$or': [{'id': {'$gt': 'nmdc:bsm-11-abc123'}},
+                      {'id': {'$type': ['object', 'array', 'binData', 'objectId', 'bool', 'date', 'timestamp',
+                                        'regex']}}]}]}
+    >>> get_keyset_filter([("depth", -1), ("id", 1)], [5, "nmdc:bsm-11-abc123"])  # doctest: +NORMALIZE_WHITESPACE
+    {'$or': [{'$or': [{'depth': {'$lt': 5}}, {'depth': None}]},
+             {'depth': 5, '$or': [{'id': {'$gt': 'nmdc:bsm-11-abc123'}},
+                                  {'id': {'$type': ['object', 'array', 'binData', 'objectId', 'bool', 'date',
+                                                    'timestamp', 'regex']}}]}]}
+    """
+    branches = []
+    for i, ((field, direction), value) in enumerate(zip(sort, last_values)):
+        equal_so_far = {f: v for (f, _), v in zip(sort[:i], last_values[:i])}
+        type_group = bson_type_group(value)
+        if value is None:
+            if direction == -1:
+                continue  # nothing comes after a `null` in descending order
+            after = {field: {"$ne": None}}
+        elif direction == 1:
+            later_types = [
+                t for group in BSON_TYPE_GROUPS[type_group + 1 :] for t in group
+            ]
+            after = {
+                "$or": [{field: {"$gt": value}}]
+                + ([{field: {"$type": later_types}}] if later_types else [])
+            }
+        else:
+            earlier_types = [
+                t for group in BSON_TYPE_GROUPS[1:type_group] for t in group
+            ]
+            after = {
+                "$or": [{field: {"$lt": value}}]
+                + ([{field: {"$type": earlier_types}}] if earlier_types else [])
+                + [{field: None}]
+            }
+        branches.append(merge(equal_so_far, after))
+    return {"$or": branches} if branches else {"_id": {"$exists": False}}
+
+
 def timeit(cursor):
     """Collect from cursor and return time taken in milliseconds."""
     tic = time_ns()
@@ -248,10 +366,9 @@ def timeit(cursor):
     return results, int(round((toc - tic) / 1e6))
 
 
-def find_resources(req: FindRequest, mdb: MongoDatabase, collection_name: str):
-    """Find nmdc schema collection entities that match the FindRequest.
-
-    "resources" is used generically here, as in "Web resources", e.g. Uniform Resource Identifiers (URIs).
+def raise_if_unsupported(req: FindRequest):
+    r"""
+    Raises an HTTP 418 exception if the specified request uses a parameter we don't support yet.
     """
     if req.group_by:
         raise HTTPException(
@@ -267,15 +384,37 @@ def find_resources(req: FindRequest, mdb: MongoDatabase, collection_name: str):
             ),
         )
 
+
+def get_total_sort(sort_: Optional[List[Tuple[str, int]]]) -> List[Tuple[str, int]]:
+    r"""
+    Returns the specified sort, made total by sorting by the (unique) `id` last. Any sort fields after `id` would be
+    moot, so they are dropped.
+
+    >>> get_total_sort(None)
+    [('id', 1)]
+    >>> get_total_sort([("depth", -1), ("id", -1), ("name", 1)])
+    [('depth', -1), ('id', -1)]
+    """
+    total_sort = list(takewhile(lambda a_s: a_s[0] != "id", sort_ or []))
+    total_sort.append(("id", dict(sort_ or []).get("id", 1)))
+    return total_sort
+
+
+def find_resources(req: FindRequest, mdb: MongoDatabase, collection_name: str):
+    """Find nmdc schema collection entities that match the FindRequest.
+
+    "resources" is used generically here, as in "Web resources", e.g. Uniform Resource Identifiers (URIs).
+    """
+    raise_if_unsupported(req)
+
     filter_ = get_mongo_filter(req.filter)
     projection = (
         list(set(comma_separated_values(req.fields)) | {"id"}) if req.fields else None
     )
     sort_ = get_mongo_sort(req.sort)
 
-    total_count = mdb[collection_name].count_documents(filter=filter_)
-
     if req.page:
+        total_count = count_resources(mdb, collection_name, filter_, req.count)
         skip = (req.page - 1) * req.per_page
         if skip > 10_000:
             raise HTTPException(
@@ -308,54 +447,66 @@ def find_resources(req: FindRequest, mdb: MongoDatabase, collection_name: str):
             rv["meta"]["fields"] = req.fields
 
     else:  # req.cursor is not None
+        if not has_id_index(mdb, collection_name):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor-based pagination is not enabled for this resource.",
+            )
+
+        sort_for_cursor = get_total_sort(sort_)
+        # The cursor is bound to the collection, filter, and sort it was issued for.
+        query_hash = hash_from_str(
+            json_util.dumps([collection_name, filter_, sort_for_cursor])
+        )
         if req.cursor != "*":
-            doc = mdb.page_tokens.find_one({"_id": req.cursor, "ns": collection_name})
-            if doc is None:
+            try:
+                token = decode_page_token(req.cursor)
+            except ValueError:
+                token = None
+            if token is None or token.get("q") != query_hash:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Bad cursor value"
                 )
-            last_id = doc["last_id"]
-            mdb.page_tokens.delete_one({"_id": req.cursor})
-        else:
-            last_id = None
-
-        if last_id is not None:
-            if "id" in filter_:
-                filter_["id"] = merge(filter_["id"], {"$gt": last_id})
-            else:
-                filter_ = merge(filter_, {"id": {"$gt": last_id}})
-
-        if "id_1" not in mdb[collection_name].index_information():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cursor-based pagination is not enabled for this resource.",
+            last_values, total_count = token["k"], token.get("n")
+            keyset_filter = get_keyset_filter(sort_for_cursor, last_values)
+            page_filter = (
+                {"$and": [filter_, keyset_filter]} if filter_ else keyset_filter
             )
+        else:
+            total_count = count_resources(mdb, collection_name, filter_, req.count)
+            page_filter = filter_
+
+        # The sort fields are needed to make the next cursor, even if they were not requested.
+        sort_fields = [a for a, _ in sort_for_cursor]
+        unrequested_fields = (
+            {a.split(".")[0] for a in sort_fields}
+            - {p.split(".")[0] for p in projection}
+            if projection
+            else set()
+        )
 
+        # Fetch one more result than requested, to learn whether there is a next page.
         limit = req.per_page
-        sort_for_cursor = (sort_ or []) + [("id", 1)]
         results, db_response_time_ms = timeit(
             mdb[collection_name].find(
-                filter=filter_, limit=limit, sort=sort_for_cursor, projection=projection
+                filter=page_filter,
+                limit=limit + 1,
+                sort=sort_for_cursor,
+                projection=(
+                    list(set(projection) | set(sort_fields)) if projection else None
+                ),
             )
         )
-        last_id = results[-1]["id"]
-
-        # Is this the last id overall? Then next_cursor should be None.
-        filter_eager = filter_
-        if "id" in filter_:
-            filter_eager["id"] = merge(filter_["id"], {"$gt": last_id})
-        else:
-            filter_eager = merge(filter_, {"id": {"$gt": last_id}})
-        more_results = (
-            mdb[collection_name].count_documents(filter=filter_eager, limit=limit) > 0
-        )
-        if more_results:
-            token = generate_one_id(mdb, "page_tokens")
-            mdb.page_tokens.insert_one(
-                {"_id": token, "ns": collection_name, "last_id": last_id}
+        if len(results) > limit:
+            results = results[:limit]
+            last_values = [get_in(a.split("."), results[-1]) for a in sort_fields]
+            next_cursor = encode_page_token(
+                {"q": query_hash, "k": last_values, "n": total_count}
             )
         else:
-            token = None
+            next_cursor = None
+        if unrequested_fields:
+            results = [dissoc(d, *unrequested_fields) for d in results]
 
         rv = {
             "meta": {
@@ -365,7 +516,7 @@ def find_resources(req: FindRequest, mdb: MongoDatabase, collection_name: str):
                 "db_response_time_ms": db_response_time_ms,
                 "page": None,
                 "per_page": req.per_page,
-                "next_cursor": token,
+                "next_cursor": next_cursor,
             },
             "results": [strip_oid(d) for d in results],
             "group_by": [],
@@ -375,6 +526,114 @@ def find_resources(req: FindRequest, mdb: MongoDatabase, collection_name: str):
     return rv
 
 
+# The groups of BSON types (as `$type` aliases) whose values a MongoDB sort orders by type, in that order. Values of
+# the types within a group are compared with each other by value.
+BSON_TYPE_GROUPS = [
+    ["null"],
+    ["number"],
+    ["string", "symbol"],
+    ["object"],
+    ["array"],
+    ["binData"],
+    ["objectId"],
+    ["bool"],
+    ["date"],
+    ["timestamp"],
+    ["regex"],
+]
+
+
+def bson_type_group(value) -> int:
+    r"""
+    Returns the index, in `BSON_TYPE_GROUPS`, of the group of BSON types the specified value is stored as.
+
+    >>> [bson_type_group(v) for v in (None, 3, 1.5, "a", {}, [], ObjectId(), True, datetime(2000, 1, 1))]
+    [0, 1, 1, 2, 3, 4, 6, 7, 8]
+    """
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 7
+    if isinstance(value, (int, float, Int64, Decimal128)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    if isinstance(value, dict):
+        return 3
+    if isinstance(value, list):
+        return 4
+    if isinstance(value, (bytes, Binary)):
+        return 5
+    if isinstance(value, ObjectId):
+        return 6
+    if isinstance(value, datetime):
+        return 8
+    if isinstance(value, Timestamp):
+        return 9
+    if isinstance(value, (Regex, re.Pattern)):
+        return 10
+    raise ValueError(f"unsupported sort value: {value!r}")
+
+
+def bson_sort_rank(value):
+    r"""
+    Returns a value that orders like the specified value does in a MongoDB sort: by the value's BSON type group
+    (see `BSON_TYPE_GROUPS`; `null` or missing < numbers < strings < objects < arrays < ... < `ObjectId`s < booleans
+    < dates), and then by the value itself. Values of different types always compare by type, so ranks of
+    mixed-type values can be compared safely.
+
+    Note: MongoDB sorts an array by its smallest (ascending) or largest (descending) element. Arrays are ranked here
+          element-wise instead, which is good enough for merging results that MongoDB has already sorted.
+
+    >>> sorted([3, None, "a", 1.5, {"x": 1}], key=bson_sort_rank)
+    [None, 1.5, 3, 'a', {'x': 1}]
+    """
+    try:
+        type_group = bson_type_group(value)
+    except ValueError:
+        return (len(BSON_TYPE_GROUPS), str(value))
+    if value is None:
+        return (type_group,)
+    if isinstance(value, dict):
+        return (type_group, [(k, bson_sort_rank(v)) for k, v in value.items()])
+    if isinstance(value, list):
+        return (type_group, [bson_sort_rank(v) for v in value])
+    if isinstance(value, Decimal128):
+        return (type_group, value.to_decimal())
+    if isinstance(value, re.Pattern):
+        return (type_group, value.pattern)
+    if isinstance(value, Regex):
+        return (type_group, value.pattern)
+    return (type_group, value)
+
+
+class SortKey:
+    r"""
+    A key that orders documents the way a MongoDB sort (a list of `(field, direction)` pairs) does, for merging
+    documents sorted by MongoDB (e.g. via `heapq.merge`).
+    """
+
+    __slots__ = ("ranks", "directions")
+
+    def __init__(self, doc: dict, sort: List[Tuple[str, int]]):
+        self.ranks = [bson_sort_rank(get_in(f.split("."), doc)) for f, _ in sort]
+        self.directions = [d for _, d in sort]
+
+    def __lt__(self, other: "SortKey"):
+        for a, b, direction in zip(self.ranks, other.ranks, self.directions):
+            if a != b:
+                return a < b if direction == 1 else b < a
+        return False
+
+
+# Maximum number of collections a spanning query queries at the same time.
+SPANNING_QUERY_MAX_WORKERS = 8
+
+_spanning_query_executor = ThreadPoolExecutor(
+    max_workers=SPANNING_QUERY_MAX_WORKERS, thread_name_prefix="find_spanning"
+)
+
+
 def find_resources_spanning(
     req: FindRequest, mdb: MongoDatabase, collection_names: Set[str]
 ):
@@ -382,43 +641,113 @@ def find_resources_spanning(
 
     This is useful for collections that house documents that are subclasses of a common ancestor class.
 
+    The collections are queried concurrently, each for the documents that could be on the requested page in the
+    requested sort order (made total by sorting by `id` last), and the results are merged. So, pages (and cursors)
+    span all the collections. Since `id`s are unique across collections, a cursor encodes only the sort values
+    of the last document it returned. With no filter, counts come from (cached) estimates.
+
     "resources" is used generically here, as in "Web resources", e.g. Uniform Resource Identifiers (URIs).
     """
-    if req.cursor or not req.page:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This resource only supports page-based pagination",
+    raise_if_unsupported(req)
+
+    filter_ = get_mongo_filter(req.filter)
+    sort_ = get_total_sort(get_mongo_sort(req.sort))
+    count_mode = "estimated" if not filter_ and req.count == "exact" else req.count
+    collection_names = sorted(collection_names)
+
+    # The sort fields are needed to merge results, even if they were not requested.
+    projection = (
+        list(set(comma_separated_values(req.fields)) | {"id"}) if req.fields else None
+    )
+    sort_fields = [a for a, _ in sort_]
+    unrequested_fields = (
+        {a.split(".")[0] for a in sort_fields} - {p.split(".")[0] for p in projection}
+        if projection
+        else set()
+    )
+
+    total_count = None
+    if req.page:
+        skip = (req.page - 1) * req.per_page
+        if skip > 10_000:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use cursor-based pagination for paging beyond 10,000 items",
+            )
+        # Any of the collections could contribute all the documents up to the end of the requested page.
+        limit, page_filter = skip + req.per_page, filter_
+    else:
+        # The cursor is bound to the collections, filter, and sort it was issued for.
+        query_hash = hash_from_str(json_util.dumps([collection_names, filter_, sort_]))
+        skip, limit, page_filter = 0, req.per_page + 1, filter_
+        if req.cursor != "*":
+            try:
+                token = decode_page_token(req.cursor)
+            except ValueError:
+                token = None
+            if token is None or token.get("q") != query_hash:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Bad cursor value"
+                )
+            total_count = token.get("n")
+            keyset_filter = get_keyset_filter(sort_, token["k"])
+            page_filter = (
+                {"$and": [filter_, keyset_filter]} if filter_ else keyset_filter
+            )
+    count_wanted = req.page or req.cursor == "*"
+
+    def query(collection_name: str):
+        count = (
+            count_resources(mdb, collection_name, filter_, count_mode)
+            if count_wanted
+            else None
         )
+        results, db_response_time_ms = timeit(
+            mdb[collection_name].find(
+                filter=page_filter,
+                limit=limit,
+                sort=sort_,
+                projection=(
+                    list(set(projection) | set(sort_fields)) if projection else None
+                ),
+            )
+        )
+        return count, results, db_response_time_ms
 
-    if len(collection_names) == 0:
-        return {
-            "meta": {
-                "mongo_filter_dict": get_mongo_filter(req.filter),
-                "count": 0,
-                "db_response_time_ms": 0,
-                "page": req.page,
-                "per_page": req.per_page,
-            },
-            "results": [],
-            "group_by": [],
-        }
+    responses = list(_spanning_query_executor.map(query, collection_names))
+    if count_wanted and count_mode != "none":
+        total_count = sum(count for count, _, _ in responses)
+    merged = heapq.merge(
+        *(results for _, results, _ in responses), key=lambda d: SortKey(d, sort_)
+    )
+    results = list(islice(merged, skip, limit))
+
+    next_cursor = None
+    if not req.page and len(results) > req.per_page:
+        results = results[: req.per_page]
+        last_values = [get_in(a.split("."), results[-1]) for a in sort_fields]
+        next_cursor = encode_page_token(
+            {"q": query_hash, "k": last_values, "n": total_count}
+        )
+    if unrequested_fields:
+        results = [dissoc(d, *unrequested_fields) for d in results]
 
-    responses = {name: find_resources(req, mdb, name) for name in collection_names}
     rv = {
         "meta": {
-            "mongo_filter_dict": next(
-                r["meta"]["mongo_filter_dict"] for r in responses.values()
-            ),
-            "count": sum(r["meta"]["count"] for r in responses.values()),
-            "db_response_time_ms": sum(
-                r["meta"]["db_response_time_ms"] for r in responses.values()
-            ),
+            "mongo_filter_dict": filter_,
+            "mongo_sort_list": [[a, s] for a, s in sort_],
+            "count": total_count,
+            "db_response_time_ms": max((ms for _, _, ms in responses), default=0),
             "page": req.page,
             "per_page": req.per_page,
         },
-        "results": list(concat(r["results"] for r in responses.values())),
+        "results": [strip_oid(d) for d in results],
         "group_by": [],
     }
+    if not req.page:
+        rv["meta"]["next_cursor"] = next_cursor
+    if req.fields:
+        rv["meta"]["fields"] = req.fields
     return rv
 
 
@@ -739,10 +1068,28 @@ def _get_dagster_run_status(run_id: str):
         return {"type": "error", "detail": str(exc)}
 
 
+# How long (in seconds) to reuse a decision that a user is permitted to perform an action. Permissions are revoked
+# directly in the `_runtime.api.allow` and `_runtime.api.deny` collections, so a revocation takes effect within
+# this time.
+PERMISSION_CACHE_TTL_S = 5
+
+# Maps (username, action) to `True` for recently-permitted actions.
+_permitted_actions = TTLCache(maxsize=10_000, ttl=PERMISSION_CACHE_TTL_S)
+
+
 def check_action_permitted(username: str, action: str):
-    """Returns True if a Mongo database action is "allowed" and "not denied"."""
+    """Returns True if a Mongo database action is "allowed" and "not denied".
+
+    Only positive decisions are cached (see `PERMISSION_CACHE_TTL_S`), so granting a permission takes effect
+    immediately, while revoking one takes effect within `PERMISSION_CACHE_TTL_S` seconds.
+    """
+    if _permitted_actions.get((username, action)):
+        return True
     db: MongoDatabase = get_mongo_db()
     filter_ = {"username": username, "action": action}
     denied = db["_runtime.api.deny"].find_one(filter_) is not None
     allowed = db["_runtime.api.allow"].find_one(filter_) is not None
-    return (not denied) and allowed
+    permitted = (not denied) and allowed
+    if permitted:
+        _permitted_actions.set((username, action), True)
+    return permitted
@@ -66,7 +66,7 @@ async def post_activity(
 
 
 @router.post("/workflows/workflow_executions")
-async def post_workflow_execution(
+def post_workflow_execution(
     workflow_execution_set: dict[str, Any],
     site: Site = Depends(get_current_client_site),
     mdb: MongoDatabase = Depends(get_mongo_db),
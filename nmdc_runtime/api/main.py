@@ -29,6 +29,7 @@ from nmdc_runtime.api.core.auth import (
     ORCID_NMDC_CLIENT_ID,
     ORCID_BASE_URL,
 )
+from nmdc_runtime.api.core.idgen import release_reserved_ids
 from nmdc_runtime.api.db.mongo import (
     get_mongo_db,
 )
@@ -54,6 +55,7 @@ from nmdc_runtime.api.models.user import UserInDB
 from nmdc_runtime.api.models.util import entity_attributes_to_index
 from nmdc_runtime.api.v1.router import router_v1
 from nmdc_runtime.minter.bootstrap import bootstrap as minter_bootstrap
+from nmdc_runtime.minter.config import typecode_table
 from nmdc_runtime.minter.entrypoints.fastapi_app import router as minter_router
 
 api_router = APIRouter()
@@ -314,8 +316,13 @@ def ensure_initial_resources_on_boot():
         [("checksums.type", 1), ("checksums.checksum", 1)], unique=True
     )
 
+    # Consumers of the transaction log (e.g. the incremental materialization of `alldocs`) read it by timestamp.
+    mdb.txn_log.create_index("ts")
+
     # Minting resources
     minter_bootstrap()
+    # Minting relies on this index to detect id names that are already taken.
+    mdb["minter.id_records"].create_index("id", unique=True)
 
 
 def ensure_attribute_indexes():
@@ -359,7 +366,7 @@ def ensure_default_api_perms():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     r"""
-    Prepares the application to receive requests.
+    Prepares the application to receive requests, and cleans up after it once it shuts down.
 
     From the [FastAPI documentation](https://fastapi.tiangolo.com/advanced/events/#lifespan-function):
     > You can define logic (code) that should be executed before the application starts up. This means that
@@ -374,9 +381,13 @@ async def lifespan(app: FastAPI):
 
     # Invoke a function—thereby priming its memoization cache—in order to speed up all future invocations.
     get_allowed_references()  # we ignore the return value here
+    typecode_table()  # we ignore the return value here
 
     yield
 
+    # Release the system ids this process reserved but did not hand out.
+    release_reserved_ids(get_mongo_db())
+
 
 @api_router.get("/")
 async def root():
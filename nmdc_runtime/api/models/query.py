@@ -170,6 +170,13 @@ class GetMoreCommandResponse(CommandResponse):
     cursor: GetMoreCommandResponseCursor
 
 
+class QueryNextRequest(BaseModel):
+    r"""Request for the next batch of results from a cursor opened by a `find` or `aggregate` query."""
+
+    cursor_id: int
+    batchSize: Optional[PositiveInt] = None
+
+
 QueryCmd = Union[
     CollStatsCommand,
     CountCommand,
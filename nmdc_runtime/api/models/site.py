@@ -9,6 +9,9 @@ from nmdc_runtime.api.core.auth import (
     verify_password,
     TokenData,
     optional_oauth2_scheme,
+    is_token_invalidated,
+    get_cached_principal,
+    cache_principal,
 )
 from nmdc_runtime.api.db.mongo import get_mongo_db
 from nmdc_runtime.api.models.user import (
@@ -51,12 +54,16 @@ def authenticate_site_client(mdb, client_id: str, client_secret: str):
     return site
 
 
-async def get_current_client_site(
+def get_current_client_site(
     token: str = Depends(oauth2_scheme),
     mdb: pymongo.database.Database = Depends(get_mongo_db),
 ):
-    if mdb.invalidated_tokens.find_one({"_id": token}):
+    # Note: This is a regular (rather than `async`) function so that FastAPI runs it, and the blocking database
+    #       lookups in it, in its thread pool instead of on the event loop.
+    if is_token_invalidated(mdb, token):
         raise credentials_exception
+    if (site := get_cached_principal("site", token)) is not None:
+        return site
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         subject: str = payload.get("sub")
@@ -71,13 +78,14 @@ async def get_current_client_site(
     site = get_site(mdb, client_id=token_data.subject)
     if site is None:
         raise credentials_exception
+    cache_principal("site", token, site, payload.get("exp"))
     return site
 
 
-async def maybe_get_current_client_site(
+def maybe_get_current_client_site(
     token: str = Depends(optional_oauth2_scheme),
     mdb: pymongo.database.Database = Depends(get_mongo_db),
 ):
     if token is None:
         return None
-    return await get_current_client_site(token, mdb)
+    return get_current_client_site(token, mdb)
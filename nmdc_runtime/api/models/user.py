@@ -13,6 +13,9 @@ from nmdc_runtime.api.core.auth import (
     credentials_exception,
     TokenData,
     bearer_scheme,
+    is_token_invalidated,
+    get_cached_principal,
+    cache_principal,
 )
 
 from nmdc_runtime.api.models.site import get_site
@@ -51,13 +54,17 @@ def authenticate_user(mdb, username: str, password: str):
     return user
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     bearer_credentials: str = Depends(bearer_scheme),
     mdb: pymongo.database.Database = Depends(get_mongo_db),
 ) -> UserInDB:
-    if mdb.invalidated_tokens.find_one({"_id": token}):
+    # Note: This is a regular (rather than `async`) function so that FastAPI runs it, and the blocking database
+    #       lookups in it, in its thread pool instead of on the event loop.
+    if is_token_invalidated(mdb, token):
         raise credentials_exception
+    if (user := get_cached_principal("user", token)) is not None:
+        return user
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         subject: str = payload.get("sub")
@@ -84,6 +91,7 @@ async def get_current_user(
         raise credentials_exception
     if user is None:
         raise credentials_exception
+    cache_principal("user", token, user, payload.get("exp"))
     return user
 
 
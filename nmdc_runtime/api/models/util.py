@@ -1,4 +1,4 @@
-from typing import TypeVar, List, Optional, Generic, Annotated
+from typing import TypeVar, List, Optional, Generic, Annotated, Literal
 
 from pydantic import model_validator, Field, BaseModel
 from typing_extensions import Annotated
@@ -47,11 +47,7 @@ class ListRequest(BaseModel):
         default=None,
         title="Next page token",
         description="""A bookmark you can use to fetch the _next_ page of resources. You can get this from the
-                    `next_page_token` field in a previous response from this endpoint.\n\n_Example_: 
-                    `nmdc:sys0zr0fbt71`""",
-        examples=[
-            "nmdc:sys0zr0fbt71",
-        ],
+                    `next_page_token` field in a previous response from this endpoint.""",
     )
     # TODO: Document the endpoint's behavior when a projection includes a _nested_ field identifier (i.e. `foo.bar`),
     #       and ensure the endpoint doesn't break when the projection includes field descriptors that contain commas.
@@ -141,12 +137,20 @@ class FindRequest(BaseModel):
         description="""A bookmark you can use to fetch the _next_ page of resources, when using cursor-based pagination.
                     To use cursor-based pagination, set the `cursor` parameter to `*`. The response's `meta` object will
                     include a `next_cursor` field, whose value can be used as the `cursor` parameter in a subsequent
-                    request.\n\n_Example_: `nmdc:sys0zr0fbt71`""",
+                    request.""",
         examples=[
             "*",
-            "nmdc:sys0zr0fbt71",
         ],
     )
+    count: Literal["exact", "estimated", "none"] = Field(
+        default="exact",
+        title="Count",
+        description="""How you want the total number of matching resources (`meta.count`) to be computed: `exact`,
+                    `estimated` (fast, and equal to the number of resources in the collection when there is no
+                    `filter`; otherwise, computed exactly), or `none` (not computed). When using cursor-based
+                    pagination, the count is computed for the first page and carried along by the cursor.""",
+        examples=["exact", "estimated", "none"],
+    )
     group_by: Optional[str] = Field(
         default=None,
         title="Group by",
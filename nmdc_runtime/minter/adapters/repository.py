@@ -4,11 +4,13 @@ from typing import Union
 
 from fastapi import HTTPException
 from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 from toolz import merge, dissoc
 from pymongo.database import Database as MongoDatabase
 
 
 from nmdc_runtime.minter.domain.model import (
+    Entity,
     Identifier,
     Status,
     MintingRequest,
@@ -16,7 +18,12 @@ from nmdc_runtime.minter.domain.model import (
     ResolutionRequest,
     DeleteRequest,
 )
-from nmdc_runtime.api.core.idgen import generate_id
+from nmdc_runtime.api.core.idgen import (
+    DUPLICATE_KEY_ERROR_CODE,
+    generate_id,
+    generate_ids_batch,
+)
+from nmdc_runtime.api.core.util import TTLCache
 from nmdc_runtime.util import find_one
 
 
@@ -132,63 +139,131 @@ class InMemoryIDStore(IDStore):
                 raise MinterError("Status not 'draft'. Can't delete.")
 
 
+# How long (in seconds) to reuse a snapshot of a database's minter registry before re-reading it.
+MINTER_REGISTRY_TTL_S = 60
+
+# Maps a database name to a snapshot of the services, requesters, schema classes, typecodes, and shoulders
+# registered in that database (see `MongoIDStore.registry`).
+_minter_registries = TTLCache(maxsize=100, ttl=MINTER_REGISTRY_TTL_S)
+
+# How long (in seconds) to remember that a requester or service was missing even from a freshly-read registry,
+# so that minting requests naming unknown (e.g. bogus) requesters don't each force the registry to be re-read.
+MINTER_UNKNOWN_KEY_TTL_S = 5
+
+# Maps a (database name, requester id, service id) triple to `True` while the registry is known to lack them.
+_unknown_minter_keys = TTLCache(maxsize=1000, ttl=MINTER_UNKNOWN_KEY_TTL_S)
+
+
+def forget_minter_registries():
+    r"""Discards all cached minter registry snapshots, e.g. after requesters (sites) are added."""
+    _minter_registries.clear()
+    _unknown_minter_keys.clear()
+
+
 class MongoIDStore(abc.ABC):
     def __init__(self, mdb: MongoDatabase):
         self.db = mdb
 
+    def registry(self, refresh: bool = False) -> dict:
+        r"""
+        Returns a snapshot of the minter's registry, i.e. the ids of its services, requesters, and schema classes,
+        plus its typecodes (keyed by schema class) and shoulders (keyed by the service they are assigned to).
+
+        The snapshot is reused for `MINTER_REGISTRY_TTL_S` seconds unless `refresh` is true.
+        """
+        snapshot = None if refresh else _minter_registries.get(self.db.name)
+        if snapshot is None:
+            find_all = lambda name: self.db["minter." + name].find({}, {"_id": 0})
+            snapshot = {
+                "services": {d["id"] for d in find_all("services")},
+                "requesters": {d["id"] for d in find_all("requesters")},
+                "schema_classes": {d["id"] for d in find_all("schema_classes")},
+                "typecodes": {d["schema_class"]: d for d in find_all("typecodes")},
+                "shoulders": {d["assigned_to"]: d for d in find_all("shoulders")},
+            }
+            _minter_registries.set(self.db.name, snapshot)
+        return snapshot
+
     def mint(self, req_mint: MintingRequest) -> list[Identifier]:
-        if not self.db["minter.services"].find_one({"id": req_mint.service.id}):
+        draft, id_names = self._mint_drafts(req_mint)
+        return [draft.model_copy(update={"id": n, "name": n}) for n in id_names]
+
+    def mint_id_names(self, req_mint: MintingRequest) -> list[str]:
+        r"""Mints identifiers like `mint` does, but returns only their names (which is faster for large requests)."""
+        return self._mint_drafts(req_mint)[1]
+
+    def _mint_drafts(self, req_mint: MintingRequest) -> tuple[Identifier, list[str]]:
+        r"""
+        Mints draft identifiers, returning a template `Identifier` (whose `id` and `name` are just the prefix shared
+        by the minted names) and the minted names.
+        """
+        registry = self.registry()
+        if (
+            req_mint.requester.id not in registry["requesters"]
+            or req_mint.service.id not in registry["shoulders"]
+        ):
+            # The requester (or the service's shoulder) may have been registered since the snapshot was taken.
+            # Re-read the registry at most once per `MINTER_UNKNOWN_KEY_TTL_S` seconds for the same keys.
+            unknown_key = (self.db.name, req_mint.requester.id, req_mint.service.id)
+            if not _unknown_minter_keys.get(unknown_key):
+                registry = self.registry(refresh=True)
+                if (
+                    req_mint.requester.id not in registry["requesters"]
+                    or req_mint.service.id not in registry["shoulders"]
+                ):
+                    _unknown_minter_keys.set(unknown_key, True)
+        if req_mint.service.id not in registry["services"]:
             raise MinterError(f"Unknown service {req_mint.service.id}")
-        if not self.db["minter.requesters"].find_one({"id": req_mint.requester.id}):
+        if req_mint.requester.id not in registry["requesters"]:
             raise MinterError(f"Unknown requester {req_mint.requester.id}")
-        if not self.db["minter.schema_classes"].find_one(
-            {"id": req_mint.schema_class.id}
-        ):
+        if req_mint.schema_class.id not in registry["schema_classes"]:
             raise MinterError(f"Unknown schema class {req_mint.schema_class.id}")
-        typecode = self.db["minter.typecodes"].find_one(
-            {"schema_class": req_mint.schema_class.id}
-        )
+        typecode = registry["typecodes"].get(req_mint.schema_class.id)
         if not typecode:
             raise MinterError(
                 detail=f"Cannot map schema class {req_mint.schema_class.id} to a typecode"
             )
-        shoulder = self.db["minter.shoulders"].find_one(
-            {"assigned_to": req_mint.service.id}
+        shoulder = registry["shoulders"].get(req_mint.service.id)
+        if not shoulder:
+            raise MinterError(f"No shoulder assigned to service {req_mint.service.id}")
+
+        prefix = f"nmdc:{typecode['name']}-{shoulder['name']}-"
+        # Minted identifiers differ from this (validated) draft only in their `id` and `name`.
+        draft = Identifier(
+            id=prefix,
+            name=prefix,
+            typecode=Entity(id=typecode["id"]),
+            shoulder=Entity(id=shoulder["id"]),
+            status=Status.draft,
         )
+        draft_doc = draft.model_dump(mode="json")
         collected = []
-        while True:
+        while len(collected) < req_mint.how_many:
             id_names = set()
             n_to_generate = req_mint.how_many - len(collected)
             while len(id_names) < n_to_generate:
-                blade = generate_id(length=8, split_every=0, checksum=True)
-                id_name = f"nmdc:{typecode['name']}-{shoulder['name']}-{blade}"
-                id_names.add(id_name)
-            id_names = list(id_names)
-            taken = {
-                d["id"]
-                for d in self.db["minter.id_records"].find(
-                    {"id": {"$in": id_names}}, {"id": 1}
+                id_names.update(
+                    prefix + blade
+                    for blade in generate_ids_batch(n_to_generate - len(id_names))
                 )
-            }
-            not_taken = [n for n in id_names if n not in taken]
-            if not_taken:
-                ids = [
-                    Identifier(
-                        **{
-                            "id": id_name,
-                            "name": id_name,
-                            "typecode": typecode,
-                            "shoulder": shoulder,
-                            "status": Status.draft,
-                        }
-                    )
-                    for id_name in not_taken
-                ]
-                self.db["minter.id_records"].insert_many([i.model_dump() for i in ids])
-                collected.extend(ids)
-            if len(collected) == req_mint.how_many:
-                break
-        return collected
+            docs = [
+                {**draft_doc, "id": id_name, "name": id_name} for id_name in id_names
+            ]
+            # Let the unique `id` index (created at API startup) detect names that are already taken, rather than
+            # checking beforehand.
+            try:
+                self.db["minter.id_records"].insert_many(docs, ordered=False)
+                inserted = docs
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                if e.details.get("writeConcernErrors") or any(
+                    err["code"] != DUPLICATE_KEY_ERROR_CODE for err in write_errors
+                ):
+                    raise
+                taken = {err["index"] for err in write_errors}
+                inserted = [d for i, d in enumerate(docs) if i not in taken]
+            collected.extend(d["id"] for d in inserted)
+        return draft, collected
 
     def bind(self, req_bind: BindingRequest) -> Identifier:
         id_stored = self.resolve(req_bind)
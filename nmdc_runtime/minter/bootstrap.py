@@ -1,4 +1,7 @@
-from nmdc_runtime.minter.adapters.repository import MongoIDStore
+from nmdc_runtime.minter.adapters.repository import (
+    MongoIDStore,
+    forget_minter_registries,
+)
 from nmdc_runtime.minter import config
 
 
@@ -25,3 +28,4 @@ def refresh_minter_requesters_from_sites():
     site_ids = [d["id"] for d in mdb.sites.find({}, {"id": 1})]
     for sid in site_ids:
         s.db["minter.requesters"].replace_one({"id": sid}, {"id": sid}, upsert=True)
+    forget_minter_registries()
@@ -1,11 +1,13 @@
 import os
+import re
 from functools import lru_cache
-from typing import List
+from typing import List, Optional
 
+from frozendict import frozendict
 from nmdc_schema.id_helpers import get_typecode_for_future_ids
 
-from nmdc_runtime.util import get_nmdc_jsonschema_dict
-from nmdc_runtime.api.db.mongo import get_mongo_db
+from nmdc_runtime.util import get_nmdc_jsonschema_dict, collection_name_to_class_names
+from nmdc_runtime.api.db.mongo import get_mongo_db, get_collection_names_from_schema
 
 
 @lru_cache()
@@ -54,6 +56,66 @@ def typecodes() -> List[dict]:
     return rv
 
 
+@lru_cache()
+def typecode_table() -> frozendict:
+    r"""
+    Returns a frozen mapping from each typecode to (a) the name of the schema class the minter would use that
+    typecode for, and (b) the names of the collections that can contain instances of that schema class.
+
+    This is derived from the schema once per process, so that resolving an `id` to its candidate collections
+    is a dictionary lookup.
+
+    >>> typecode_table()["sty"]["schema_class"]
+    'Study'
+    >>> typecode_table()["sty"]["collection_names"]
+    ('study_set',)
+    """
+    known_collection_names = set(get_collection_names_from_schema())
+    table = {}
+    for typecode in typecodes():
+        if typecode["name"] in table:
+            continue  # consistent with a first-match scan of `typecodes()`
+        schema_class_name = typecode["schema_class"].replace("nmdc:", "", 1)
+        table[typecode["name"]] = frozendict(
+            schema_class=schema_class_name,
+            collection_names=tuple(
+                sorted(
+                    collection_name
+                    for collection_name, class_names in collection_name_to_class_names.items()
+                    if schema_class_name in class_names
+                    and collection_name in known_collection_names
+                )
+            ),
+        )
+    return frozendict(table)
+
+
+def get_typecode_for_id(doc_id: str) -> Optional[str]:
+    r"""
+    Returns the typecode portion, if any, of the specified `id`.
+
+    >>> get_typecode_for_id("nmdc:bsm-11-abc123")
+    'bsm'
+    >>> get_typecode_for_id("gold:Gb0123456") is None
+    True
+    """
+    match = re.match(r"^nmdc:(\w+)-", doc_id)
+    return match.group(1) if match else None
+
+
+def get_schema_class_name_for_id(doc_id: str) -> Optional[str]:
+    r"""
+    Returns the name of the schema class of which an instance could have the specified `id`, if any.
+
+    >>> get_schema_class_name_for_id("nmdc:sty-11-r2h77870")
+    'Study'
+    >>> get_schema_class_name_for_id("nmdc:not_a_typecode-11-r2h77870") is None
+    True
+    """
+    entry = typecode_table().get(get_typecode_for_id(doc_id))
+    return entry["schema_class"] if entry else None
+
+
 @lru_cache()
 def shoulders():
     return [
@@ -36,14 +36,13 @@ def mint_ids(
     s = MongoIDStore(mdb)
     requester = Entity(id=site.id)
     try:
-        minted = s.mint(
+        return s.mint_id_names(
             MintingRequest(
                 service=service,
                 requester=requester,
                 **req_mint.model_dump(),
             )
         )
-        return [d.id for d in minted]
     except MinterError as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
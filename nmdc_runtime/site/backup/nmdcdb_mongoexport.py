@@ -15,31 +15,26 @@ from pymongo.database import Database as MongoDatabase
 from toolz import assoc
 
 from nmdc_runtime.api.core.util import pick
-from nmdc_runtime.api.db.mongo import get_mongo_db
+from nmdc_runtime.api.db.mongo import gather_collection_stats, get_mongo_db
 from nmdc_runtime.site.repository import run_config_frozen__normal_env
 from nmdc_runtime.site.resources import get_mongo
 from nmdc_runtime.util import nmdc_jsonschema, schema_collection_names_with_id_field
 
 
 def collection_stats(mdb: MongoDatabase):
-    """Stats for each collection, with a scale factor of 1024, so sizes are in KB."""
-    names = [
-        n
-        for n in mdb.list_collection_names()
-        if n.endswith("_set") and mdb[n].estimated_document_count() > 0
-    ]
+    """Stats for each non-empty collection, with a scale factor of 1024, so sizes are in KB."""
+    names = [n for n in mdb.list_collection_names() if n.endswith("_set")]
     out = []
-    for n in names:
-        stats = pick(
-            [
-                "size",
-                "count",
-                "avgObjSize",
-                "scaleFactor",
-            ],
-            mdb.command({"collStats": n, "scale": 1024}),
-        )
-        out.append(assoc(stats, "collection", n))
+    for stats in gather_collection_stats(mdb, names, scale=1024):
+        stats, collection = stats["storageStats"], stats["ns"].split(".", 1)[1]
+        if stats["count"] > 0:
+            out.append(
+                assoc(
+                    pick(["size", "count", "avgObjSize", "scaleFactor"], stats),
+                    "collection",
+                    collection,
+                )
+            )
     return out
 
 
@@ -11,7 +11,8 @@ import sys
 import subprocess
 from tempfile import TemporaryDirectory
 
-from nmdc_runtime.util import nmdc_jsonschema
+from nmdc_runtime.api.db.mongo import get_mongo_db, refresh_id_routes
+from nmdc_runtime.util import nmdc_jsonschema, schema_collection_names_with_id_field
 
 
 def main():
@@ -48,6 +49,11 @@ def main():
                 check=True,
             )
 
+    # `mongoimport` does not maintain the id-routing collection, so refresh the routes into the imported collections.
+    refresh_id_routes(
+        get_mongo_db(), set(schema_db) & schema_collection_names_with_id_field()
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -1,23 +1,13 @@
 from io import BytesIO, StringIO
-from nmdc_runtime.minter.config import typecodes
+from nmdc_runtime.minter.config import get_schema_class_name_for_id
 from lxml import etree
 
 import csv
 import requests
 
 
-def _build_class_map(class_map_data):
-    return {
-        entry["name"]: entry["schema_class"].split(":")[1] for entry in class_map_data
-    }
-
-
 def get_classname_from_typecode(doc_id):
-    class_map_data = typecodes()
-    class_map = _build_class_map(class_map_data)
-
-    typecode = doc_id.split(":")[1].split("-")[0]
-    return class_map.get(typecode)
+    return get_schema_class_name_for_id(doc_id)
 
 
 def get_instruments(instrument_set_collection):
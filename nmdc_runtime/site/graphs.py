@@ -50,6 +50,8 @@ from nmdc_runtime.site.ops import (
     get_df_from_url,
     site_code_mapping,
     materialize_alldocs,
+    materialize_alldocs_incrementally,
+    materialize_id_routes,
     get_ncbi_export_pipeline_study,
     get_data_objects_from_biosamples,
     get_nucleotide_sequencing_from_biosamples,
@@ -108,6 +110,12 @@ def housekeeping():
 @graph
 def ensure_alldocs():
     materialize_alldocs()
+    materialize_id_routes()
+
+
+@graph
+def ensure_alldocs_incrementally():
+    materialize_alldocs_incrementally()
 
 
 @graph
@@ -4,8 +4,11 @@ import mimetypes
 import os
 import subprocess
 import tempfile
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import lru_cache
 from io import BytesIO, StringIO
 from toolz.dicttoolz import keyfilter
 from typing import Tuple
@@ -40,14 +43,15 @@ from dagster import (
 from gridfs import GridFS
 from linkml_runtime.dumpers import json_dumper
 from linkml_runtime.utils.yamlutils import YAMLRoot
-from nmdc_runtime.api.db.mongo import get_mongo_db
-from nmdc_runtime.api.core.idgen import generate_one_id
-from nmdc_runtime.api.core.metadata import (
-    _validate_changesheet,
-    df_from_sheet_in,
-    get_collection_for_id,
-    map_id_to_collection,
+from nmdc_runtime.api.db.mongo import (
+    get_mongo_db,
+    get_txn_log_checkpoint,
+    refresh_id_routes,
+    set_txn_log_checkpoint,
+    TXN_LOG_OVERLAP,
 )
+from nmdc_runtime.api.core.idgen import generate_one_id
+from nmdc_runtime.api.core.metadata import _validate_changesheet, df_from_sheet_in
 from nmdc_runtime.api.core.util import dotted_path_for, hash_from_str, json_clean, now
 from nmdc_runtime.api.endpoints.util import persist_content_and_get_drs_object
 from nmdc_runtime.api.endpoints.find import find_study_by_id
@@ -108,14 +112,15 @@ from nmdc_runtime.util import (
     class_hierarchy_as_list,
     nmdc_schema_view,
     populated_schema_collection_names_with_id_field,
+    schema_collection_names_with_id_field,
 )
 from nmdc_schema import nmdc
 from nmdc_schema.nmdc import Database as NMDCDatabase
 from pydantic import BaseModel
-from pymongo import InsertOne
+from pymongo import DeleteOne, IndexModel, ReplaceOne
 from pymongo.database import Database as MongoDatabase
 from starlette import status
-from toolz import assoc, dissoc, get_in, valfilter, identity
+from toolz import assoc, dissoc, get_in, valfilter, identity, merge, partition_all
 
 
 @op
@@ -448,11 +453,9 @@ def perform_changesheet_updates(context, sheet_in: ChangesheetIn):
     update_cmd = validation_result["update_cmd"]
     results_of_updates = validation_result["results_of_updates"]
 
-    id_dict = map_id_to_collection(mdb)
     docs_to_upsert = defaultdict(list)
     for r in results_of_updates:
-        collection_name = get_collection_for_id(r["id"], id_dict)
-        docs_to_upsert[collection_name].append(r["doc_after"])
+        docs_to_upsert[update_cmd[r["id"]]["update"]].append(r["doc_after"])
     context.resources.mongo.add_docs(docs_to_upsert)
     op = Operation(**mdb.operations.find_one({"id": op_id}))
     op.done = True
@@ -852,26 +855,13 @@ def get_neon_pipeline_surface_water_data_product(context: OpExecutionContext) ->
 def neon_data_by_product(
     context: OpExecutionContext, data_product: dict
 ) -> Dict[str, pd.DataFrame]:
-    df_dict = {}
     client: NeonApiClient = context.resources.neon_api_client
 
     product_id = data_product["product_id"]
     product_tables = data_product["product_tables"]
 
     product_table_list = [t.strip() for t in product_tables.split(",")]
-    product = client.fetch_product_by_id(product_id)
-    for table_name in product_table_list:
-        df = pd.DataFrame()
-        for site in product["data"]["siteCodes"]:
-            for data_url in site["availableDataUrls"]:
-                data_files = client.request(data_url)
-                for file in data_files["data"]["files"]:
-                    if table_name in file["name"] and "expanded" in file["name"]:
-                        current_df = pd.read_csv(file["url"])
-                        df = pd.concat([df, current_df], ignore_index=True)
-        df_dict[table_name] = df
-
-    return df_dict
+    return client.fetch_product_tables(product_id, product_table_list)
 
 
 @op(required_resource_keys={"runtime_api_site_client"})
@@ -1044,23 +1034,21 @@ def site_code_mapping() -> dict:
         )
 
 
-@op(required_resource_keys={"mongo"})
-def materialize_alldocs(context) -> int:
-    """
-    This function re-creates the alldocs collection to reflect the current state of the Mongo database.
-    See nmdc-runtime/docs/nb/bulk_validation_referential_integrity_check.ipynb for more details.
-    """
-    mdb = context.resources.mongo.db
-    schema_view = nmdc_schema_view()
+# Name of the `alldocs` materialization's checkpoint in the transaction log (see `log_txns`).
+ALLDOCS_TXN_LOG_CONSUMER = "alldocs"
 
-    # batch size for writing documents to alldocs
-    BULK_WRITE_BATCH_SIZE = 2000
+# Batch size for writing documents to `alldocs`.
+ALLDOCS_BULK_WRITE_BATCH_SIZE = 2000
 
-    # TODO include functional_annotation_agg  for "real-time" ref integrity checking.
-    #   For now, production use cases for materialized `alldocs` are limited to `id`-having collections.
-    collection_names = populated_schema_collection_names_with_id_field(mdb)
-    context.log.info(f"constructing `alldocs` collection using {collection_names=}")
+# Maximum number of schema collections copied into `alldocs` concurrently during a full rebuild.
+ALLDOCS_REBUILD_MAX_WORKERS = 4
 
+
+def get_document_reference_ranged_slots(schema_view) -> Dict[str, List[str]]:
+    r"""
+    Returns a dictionary that maps the name of each class whose instances are stored in a schema collection to the
+    names of that class's slots whose ranges are (or include) such classes, i.e. slots that refer to documents.
+    """
     document_class_names = set(
         chain.from_iterable(collection_name_to_class_names.values())
     )
@@ -1088,6 +1076,125 @@ def materialize_alldocs(context) -> int:
                 & document_referenceable_ranges
             ):
                 document_reference_ranged_slots[cls_name].append(slot_name)
+    return document_reference_ranged_slots
+
+
+@lru_cache
+def get_alldocs_class_specs() -> Dict[str, Tuple[frozenset, List[str]]]:
+    r"""
+    Returns a dictionary that maps the name of each class whose instances are stored in a schema collection to
+    (a) the names of the slots included in the `alldocs` representation of its instances, i.e. `id`, `type`, and
+    its document-reference-ranged slots, and (b) the names of the class and its ancestors.
+
+    These depend only on the schema, so they are computed once rather than once per document.
+    """
+    schema_view = nmdc_schema_view()
+    document_reference_ranged_slots = get_document_reference_ranged_slots(schema_view)
+    return {
+        cls_name: (
+            frozenset(["id", "type"] + document_reference_ranged_slots[cls_name]),
+            schema_view.class_ancestors(cls_name),
+        )
+        for cls_name in set(
+            chain.from_iterable(collection_name_to_class_names.values())
+        )
+    }
+
+
+@lru_cache
+def get_alldocs_projection(collection_name: str) -> Dict[str, int]:
+    r"""
+    Returns a projection of the fields (of documents in the specified collection) that are needed to derive their
+    `alldocs` representations, so that no other fields are transferred from the database.
+    """
+    class_specs = get_alldocs_class_specs()
+    fields = set(["id", "type"]).union(
+        *(
+            class_specs[cls_name][0]
+            for cls_name in collection_name_to_class_names.get(collection_name, [])
+        )
+    )
+    return merge({"_id": 0}, {field: 1 for field in sorted(fields)})
+
+
+def alldocs_doc_for(doc: dict) -> Optional[dict]:
+    r"""
+    Returns the `alldocs` representation of the specified schema document, i.e. its `id`, `type`, and
+    document-reference-ranged slots, plus the names of its class and that class's ancestors.
+
+    Returns `None` if the document has no `type`, or a `type` that is not a class of schema collection documents.
+    """
+    class_spec = get_alldocs_class_specs().get(
+        (doc.get("type") or "")[5:]  # lop off "nmdc:" prefix
+    )
+    if class_spec is None:
+        return None
+    slots_to_include, type_and_ancestors = class_spec
+    new_doc = keyfilter(lambda slot: slot in slots_to_include, doc)
+    new_doc["_type_and_ancestors"] = type_and_ancestors
+    return new_doc
+
+
+def copy_collection_to_alldocs(
+    mdb: MongoDatabase, collection_name: str, target_collection_name: str
+) -> Tuple[int, List[str], float]:
+    r"""
+    Inserts the `alldocs` representations of all documents in the specified collection into the target collection,
+    in unordered batches, and returns the number of documents inserted, the `id`s of the documents skipped for
+    having no (or an unknown) `type`, and the number of seconds that took.
+    """
+    started_at = time.monotonic()
+    n_inserted, skipped_ids = 0, []
+    cursor = mdb[collection_name].find(
+        {},
+        get_alldocs_projection(collection_name),
+        batch_size=ALLDOCS_BULK_WRITE_BATCH_SIZE,
+    )
+    for batch in partition_all(ALLDOCS_BULK_WRITE_BATCH_SIZE, cursor):
+        new_docs = []
+        for doc in batch:
+            if (new_doc := alldocs_doc_for(doc)) is not None:
+                new_docs.append(new_doc)
+            else:
+                skipped_ids.append(doc.get("id"))
+        if new_docs:
+            mdb[target_collection_name].insert_many(new_docs, ordered=False)
+        n_inserted += len(new_docs)
+    return n_inserted, skipped_ids, time.monotonic() - started_at
+
+
+@op(required_resource_keys={"mongo"})
+def materialize_alldocs(context) -> int:
+    """
+    This function re-creates the alldocs collection to reflect the current state of the Mongo database.
+    See nmdc-runtime/docs/nb/bulk_validation_referential_integrity_check.ipynb for more details.
+    """
+    return rebuild_alldocs(context)
+
+
+def rebuild_alldocs(context) -> int:
+    """
+    Re-creates the alldocs collection from scratch (see `materialize_alldocs`).
+
+    Collections are copied concurrently (up to `ALLDOCS_REBUILD_MAX_WORKERS` at a time, largest first), fetching only
+    the fields `alldocs` needs, and indexes are built in a single pass once all documents are inserted.
+
+    Transactions logged after the rebuild begins, or shortly before (see `TXN_LOG_OVERLAP`), are (re-)applied by
+    `materialize_alldocs_incrementally`.
+    """
+    mdb = context.resources.mongo.db
+    started_at = datetime.now(timezone.utc)
+
+    # TODO include functional_annotation_agg  for "real-time" ref integrity checking.
+    #   For now, production use cases for materialized `alldocs` are limited to `id`-having collections.
+    collection_names = sorted(
+        populated_schema_collection_names_with_id_field(mdb),
+        key=lambda name: mdb[name].estimated_document_count(),
+        reverse=True,
+    )
+    context.log.info(f"constructing `alldocs` collection using {collection_names=}")
+    # Derive the (cached) projections from the schema once, before fanning out to worker threads.
+    [get_alldocs_projection(coll_name) for coll_name in collection_names]
 
     # Build `alldocs` to a temporary collection for atomic replacement
     # https://www.mongodb.com/docs/v6.0/reference/method/db.collection.renameCollection/#resource-locking-in-replica-sets
@@ -1095,28 +1202,24 @@ def materialize_alldocs(context) -> int:
     temp_alldocs_collection = mdb[temp_alldocs_collection_name]
     context.log.info(f"constructing `{temp_alldocs_collection.name}` collection")
 
-    for coll_name in collection_names:
-        context.log.info(f"{coll_name=}")
-        write_operations = []
-        documents_processed_counter = 0
-        for doc in mdb[coll_name].find():
-            doc_type = doc["type"][5:]  # lop off "nmdc:" prefix
-            slots_to_include = ["id", "type"] + document_reference_ranged_slots[
-                doc_type
-            ]
-            new_doc = keyfilter(lambda slot: slot in slots_to_include, doc)
-            new_doc["_type_and_ancestors"] = schema_view.class_ancestors(doc_type)
-            write_operations.append(InsertOne(new_doc))
-            if len(write_operations) == BULK_WRITE_BATCH_SIZE:
-                _ = temp_alldocs_collection.bulk_write(write_operations, ordered=False)
-                write_operations.clear()
-                documents_processed_counter += BULK_WRITE_BATCH_SIZE
-        if len(write_operations) > 0:
-            _ = temp_alldocs_collection.bulk_write(write_operations, ordered=False)
-            documents_processed_counter += len(write_operations)
-        context.log.info(
-            f"Inserted {documents_processed_counter} documents from {coll_name=} "
-        )
+    with ThreadPoolExecutor(max_workers=ALLDOCS_REBUILD_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                copy_collection_to_alldocs, mdb, coll_name, temp_alldocs_collection_name
+            ): coll_name
+            for coll_name in collection_names
+        }
+        for future in as_completed(futures):
+            n_inserted, skipped_ids, seconds = future.result()
+            context.log.info(
+                f"Inserted {n_inserted} documents from coll_name={futures[future]!r}"
+                f" in {seconds:.1f}s ({n_inserted / max(seconds, 1e-6):.0f} docs/s)"
+            )
+            if skipped_ids:
+                context.log.warning(
+                    f"skipped {len(skipped_ids)} documents from coll_name={futures[future]!r}"
+                    f" having no or an unknown `type`: {skipped_ids[:10]}"
+                )
 
     context.log.info(
         f"produced `{temp_alldocs_collection.name}` collection with"
@@ -1124,20 +1227,102 @@ def materialize_alldocs(context) -> int:
     )
 
     context.log.info(f"creating indexes on `{temp_alldocs_collection.name}` ...")
-    # Ensure unique index on "id". Index creation here is blocking (i.e. background=False),
-    # so that `temp_alldocs_collection` will be "good to go" on renaming.
-    temp_alldocs_collection.create_index("id", unique=True)
-    # Add indexes to improve performance of `GET /data_objects/study/{study_id}`:
+    # Ensure unique index on "id", and add indexes to improve performance of `GET /data_objects/study/{study_id}`.
+    # The indexes are built in a single pass over the collection. Index creation here is blocking
+    # (i.e. background=False), so that `temp_alldocs_collection` will be "good to go" on renaming.
     slots_to_index = ["has_input", "has_output", "was_informed_by"]
-    [temp_alldocs_collection.create_index(slot) for slot in slots_to_index]
+    temp_alldocs_collection.create_indexes(
+        [IndexModel("id", unique=True)] + [IndexModel(slot) for slot in slots_to_index]
+    )
     context.log.info(f"created indexes on id, {slots_to_index}.")
 
     context.log.info(f"renaming `{temp_alldocs_collection.name}` to `alldocs`...")
     temp_alldocs_collection.rename("alldocs", dropTarget=True)
+    set_txn_log_checkpoint(mdb, ALLDOCS_TXN_LOG_CONSUMER, started_at)
 
     return mdb.alldocs.estimated_document_count()
 
 
+@op(required_resource_keys={"mongo"})
+def materialize_alldocs_incrementally(context) -> int:
+    """
+    Brings the alldocs collection up to date by applying the transactions logged (see `log_txns`) since the
+    last checkpoint, re-deriving (or removing) only the `alldocs` documents whose source documents changed.
+
+    Transactions logged within `TXN_LOG_OVERLAP` before the checkpoint are applied again, in case any of them
+    became visible only after the previous run read the log. Re-applying a transaction is harmless, since each
+    `alldocs` document is re-derived from the current state of its source document.
+
+    Falls back to a full rebuild if there is no checkpoint or no alldocs collection.
+    """
+    mdb = context.resources.mongo.db
+    checkpoint = get_txn_log_checkpoint(mdb, ALLDOCS_TXN_LOG_CONSUMER)
+    if checkpoint is None or "alldocs" not in mdb.list_collection_names():
+        context.log.info("no `alldocs` checkpoint. falling back to full rebuild.")
+        return rebuild_alldocs(context)
+
+    collection_names = schema_collection_names_with_id_field()
+    ids_by_collection_name = defaultdict(set)
+    since, latest = checkpoint - TXN_LOG_OVERLAP, checkpoint
+    for txn in mdb.txn_log.find(
+        {"ts": {"$gt": since}, "tgt.c": {"$in": list(collection_names)}},
+        {"tgt": 1, "ts": 1},
+    ).sort("ts", 1):
+        if txn["tgt"].get("id") is not None:
+            ids_by_collection_name[txn["tgt"]["c"]].add(txn["tgt"]["id"])
+        latest = max(latest, txn["ts"])
+    if not ids_by_collection_name:
+        context.log.info(f"no transactions since {since}.")
+        set_txn_log_checkpoint(mdb, ALLDOCS_TXN_LOG_CONSUMER, latest)
+        return 0
+
+    n_upserted, n_deleted = 0, 0
+    for coll_name, ids in ids_by_collection_name.items():
+        for batch in partition_all(ALLDOCS_BULK_WRITE_BATCH_SIZE, ids):
+            write_operations = []
+            ids_not_found = set(batch)
+            for doc in mdb[coll_name].find(
+                {"id": {"$in": list(batch)}}, get_alldocs_projection(coll_name)
+            ):
+                new_doc = alldocs_doc_for(doc)
+                if new_doc is None:
+                    # Like a full rebuild, leave such a document out of `alldocs`.
+                    context.log.warning(
+                        f"skipping {doc['id']} in {coll_name=}, having no or an unknown `type`."
+                    )
+                    continue
+                write_operations.append(
+                    ReplaceOne({"id": new_doc["id"]}, new_doc, upsert=True)
+                )
+                ids_not_found.discard(new_doc["id"])
+            # The source documents of the remaining `id`s no longer exist (or are skipped).
+            write_operations.extend(DeleteOne({"id": id_}) for id_ in ids_not_found)
+            mdb.alldocs.bulk_write(write_operations, ordered=False)
+            n_upserted += len(write_operations) - len(ids_not_found)
+            n_deleted += len(ids_not_found)
+        context.log.info(f"applied {len(ids)} changed ids from {coll_name=}")
+
+    set_txn_log_checkpoint(mdb, ALLDOCS_TXN_LOG_CONSUMER, latest)
+    context.log.info(
+        f"upserted {n_upserted} and deleted {n_deleted} `alldocs` documents."
+    )
+    return n_upserted + n_deleted
+
+
+@op(required_resource_keys={"mongo"})
+def materialize_id_routes(context) -> int:
+    """
+    Backfills the id-routing collection (which maps each document `id` to the name of the schema collection
+    containing that document) from all populated schema collections having an `id` field.
+
+    Routes are otherwise maintained incrementally as documents are written, and repaired on lookup.
+    """
+    mdb = context.resources.mongo.db
+    n_routes = refresh_id_routes(mdb)
+    context.log.info(f"id-routing collection has ~{n_routes} routes.")
+    return n_routes
+
+
 @op(config_schema={"nmdc_study_id": str}, required_resource_keys={"mongo"})
 def get_ncbi_export_pipeline_study(context: OpExecutionContext) -> Any:
     nmdc_study = find_study_by_id(
@@ -19,6 +19,7 @@ from starlette import status
 from toolz import merge, get_in
 
 from nmdc_runtime.api.core.util import dotted_path_for
+from nmdc_runtime.api.db.mongo import TXN_LOG_OVERLAP, get_txn_log_checkpoint
 from nmdc_runtime.api.models.job import Job
 from nmdc_runtime.api.models.operation import ObjectPutMetadata
 from nmdc_runtime.api.models.run import _add_run_fail_event
@@ -44,9 +45,11 @@ from nmdc_runtime.site.graphs import (
     ingest_neon_benthic_metadata,
     ingest_neon_surface_water_metadata,
     ensure_alldocs,
+    ensure_alldocs_incrementally,
     nmdc_study_to_ncbi_submission_export,
     generate_data_generation_set_for_biosamples_in_nmdc_study,
 )
+from nmdc_runtime.site.ops import ALLDOCS_TXN_LOG_CONSUMER
 from nmdc_runtime.site.resources import (
     get_mongo,
     runtime_api_site_client_resource,
@@ -123,6 +126,33 @@ ensure_alldocs_daily = ScheduleDefinition(
 )
 
 
+@sensor(
+    job=ensure_alldocs_incrementally.to_job(**preset_normal),
+    minimum_interval_seconds=60,
+    default_status=DefaultSensorStatus.RUNNING,
+)
+def alldocs_txn_log_sensor(_context):
+    """Keep `alldocs` up to date by applying newly-logged transactions (see `txn_log`) incrementally."""
+    mdb = get_mongo(run_config_frozen__normal_env).db
+    checkpoint = get_txn_log_checkpoint(mdb, ALLDOCS_TXN_LOG_CONSUMER)
+    if checkpoint is None:
+        yield SkipReason("No `alldocs` checkpoint yet. Awaiting a full rebuild.")
+        return
+    # The incremental materialization re-reads the log from `TXN_LOG_OVERLAP` before its checkpoint, so an entry
+    # that became visible late (i.e. timestamped before the checkpoint) is applied by the run for the next entry.
+    since = checkpoint - TXN_LOG_OVERLAP
+    latest_txn = mdb.txn_log.find_one(
+        {"ts": {"$gt": since}}, {"ts": 1}, sort=[("ts", -1), ("_id", -1)]
+    )
+    if latest_txn is None:
+        yield SkipReason(f"No transactions since {since.isoformat()}")
+        return
+    yield RunRequest(
+        run_key=f"alldocs@{latest_txn['ts'].isoformat()}+{latest_txn['_id']}",
+        run_config=unfreeze(run_config_frozen__normal_env),
+    )
+
+
 def asset_materialization_metadata(asset_event, key):
     """Get metadata from an asset materialization event.
 
@@ -470,6 +500,7 @@ def repo():
         process_workflow_job_triggers,
         claim_and_run_apply_changesheet_jobs,
         claim_and_run_metadata_in_jobs,
+        alldocs_txn_log_sensor,
         on_run_fail,
     ]
 
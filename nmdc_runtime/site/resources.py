@@ -1,15 +1,24 @@
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
 import json
 import os
-from datetime import timedelta, datetime, timezone
+import tempfile
+import threading
+import zlib
+from datetime import timedelta, datetime
 from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+import pandas as pd
 import requests
 import requests_cache
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from dagster import (
     build_init_resource_context,
+    Field,
     resource,
     StringSource,
     InitResourceContext,
@@ -23,6 +32,7 @@ from toolz import get_in
 from toolz import merge
 
 from nmdc_runtime.api.core.util import expiry_dt_from_now, has_passed
+from nmdc_runtime.api.db.mongo import log_txns, record_id_routes
 from nmdc_runtime.api.models.object import DrsObject, AccessURL, DrsObjectIn
 from nmdc_runtime.api.models.operation import ListOperationsResponse
 from nmdc_runtime.api.models.util import ListRequest
@@ -467,11 +477,53 @@ def nmdc_portal_api_client_resource(context: InitResourceContext):
     )
 
 
+# Number of NEON month listings and data files fetched at once.
+NEON_MAX_WORKERS = 8
+
+# Default directory in which downloaded NEON data files are cached. This is an absolute path, so that all processes
+# (e.g. the Dagster daemon and webserver) share one cache regardless of their working directories.
+NEON_FILE_CACHE_DIR = os.path.join(
+    tempfile.gettempdir(), "nmdc_runtime", "neon_file_cache"
+)
+
+# Default maximum total size (in bytes) of the cached NEON data files. Beyond it, the least-recently-used files are
+# evicted.
+NEON_FILE_CACHE_MAX_BYTES = 10 * 1024**3
+
+
 @dataclass
 class NeonApiClient:
+    r"""
+    A client for the NEON Data API.
+
+    JSON responses are cached by `requests_cache` (by default). Data files are downloaded concurrently, verified
+    against their checksums, and kept in a content-addressed cache in `cache_dir`, keyed by the file's URL (without
+    the query string, which NEON uses for expiring signatures) and checksum, so a file is downloaded again only
+    when NEON publishes new content. Files without a listed checksum cannot be verified, so they are not cached.
+    The cache is limited to `cache_max_bytes`, beyond which the least-recently-used files are evicted.
+    If `parquet_dir` is set, each assembled table is also persisted there as Parquet (this requires `pyarrow`),
+    keyed by the checksums of the files it was assembled from.
+    """
+
     base_url: str
     api_token: str
-    session = requests_cache.CachedSession("neon_cache")
+    cache_dir: str = NEON_FILE_CACHE_DIR
+    cache_max_bytes: int = NEON_FILE_CACHE_MAX_BYTES
+    parquet_dir: Optional[str] = None
+    max_workers: int = NEON_MAX_WORKERS
+    session: requests.Session = field(
+        default_factory=lambda: requests_cache.CachedSession("neon_cache")
+    )
+
+    def __post_init__(self):
+        # Data files are cached on disk by `download_file`, so they are fetched through a plain session, whose
+        # connection pool is sized to the number of concurrent downloads.
+        self.file_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers, pool_maxsize=self.max_workers
+        )
+        self.file_session.mount("http://", adapter)
+        self.file_session.mount("https://", adapter)
 
     def request(self, url):
         response = self.session.get(url, headers={"X-API-Token": self.api_token})
@@ -481,12 +533,173 @@ class NeonApiClient:
     def fetch_product_by_id(self, product_id: str):
         return self.request(self.base_url + f"/products/{product_id}")
 
+    @staticmethod
+    def file_cache_key(file: Dict[str, Any]) -> str:
+        r"""
+        Returns the cache key for a file listed by the NEON Data API.
+
+        >>> NeonApiClient.file_cache_key({"url": "https://x.org/a.csv?sig=1", "md5": "abc"}) == (
+        ...     NeonApiClient.file_cache_key({"url": "https://x.org/a.csv?sig=2", "md5": "abc"}))
+        True
+        """
+        url = file["url"].split("?", 1)[0]
+        checksum = file.get("md5") or file.get("crc32") or ""
+        return hashlib.sha256(f"{url}\t{checksum}".encode()).hexdigest()
+
+    def download_file(self, file: Dict[str, Any]) -> Path:
+        r"""
+        Returns the path to a local copy of the specified file, downloading it (streamed) if it is not yet cached.
+
+        A download is cached only if its content matches the file's listed checksum (`md5` or `crc32`); raises
+        `ValueError` if it does not. A file without a listed checksum is downloaded to a temporary path that is not
+        part of the cache, and which the caller must delete (see `read_csv_file`).
+        """
+        verifiable = bool(file.get("md5") or file.get("crc32"))
+        path = Path(self.cache_dir) / self.file_cache_key(file)
+        if verifiable and path.exists():
+            path.touch()  # mark as recently used
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.part")
+        md5, crc32 = hashlib.md5(), 0
+        try:
+            with self.file_session.get(file["url"], stream=True) as response:
+                response.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+                        md5.update(chunk)
+                        crc32 = zlib.crc32(chunk, crc32)
+            if file.get("md5") and md5.hexdigest() != file["md5"].lower():
+                raise ValueError(f"MD5 checksum mismatch for {file['name']}")
+            if (
+                not file.get("md5")
+                and file.get("crc32")
+                and f"{crc32:08x}" != file["crc32"].lower()
+            ):
+                raise ValueError(f"CRC32 checksum mismatch for {file['name']}")
+            if not verifiable:
+                return tmp_path
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return path
+
+    def read_csv_file(self, file: Dict[str, Any]) -> pd.DataFrame:
+        r"""
+        Returns a DataFrame of the specified CSV file (see `download_file`), deleting the local copy if it is not
+        cached.
+        """
+        path = self.download_file(file)
+        try:
+            return pd.read_csv(path)
+        finally:
+            if path.suffix == ".part":
+                path.unlink(missing_ok=True)
+
+    def evict_cached_files(self) -> int:
+        r"""
+        Deletes the least-recently-used cached files until the cache holds at most `cache_max_bytes`, and returns
+        the number of files deleted.
+        """
+        cache_dir = Path(self.cache_dir)
+        if not cache_dir.is_dir():
+            return 0
+        cached_files = []
+        for path in cache_dir.iterdir():
+            if path.suffix == ".part" or not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process
+            cached_files.append((stat.st_mtime, stat.st_size, path))
+        total_bytes = sum(size for _, size, _ in cached_files)
+        n_evicted = 0
+        for _, size, path in sorted(cached_files, key=lambda f: f[0]):
+            if total_bytes <= self.cache_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            n_evicted += 1
+        return n_evicted
+
+    def fetch_product_tables(
+        self, product_id: str, table_names: List[str]
+    ) -> Dict[str, pd.DataFrame]:
+        r"""
+        Returns a DataFrame for each of the specified tables of the specified data product, concatenating the
+        "expanded" package files of the table across all sites and months.
+        """
+        product = self.fetch_product_by_id(product_id)
+        data_urls = [
+            data_url
+            for site in product["data"]["siteCodes"]
+            for data_url in site["availableDataUrls"]
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            data_files = [
+                file
+                for listing in executor.map(self.request, data_urls)
+                for file in listing["data"]["files"]
+            ]
+            files_by_table = {
+                table_name: [
+                    file
+                    for file in data_files
+                    if table_name in file["name"] and "expanded" in file["name"]
+                ]
+                for table_name in table_names
+            }
+            tables = {}
+            for table_name, files in files_by_table.items():
+                parquet_path = self._parquet_path(product_id, table_name, files)
+                if parquet_path is not None and parquet_path.exists():
+                    tables[table_name] = pd.read_parquet(parquet_path)
+                    continue
+                frames = list(executor.map(self.read_csv_file, files))
+                tables[table_name] = (
+                    pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                )
+                if parquet_path is not None:
+                    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+                    tables[table_name].to_parquet(parquet_path)
+        self.evict_cached_files()
+        return tables
+
+    def _parquet_path(
+        self, product_id: str, table_name: str, files: List[Dict[str, Any]]
+    ) -> Optional[Path]:
+        # A table assembled from files that cannot be verified is not persisted, just like those files.
+        if self.parquet_dir is None or not all(
+            file.get("md5") or file.get("crc32") for file in files
+        ):
+            return None
+        digest = hashlib.sha256(
+            "\n".join(self.file_cache_key(file) for file in files).encode()
+        ).hexdigest()
+        return Path(self.parquet_dir) / product_id / f"{table_name}-{digest}.parquet"
+
 
-@resource(config_schema={"base_url": StringSource, "api_token": StringSource})
+@resource(
+    config_schema={
+        "base_url": StringSource,
+        "api_token": StringSource,
+        "cache_dir": Field(StringSource, is_required=False),
+        "cache_max_bytes": Field(int, default_value=NEON_FILE_CACHE_MAX_BYTES),
+        "parquet_dir": Field(StringSource, is_required=False),
+        "max_workers": Field(int, default_value=NEON_MAX_WORKERS),
+    }
+)
 def neon_api_client_resource(context: InitResourceContext):
     return NeonApiClient(
         base_url=context.resource_config["base_url"],
         api_token=context.resource_config["api_token"],
+        cache_dir=context.resource_config.get("cache_dir", NEON_FILE_CACHE_DIR),
+        cache_max_bytes=context.resource_config["cache_max_bytes"],
+        parquet_dir=context.resource_config.get("parquet_dir"),
+        max_workers=context.resource_config["max_workers"],
     )
 
 
@@ -522,18 +735,9 @@ class MongoDB:
                         for d in docs
                     ]
                 )
-                now = datetime.now(timezone.utc)
-                self.db.txn_log.insert_many(
-                    [
-                        {
-                            "tgt": {"id": d.get("id"), "c": collection_name},
-                            "type": "upsert",
-                            "ts": now,
-                            # "dtl": {},
-                        }
-                        for d in docs
-                    ]
-                )
+                ids = [d.get("id") for d in docs]
+                log_txns(self.db, collection_name, ids, "upsert")
+                record_id_routes(self.db, collection_name, ids)
             return rv
         except JsonSchemaValueException as e:
             raise ValueError(e.message)
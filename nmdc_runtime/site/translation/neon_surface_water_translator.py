@@ -607,6 +607,8 @@ class NeonSurfaceWaterDataTranslator(Translator):
         """
         neon_raw_data_files_df = pd.read_sql_query(raw_query, self.conn)
 
+        # Plan the records to create first, so that their ids can be minted in bulk.
+        sequencing_plans = []
         for neon_id, nmdc_libprep_id in neon_to_nmdc_lib_prep_ids.items():
             # 1) Pull out the row that corresponds to this parentSampleID
             lib_prep_row = surface_water_samples[
@@ -636,13 +638,48 @@ class NeonSurfaceWaterDataTranslator(Translator):
                 # Could skip, or raise an error, or set a default
                 continue
 
+            # For each row that references a dnaSampleID with multiple raw files,
+            # a manifest record is created (see step 4 below)
+            needs_manifest = len(dna_files) > 2
+
+            # One data_generation record is created per sequencerRunID (see step 5 below),
+            # unless we don't have a ProcessedSample for some reason
+            lib_prep_processed_sample_id = neon_to_nmdc_lib_prep_processed_ids.get(
+                neon_id
+            )
+            runs = (
+                list(dna_files.groupby("sequencerRunID"))
+                if lib_prep_processed_sample_id
+                else []
+            )
+            sequencing_plans.append(
+                (lib_prep_row, has_input_value, needs_manifest, runs)
+            )
+
+        self._id_minter.reserve(
+            "nmdc:Manifest",
+            sum(needs_manifest for _, _, needs_manifest, _ in sequencing_plans),
+        )
+        self._id_minter.reserve(
+            "nmdc:NucleotideSequencing",
+            sum(len(runs) for _, _, _, runs in sequencing_plans),
+        )
+        self._id_minter.reserve(
+            "nmdc:DataObject",
+            sum(
+                len(group_df)
+                for _, _, _, runs in sequencing_plans
+                for _, group_df in runs
+            ),
+        )
+
+        for lib_prep_row, has_input_value, needs_manifest, runs in sequencing_plans:
             # -------------------------------------------
             # 4) CREATE A MANIFEST IF MULTIPLE RAW FILES
             #    for this row's dnaSampleID
             # -------------------------------------------
             manifest_id = None
-            if len(dna_files) > 2:
-                # For each row that references a dnaSampleID with multiple raw files,
+            if needs_manifest:
                 # mint exactly one new manifest record
                 manifest_id = self._id_minter("nmdc:Manifest", 1)[0]
                 new_manifest = self._translate_manifest(manifest_id)
@@ -653,14 +690,7 @@ class NeonSurfaceWaterDataTranslator(Translator):
             # 5) NOW GROUP FILES BY sequencerRunID
             #    => one data_generation record per run
             # -------------------------------------------
-            lib_prep_processed_sample_id = neon_to_nmdc_lib_prep_processed_ids.get(
-                neon_id
-            )
-            if not lib_prep_processed_sample_id:
-                # If we don't have a ProcessedSample for some reason, skip
-                continue
-
-            for run_id, group_df in dna_files.groupby("sequencerRunID"):
+            for run_id, group_df in runs:
                 # a) Mint new data_generation (NucleotideSequencing) ID for this run
                 data_generation_id = self._id_minter("nmdc:NucleotideSequencing", 1)[0]
 
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from functools import lru_cache
 from importlib import resources
-from typing import Any, List, Optional, Union
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
 
 from linkml_runtime import SchemaView
 from linkml_runtime.linkml_model import SlotDefinition
@@ -47,6 +47,99 @@ def _get_schema_view():
     )
 
 
+@lru_cache
+def _get_class_slot_names(schema_view: SchemaView, class_name: str) -> frozenset:
+    """Get the names of the slots of a class
+
+    :param schema_view: SchemaView of the NMDC schema
+    :param class_name: name of the class
+    :return: set of slot names
+    """
+    return frozenset(schema_view.class_slots(class_name))
+
+
+@lru_cache
+def _get_slot_multivalued_and_range(
+    schema_view: SchemaView, class_name: str, slot_name: str
+) -> Tuple[bool, Optional[str]]:
+    """Get whether a slot of a class is multivalued, and its range, as induced for that class
+
+    This is computed once per process (and shared by translator instances), since inducing a slot is expensive.
+
+    :param schema_view: SchemaView of the NMDC schema
+    :param class_name: name of the class
+    :param slot_name: name of the slot
+    :return: (multivalued, range)
+    """
+    slot_definition = schema_view.induced_slot(slot_name, class_name)
+    return bool(slot_definition.multivalued), slot_definition.range
+
+
+class SlotTransform(NamedTuple):
+    """How to transform a raw value for a slot of a class (see `SubmissionPortalTranslator._get_slot_transform`)"""
+
+    slot_name: str
+    multivalued: bool
+    # Transforms a raw value (given the translator, the value, and an optional unit), or None if raw values are
+    # used as-is.
+    transform: Optional[Callable[[Any, Any, Optional[str]], Any]]
+
+
+def _get_range_transform(
+    range_: Optional[str],
+) -> Optional[Callable[[Any, Any, Optional[str]], Any]]:
+    """Get the function that transforms a raw value (and an optional unit) into a value in a slot range
+
+    :param range_: range of the slot
+    :return: function of (translator, raw value, unit), or None if raw values are used as-is
+    """
+    if range_ == "TextValue":
+        return lambda translator, value, unit: nmdc.TextValue(
+            has_raw_value=value,
+            type="nmdc:TextValue",
+        )
+    elif range_ == "QuantityValue":
+        return lambda translator, value, unit: translator._get_quantity_value(
+            value,
+            unit=unit,
+        )
+    elif range_ == "ControlledIdentifiedTermValue":
+        return lambda translator, value, unit: (
+            translator._get_controlled_identified_term_value(value)
+        )
+    elif range_ == "ControlledTermValue":
+        return lambda translator, value, unit: translator._get_controlled_term_value(
+            value
+        )
+    elif range_ == "TimestampValue":
+        return lambda translator, value, unit: nmdc.TimestampValue(
+            has_raw_value=value,
+            type="nmdc:TimestampValue",
+        )
+    elif range_ == "GeolocationValue":
+        return lambda translator, value, unit: translator._get_geolocation_value(value)
+    elif range_ == "float":
+        return lambda translator, value, unit: translator._get_float(value)
+    elif range_ == "string":
+        return lambda translator, value, unit: str(value).strip()
+    else:
+        return None
+
+
+@lru_cache
+def _get_transform_plan(schema_view: SchemaView, class_name: str) -> dict:
+    """Get the transform plan of a class, which maps slot names to SlotTransforms (or None for non-slots)
+
+    The plan is shared by translator instances, and is filled in one slot at a time, as slots are encountered
+    (see `SubmissionPortalTranslator._get_slot_transform`).
+
+    :param schema_view: SchemaView of the NMDC schema
+    :param class_name: name of the class
+    :return: transform plan
+    """
+    return {}
+
+
 def group_dicts_by_key(key: str, seq: Optional[list[dict]]) -> Optional[dict]:
     """Transform a sequence of dicts into a single dict based on values of `key` in each dict.
 
@@ -487,36 +580,33 @@ class SubmissionPortalTranslator(Translator):
     def _transform_value_for_slot(
         self, value: Any, slot: SlotDefinition, unit: Optional[str] = None
     ):
-        transformed_value = None
-        if slot.range == "TextValue":
-            transformed_value = nmdc.TextValue(
-                has_raw_value=value,
-                type="nmdc:TextValue",
-            )
-        elif slot.range == "QuantityValue":
-            transformed_value = self._get_quantity_value(
-                value,
-                unit=unit,
-            )
-        elif slot.range == "ControlledIdentifiedTermValue":
-            transformed_value = self._get_controlled_identified_term_value(value)
-        elif slot.range == "ControlledTermValue":
-            transformed_value = self._get_controlled_term_value(value)
-        elif slot.range == "TimestampValue":
-            transformed_value = nmdc.TimestampValue(
-                has_raw_value=value,
-                type="nmdc:TimestampValue",
-            )
-        elif slot.range == "GeolocationValue":
-            transformed_value = self._get_geolocation_value(value)
-        elif slot.range == "float":
-            transformed_value = self._get_float(value)
-        elif slot.range == "string":
-            transformed_value = str(value).strip()
-        else:
-            transformed_value = value
+        transform = _get_range_transform(slot.range)
+        return value if transform is None else transform(self, value, unit)
 
-        return transformed_value
+    def _get_slot_transform(
+        self, class_name: str, slot_name: str
+    ) -> Optional[SlotTransform]:
+        """Get how to transform a raw value for a slot of a class, per the class's transform plan
+
+        The transform plan of a class is compiled (one slot at a time, as slots are encountered) once per process,
+        and shared by translator instances. Transforming a value is then a dict lookup plus a function call.
+
+        :param class_name: name of the class
+        :param slot_name: name of the slot
+        :return: SlotTransform, or None if the class has no such slot
+        """
+        plan = _get_transform_plan(self.schema_view, class_name)
+        if slot_name not in plan:
+            if slot_name in _get_class_slot_names(self.schema_view, class_name):
+                multivalued, range_ = _get_slot_multivalued_and_range(
+                    self.schema_view, class_name, slot_name
+                )
+                plan[slot_name] = SlotTransform(
+                    slot_name, multivalued, _get_range_transform(range_)
+                )
+            else:
+                plan[slot_name] = None
+        return plan[slot_name]
 
     def _transform_dict_for_class(
         self, raw_values: dict, class_name: str, slot_mappings: Optional[dict] = None
@@ -524,8 +614,9 @@ class SubmissionPortalTranslator(Translator):
         """Transform a dict of values according to class slots.
 
         raw_values is a dict where the keys are slot names and the values are plain strings.
-        Each of the items in this dict will be transformed by the _transform_value_for_slot
-        method. If the slot is multivalued each individual value will be transformed. If the
+        Each of the items in this dict will be transformed according to the class's transform
+        plan (see _get_slot_transform), i.e. the range of the slot. If the slot is multivalued
+        each individual value will be transformed. If the
         slot is multivalued and the value is a string it will be split at pipe characters
         before transforming.
 
@@ -535,7 +626,6 @@ class SubmissionPortalTranslator(Translator):
         https://github.com/mapping-commons/sssom) and for `subject_unit` (useful for when the column
         maps to a QuantityValue slot and the source metadata itself does not include the unit)
         """
-        slot_names = self.schema_view.class_slots(class_name)
         transformed_values = {}
         for column, value in raw_values.items():
             slot_name = column
@@ -547,22 +637,24 @@ class SubmissionPortalTranslator(Translator):
 
                 unit = slot_mappings[column].get("subject_unit")
 
-            if slot_name not in slot_names:
+            slot_transform = self._get_slot_transform(class_name, slot_name)
+            if slot_transform is None:
                 logging.warning(f"No slot '{slot_name}' on class '{class_name}'")
                 continue
 
-            slot_definition = self.schema_view.induced_slot(slot_name, class_name)
-            if slot_definition.multivalued:
+            transform = slot_transform.transform
+            if slot_transform.multivalued:
                 value_list = value
                 if isinstance(value, str):
                     value_list = [v.strip() for v in value.split("|")]
-                transformed_value = [
-                    self._transform_value_for_slot(item, slot_definition, unit)
-                    for item in value_list
-                ]
+                transformed_value = (
+                    list(value_list)
+                    if transform is None
+                    else [transform(self, item, unit) for item in value_list]
+                )
             else:
-                transformed_value = self._transform_value_for_slot(
-                    value, slot_definition, unit
+                transformed_value = (
+                    value if transform is None else transform(self, value, unit)
                 )
 
             transformed_values[slot_name] = transformed_value
@@ -695,6 +787,24 @@ class SubmissionPortalTranslator(Translator):
                     grouped,
                 )
 
+            # Mint the ids of all the NucleotideSequencing and DataObject instances generated below, in bulk.
+            sequenced_sample_data_ids = [
+                sample_data_id
+                for row in self.nucleotide_sequencing_mapping
+                if (sample_data_id := row.get(join_key))
+                and sample_data_id in sample_data_to_nmdc_biosample_ids
+            ]
+            self._id_minter.reserve(
+                "nmdc:NucleotideSequencing", len(sequenced_sample_data_ids)
+            )
+            self._id_minter.reserve(
+                "nmdc:DataObject",
+                sum(
+                    len(data_objects_by_sample_data_id.get(sample_data_id, []))
+                    for sample_data_id in sequenced_sample_data_ids
+                ),
+            )
+
             for nucleotide_sequencing_row in self.nucleotide_sequencing_mapping:
                 # For each row in the NucleotideSequencing mapping file, first grab the minted
                 # Biosample id that corresponds to the sample ID from the submission
@@ -1,15 +1,67 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
 from typing import Any, Callable, Dict, List, Optional
 from nmdc_schema import nmdc
 
 JSON_OBJECT = Dict[str, Any]
 
+IdMinter = Callable[[str, Optional[int]], List[str]]
 
-class Translator(ABC):
-    def __init__(
-        self, id_minter: Optional[Callable[[str, Optional[int]], List[str]]] = None
-    ) -> None:
+
+class IdPool:
+    r"""
+    Wraps an `id_minter` callable (e.g. one that calls the Runtime API's `/pids/mint` endpoint), so that the ids a
+    translation needs can be minted in bulk, up front, and then handed out one (or a few) at a time.
+
+    An `IdPool` is itself called like an `id_minter`. Ids previously `reserve`d for the class are handed out first,
+    and any shortfall is minted in one call to the wrapped `id_minter`.
+
+    >>> counter = iter(range(100))
+    >>> calls = []
+    >>> def mint(schema_class, how_many=1):
+    ...     calls.append((schema_class, how_many))
+    ...     return [f"nmdc:dobj-00-{next(counter)}" for _ in range(how_many)]
+    >>> pool = IdPool(mint)
+    >>> pool.reserve("nmdc:DataObject", 3)
+    >>> [pool("nmdc:DataObject", 1)[0] for _ in range(3)]
+    ['nmdc:dobj-00-0', 'nmdc:dobj-00-1', 'nmdc:dobj-00-2']
+    >>> pool("nmdc:DataObject", 2)
+    ['nmdc:dobj-00-3', 'nmdc:dobj-00-4']
+    >>> calls
+    [('nmdc:DataObject', 3), ('nmdc:DataObject', 2)]
+    """
+
+    def __init__(self, id_minter: IdMinter):
         self._id_minter = id_minter
+        self._reserved = defaultdict(deque)
+
+    def reserve(self, schema_class: str, how_many: int) -> None:
+        r"""
+        Mints `how_many` ids for the specified class, in one call to the wrapped `id_minter`, to be handed out later.
+
+        Note: Minted ids are never returned to the minter, so reserve only as many ids as will be used.
+        """
+        if how_many > 0:
+            ids = self._id_minter(schema_class, how_many)
+            if len(ids) != how_many:
+                raise ValueError(
+                    f"asked to mint {how_many} {schema_class} ids, but got {len(ids)}"
+                )
+            self._reserved[schema_class].extend(ids)
+
+    def __call__(self, schema_class: str, how_many: int = 1) -> List[str]:
+        reserved = self._reserved[schema_class]
+        self.reserve(schema_class, how_many - len(reserved))
+        return [reserved.popleft() for _ in range(how_many)]
+
+
+class Translator(ABC):
+    def __init__(self, id_minter: Optional[IdMinter] = None) -> None:
+        self._id_minter = (
+            IdPool(id_minter)
+            if id_minter is not None and not isinstance(id_minter, IdPool)
+            else id_minter
+        )
 
     def _index_by_id(self, collection, id):
         return {item[id]: item for item in collection}
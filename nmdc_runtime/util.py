@@ -2,6 +2,7 @@ import json
 import mimetypes
 import os
 import pkgutil
+from collections import defaultdict
 from collections.abc import Iterable
 from contextlib import AbstractContextManager
 from copy import deepcopy
@@ -24,11 +25,12 @@ from nmdc_schema.get_nmdc_view import ViewGetter
 from pydantic import Field, BaseModel
 from pymongo.database import Database as MongoDatabase
 from pymongo.errors import OperationFailure
-from refscan.lib.helpers import identify_references
-from refscan.lib.Finder import Finder
+from refscan.lib.helpers import (
+    derive_schema_class_name_from_document,
+    identify_references,
+)
 from refscan.lib.ReferenceList import ReferenceList
-from refscan.scanner import scan_outgoing_references
-from toolz import merge, unique
+from toolz import merge, unique, partition_all
 
 from nmdc_runtime.api.core.util import sha256hash_from_file
 from nmdc_runtime.api.models.object import DrsObjectIn
@@ -181,7 +183,42 @@ def get_nmdc_jsonschema_dict(enforce_id_patterns=True):
 
 @lru_cache
 def get_nmdc_jsonschema_validator(enforce_id_patterns=True):
+    # Note: Compiling a schema rewrites its `$ref`s in place, so compile a copy of the shared (cached) schema dict.
+    return fastjsonschema.compile(
+        deepcopy(get_nmdc_jsonschema_dict(enforce_id_patterns=enforce_id_patterns))
+    )
+
+
+@lru_cache
+def get_nmdc_jsonschema_collection_validator(
+    collection_name: str, enforce_id_patterns: bool = True
+):
+    r"""
+    Returns a compiled validator for the list of documents in the specified collection (i.e. for the value of the
+    corresponding `Database` slot). Compilation happens on first use, once per collection per process.
+
+    Note: The compiled validator raises on the first error it encounters. Use it as a fast path, and use
+          `get_nmdc_jsonschema_draft7_validator` to collect detailed errors when the fast path fails.
+    """
+    schema = get_nmdc_jsonschema_dict(enforce_id_patterns=enforce_id_patterns)
+    # Note: The collection's schema keeps the `$id` of the full schema, so that its `$ref`s resolve to its own
+    #       `$defs` rather than to a remote document. And since compiling a schema rewrites its `$ref`s in place,
+    #       it is built from a copy of the shared (cached) schema dict.
     return fastjsonschema.compile(
+        deepcopy(
+            {
+                "$id": schema["$id"],
+                "$defs": schema["$defs"],
+                **schema["properties"][collection_name],
+            }
+        ),
+        use_default=False,
+    )
+
+
+@lru_cache
+def get_nmdc_jsonschema_draft7_validator(enforce_id_patterns: bool = True):
+    return Draft7Validator(
         get_nmdc_jsonschema_dict(enforce_id_patterns=enforce_id_patterns)
     )
 
@@ -513,6 +550,23 @@ def ensure_unique_id_indexes(mdb: MongoDatabase):
             mdb[collection_name].create_index("id", unique=True)
 
 
+def get_duplicate_ids(docs: List[dict]) -> Set[str]:
+    r"""
+    Returns the set of `id` values that occur in more than one of the specified documents.
+
+    >>> sorted(get_duplicate_ids([{"id": "a"}, {"id": "b"}, {"id": "a"}, {"name": "c"}]))
+    ['a']
+    """
+    seen_ids, duplicate_ids = set(), set()
+    for doc in docs:
+        if "id" not in doc:
+            continue
+        if doc["id"] in seen_ids:
+            duplicate_ids.add(doc["id"])
+        seen_ids.add(doc["id"])
+    return duplicate_ids
+
+
 class UpdateStatement(BaseModel):
     q: dict
     u: dict
@@ -583,12 +637,22 @@ class OverlayDB(AbstractContextManager):
         except OperationFailure as e:
             raise OverlayDBError(str(e.details))
 
-    def apply_updates(self, coll_name, updates: list):
-        """prepare overlay db and apply updates to it."""
+    def apply_updates(self, coll_name, updates: list, bottom_docs: list = None):
+        """prepare overlay db and apply updates to it.
+
+        If `bottom_docs` is specified, it is taken to be the (already fetched) base-collection documents
+        affected by the updates, so the base collection is not queried again.
+        """
         assert all(UpdateStatement(**us) for us in updates)
-        for update_spec in updates:
-            for bottom_doc in self._bottom_db[coll_name].find(update_spec["q"]):
-                self._top_db[coll_name].insert_one(bottom_doc)
+        if bottom_docs is None:
+            bottom_docs = {
+                d["_id"]: d
+                for update_spec in updates
+                for d in self._bottom_db[coll_name].find(update_spec["q"])
+            }.values()
+        bottom_docs = list(bottom_docs)
+        if bottom_docs:
+            self._top_db[coll_name].insert_many(bottom_docs)
         try:
             self._top_db.command({"update": coll_name, "updates": updates})
         except OperationFailure as e:
@@ -627,8 +691,124 @@ class OverlayDB(AbstractContextManager):
                 yield doc
 
 
+def find_reference_violations(
+    in_docs: dict, mdb: MongoDatabase
+) -> Dict[str, List[str]]:
+    r"""
+    Returns a dictionary mapping the name of each collection in the specified payload to a list of descriptions of the
+    inter-document references, emanating from documents in that collection, whose targets exist neither in the payload
+    nor in the database (in the collections the schema says they can exist in).
+
+    The check is done in bulk, in three stages:
+    1. Collect every outgoing reference in the payload, by way of the reference fields `refscan` derives from the
+       schema. References to documents in the payload itself (in an allowed collection) are resolved via an index
+       of the payload's `id`s.
+    2. For each collection the schema allows any remaining reference to target, query the database once (per batch)
+       for which of those `id`s exist in that collection.
+    3. Report the references whose targets were found in none of their allowed collections.
+    """
+    references = get_allowed_references()
+    reference_field_names_by_source_class_name = (
+        references.get_reference_field_names_by_source_class_name()
+    )
+    schema_view = nmdc_schema_view()
+
+    payload_ids_by_collection_name = {
+        collection_name: {doc["id"] for doc in docs if "id" in doc}
+        for collection_name, docs in in_docs.items()
+    }
+
+    # Memoize schema lookups, since payloads typically contain many documents of few classes.
+    class_names_by_class_uri = {}
+    target_collection_names_by_field = {}
+
+    # (source collection name, source document id, field name, target id, target collection names)
+    unresolved = []
+    unresolved_ids_by_collection_name = defaultdict(set)
+    for source_collection_name, documents in in_docs.items():
+        for document in documents:
+            class_uri = document.get("type")
+            if not isinstance(class_uri, str):
+                continue
+            if class_uri not in class_names_by_class_uri:
+                class_names_by_class_uri[class_uri] = (
+                    derive_schema_class_name_from_document(schema_view, document)
+                )
+            source_class_name = class_names_by_class_uri[class_uri]
+            for field_name in reference_field_names_by_source_class_name.get(
+                source_class_name, []
+            ):
+                if field_name not in document:
+                    continue
+                key = (source_class_name, field_name)
+                if key not in target_collection_names_by_field:
+                    target_collection_names_by_field[key] = (
+                        references.get_target_collection_names(
+                            source_class_name=source_class_name,
+                            source_field_name=field_name,
+                        )
+                    )
+                target_collection_names = target_collection_names_by_field[key]
+                target_ids = document[field_name]
+                if not isinstance(target_ids, list):
+                    target_ids = [target_ids]
+                for target_id in target_ids:
+                    if any(
+                        target_id in payload_ids_by_collection_name.get(name, ())
+                        for name in target_collection_names
+                    ):
+                        continue
+                    unresolved.append(
+                        (
+                            source_collection_name,
+                            document.get("id"),
+                            field_name,
+                            target_id,
+                            target_collection_names,
+                        )
+                    )
+                    for name in target_collection_names:
+                        unresolved_ids_by_collection_name[name].add(target_id)
+
+    found_ids_by_collection_name = defaultdict(set)
+    for collection_name, ids in unresolved_ids_by_collection_name.items():
+        for batch in partition_all(10_000, ids):
+            found_ids_by_collection_name[collection_name].update(
+                doc["id"]
+                for doc in mdb[collection_name].find(
+                    {"id": {"$in": list(batch)}}, {"_id": 0, "id": 1}
+                )
+            )
+
+    violations = defaultdict(list)
+    for (
+        source_collection_name,
+        source_document_id,
+        field_name,
+        target_id,
+        target_collection_names,
+    ) in unresolved:
+        if not any(
+            target_id in found_ids_by_collection_name[name]
+            for name in target_collection_names
+        ):
+            violations[source_collection_name].append(
+                f"Document '{source_document_id}' "
+                f"in collection '{source_collection_name}' "
+                f"has a field '{field_name}' that "
+                f"references a document having id "
+                f"'{target_id}', but the latter document "
+                f"does not exist in any of the collections the "
+                f"NMDC Schema says it can exist in."
+            )
+    return dict(violations)
+
+
 def validate_json(
-    in_docs: dict, mdb: MongoDatabase, check_inter_document_references: bool = False
+    in_docs: dict,
+    mdb: MongoDatabase,
+    check_inter_document_references: bool = False,
+    instantiate_dataclasses: bool = True,
 ):
     r"""
     Checks whether the specified dictionary represents a valid instance of the `Database` class
@@ -653,13 +833,14 @@ def validate_json(
                                             in the database, if the documents passed in were to be inserted into
                                             the database. In other words, set this to `True` if you want this
                                             function to perform referential integrity checks.
+    :param instantiate_dataclasses: Whether you want this function to also try instantiating the LinkML-sourced
+                                    dataclasses for the documents passed in, once they have passed JSON Schema
+                                    validation. This is comparatively slow for large payloads.
     """
-    validator = Draft7Validator(get_nmdc_jsonschema_dict())
-    docs = deepcopy(in_docs)
     validation_errors = {}
 
     known_coll_names = set(nmdc_database_collection_names())
-    for coll_name, coll_docs in docs.items():
+    for coll_name, coll_docs in in_docs.items():
         if coll_name not in known_coll_names:
             # FIXME: Document what `@type` is (conceptually; e.g., why this function accepts it as a collection name).
             #        See: https://github.com/microbiomedata/nmdc-runtime/discussions/858
@@ -671,7 +852,16 @@ def validate_json(
                 ]
                 continue
 
-        errors = list(validator.iter_errors({coll_name: coll_docs}))
+        # Fast path: use the compiled validator, and only collect detailed errors if it rejects the documents.
+        try:
+            get_nmdc_jsonschema_collection_validator(coll_name)(coll_docs)
+            errors = []
+        except fastjsonschema.JsonSchemaException:
+            errors = list(
+                get_nmdc_jsonschema_draft7_validator().iter_errors(
+                    {coll_name: coll_docs}
+                )
+            )
         validation_errors[coll_name] = [e.message for e in errors]
         if coll_docs:
             if not isinstance(coll_docs, list):
@@ -680,94 +870,32 @@ def validate_json(
                 validation_errors[coll_name].append(
                     "all elements of list must be dicts"
                 )
-            if not validation_errors[coll_name]:
-                try:
-                    with OverlayDB(mdb) as odb:
-                        odb.replace_or_insert_many(coll_name, coll_docs)
-                except OverlayDBError as e:
-                    validation_errors[coll_name].append(str(e))
+            if (
+                not validation_errors[coll_name]
+                and coll_name in schema_collection_names_with_id_field()
+            ):
+                # Note: Documents in the payload replace any existing documents having the same `id` when the
+                #       payload is ingested, so only duplicates _within_ the payload are errors.
+                if duplicate_ids := get_duplicate_ids(coll_docs):
+                    validation_errors[coll_name].append(
+                        f"Duplicate `id` values within '{coll_name}': {sorted(duplicate_ids)}"
+                    )
 
     if all(len(v) == 0 for v in validation_errors.values()):
-        # Second pass. Try instantiating linkml-sourced dataclass
+        # Second pass (if enabled). Try instantiating linkml-sourced dataclass
         in_docs.pop("@type", None)
-        try:
-            NMDCDatabase(**in_docs)
-        except Exception as e:
-            return {"result": "errors", "detail": str(e)}
+        if instantiate_dataclasses:
+            try:
+                NMDCDatabase(**in_docs)
+            except Exception as e:
+                return {"result": "errors", "detail": str(e)}
 
         # Third pass (if enabled): Check inter-document references.
         if check_inter_document_references is True:
-            # Prepare to use `refscan`.
-            #
-            # Note: We check the inter-document references in two stages, which are:
-            #       1. For each document in the JSON payload, check whether each document it references already exists
-            #          (in the collections the schema says it can exist in) in the database. We use the
-            #          `refscan` package to do this, which returns violation details we'll use in the second stage.
-            #       2. For each violation found in the first stage (i.e. each reference to a not-found document), we
-            #          check whether that document exists (in the collections the schema says it can exist in) in the
-            #          JSON payload. If it does, then we "waive" (i.e. discard) that violation.
-            #       The violations that remain after those two stages are the ones we return to the caller.
-            #
-            # Note: The reason we do not insert documents into an `OverlayDB` and scan _that_, is that the `OverlayDB`
-            #       does not provide a means to perform arbitrary queries against its virtual "merged" database. It
-            #       is not a drop-in replacement for a pymongo's `Database` class, which is the only thing that
-            #       `refscan`'s `Finder` class accepts.
-            #
-            finder = Finder(database=mdb)
-            references = get_allowed_references()
-            reference_field_names_by_source_class_name = (
-                references.get_reference_field_names_by_source_class_name()
-            )
-
-            # Iterate over the collections in the JSON payload.
-            for source_collection_name, documents in in_docs.items():
-                for document in documents:
-                    # Add an `_id` field to the document, since `refscan` requires the document to have one.
-                    source_document = dict(document, _id=None)
-                    violations = scan_outgoing_references(
-                        document=source_document,
-                        schema_view=nmdc_schema_view(),
-                        reference_field_names_by_source_class_name=reference_field_names_by_source_class_name,
-                        references=references,
-                        finder=finder,
-                        collection_names=nmdc_database_collection_names(),
-                        source_collection_name=source_collection_name,
-                        user_wants_to_locate_misplaced_documents=False,
-                    )
-
-                    # For each violation, check whether the misplaced document is in the JSON payload, itself.
-                    for violation in violations:
-                        can_waive_violation = False
-                        # Determine which collections can contain the referenced document, based upon
-                        # the schema class of which this source document is an instance.
-                        target_collection_names = (
-                            references.get_target_collection_names(
-                                source_class_name=violation.source_class_name,
-                                source_field_name=violation.source_field_name,
-                            )
-                        )
-                        # Check whether the referenced document exists in any of those collections in the JSON payload.
-                        for json_coll_name, json_coll_docs in in_docs.items():
-                            if json_coll_name in target_collection_names:
-                                for json_coll_doc in json_coll_docs:
-                                    if json_coll_doc["id"] == violation.target_id:
-                                        can_waive_violation = True
-                                        break  # stop checking
-                            if can_waive_violation:
-                                break  # stop checking
-                        if not can_waive_violation:
-                            violation_as_str = (
-                                f"Document '{violation.source_document_id}' "
-                                f"in collection '{violation.source_collection_name}' "
-                                f"has a field '{violation.source_field_name}' that "
-                                f"references a document having id "
-                                f"'{violation.target_id}', but the latter document "
-                                f"does not exist in any of the collections the "
-                                f"NMDC Schema says it can exist in."
-                            )
-                            validation_errors[source_collection_name].append(
-                                violation_as_str
-                            )
+            for source_collection_name, violations in find_reference_violations(
+                in_docs, mdb
+            ).items():
+                validation_errors[source_collection_name].extend(violations)
 
             # If any collection's error list is not empty, return an error response.
             if any(len(v) > 0 for v in validation_errors.values()):
@@ -1,6 +1,8 @@
 import collections
 import pytest
 
+from nmdc_runtime.api.core.idgen import generate_ids_batch
+from nmdc_runtime.minter.adapters import repository
 from nmdc_runtime.minter.adapters.repository import InMemoryIDStore, MongoIDStore
 from nmdc_runtime.minter.domain.model import (
     ResolutionRequest,
@@ -98,3 +100,23 @@ def test_mongo_mint_and_delete():
     s.delete(req_del)
     assert s.resolve(ResolutionRequest(**req_del.model_dump())) is None
     assert s.db["minter.id_records"].count_documents({}) == 0
+
+
+def test_mongo_mint_id_names_retries_taken_names(monkeypatch):
+    s = MongoIDStore(get_mongo_test_db())
+    s.db["minter.id_records"].drop()
+    s.db["minter.id_records"].create_index("id", unique=True)  # as at API startup
+
+    req_mint = minting_request()
+    req_mint.how_many = 10
+    taken = s.mint_id_names(req_mint)[0]
+    blades = iter([[taken.rsplit("-", 1)[1]] + generate_ids_batch(9)])
+    monkeypatch.setattr(
+        repository,
+        "generate_ids_batch",
+        lambda n: next(blades, None) or generate_ids_batch(n),
+    )
+    id_names = s.mint_id_names(req_mint)
+    assert len(set(id_names)) == 10
+    assert taken not in id_names
+    assert s.db["minter.id_records"].count_documents({}) == 20
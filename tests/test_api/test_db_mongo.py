@@ -5,7 +5,21 @@ from pymongo.collection import Collection
 from pymongo.errors import BulkWriteError, DuplicateKeyError
 from toolz import dissoc
 
-from nmdc_runtime.api.db.mongo import get_mongo_db
+from nmdc_runtime.api.core.idgen import (
+    collection_name,
+    generate_ids,
+    generate_one_id,
+    ID_BLOCK_SIZE,
+    release_reserved_ids,
+)
+from nmdc_runtime.api.db.mongo import (
+    get_mongo_db,
+    get_collection_name_for_id,
+    record_id_routes,
+    forget_id_routes,
+    refresh_id_routes,
+    ID_ROUTES_COLLECTION_NAME,
+)
 from nmdc_runtime.util import (
     all_docs_have_unique_id,
     OverlayDB,
@@ -123,3 +137,54 @@ def test_overlaydb_replace_or_insert_many(test_db):
     with OverlayDB(test_db) as odb:
         odb.replace_or_insert_many(coll.name, [{"id": n} for n in range(20)])
         assert len(list(odb.merge_find(coll.name, {}))) == 20
+
+
+def test_id_routes(test_db):
+    test_db.biosample_set.insert_many(
+        [{"id": f"nmdc:bsm-00-{n:06}"} for n in range(10)]
+    )
+    test_db.study_set.insert_one({"id": "nmdc:sty-00-000001"})
+    routes = test_db[ID_ROUTES_COLLECTION_NAME]
+
+    assert refresh_id_routes(test_db, ["biosample_set"]) == 10
+    assert get_collection_name_for_id(test_db, "nmdc:bsm-00-000003") == "biosample_set"
+
+    # A missing route is discovered by probing, and then recorded.
+    assert routes.find_one({"_id": "nmdc:sty-00-000001"}) is None
+    assert get_collection_name_for_id(test_db, "nmdc:sty-00-000001") == "study_set"
+    assert (
+        routes.find_one({"_id": "nmdc:sty-00-000001"})["collection_name"] == "study_set"
+    )
+
+    # A stale route is repaired on lookup.
+    record_id_routes(test_db, "study_set", ["nmdc:bsm-00-000004"])
+    assert get_collection_name_for_id(test_db, "nmdc:bsm-00-000004") == "biosample_set"
+
+    test_db.biosample_set.delete_one({"id": "nmdc:bsm-00-000005"})
+    forget_id_routes(test_db, ["nmdc:bsm-00-000005"])
+    assert get_collection_name_for_id(test_db, "nmdc:bsm-00-000005") is None
+
+    # A refresh removes the routes of documents deleted without forgetting their routes, but only for the
+    # refreshed collections.
+    test_db.biosample_set.delete_one({"id": "nmdc:bsm-00-000006"})
+    assert refresh_id_routes(test_db, ["biosample_set"]) == 9
+    assert routes.find_one({"_id": "nmdc:bsm-00-000006"}) is None
+    assert routes.find_one({"_id": "nmdc:sty-00-000001"}) is not None
+
+
+def test_generate_ids_and_generate_one_id(test_db):
+    ids = generate_ids(test_db, owner="test", populator="test", number=500)
+    assert len(set(ids)) == 500
+    assert test_db[collection_name("nmdc", "fk4")].count_documents({}) == 500
+
+    id_ = generate_one_id(test_db, ns="test_ns")
+    doc = test_db[collection_name("nmdc", "sys0")].find_one({"where": id_})
+    assert doc["what"].startswith("test_ns/")
+    assert generate_one_id(test_db) != id_
+
+    # The ids reserved but not handed out are released, and those handed out are kept.
+    sys_ids = test_db[collection_name("nmdc", "sys0")]
+    assert sys_ids.count_documents({}) == ID_BLOCK_SIZE
+    assert release_reserved_ids(test_db) == ID_BLOCK_SIZE - 2
+    assert sys_ids.count_documents({}) == 2
+    assert sys_ids.find_one({"where": id_}) is not None
@@ -1,3 +1,4 @@
+import gzip
 import json
 import os
 import re
@@ -5,6 +6,9 @@ import re
 import pytest
 import requests
 from dagster import build_op_context
+from fastapi import HTTPException
+from pymongo import MongoClient
+from pymongo.monitoring import CommandListener
 from starlette import status
 from tenacity import wait_random_exponential, stop_after_attempt, retry
 from toolz import get_in
@@ -12,10 +16,17 @@ from toolz import get_in
 from nmdc_runtime.api.core.auth import get_password_hash
 from nmdc_runtime.api.core.metadata import df_from_sheet_in, _validate_changesheet
 from nmdc_runtime.api.core.util import generate_secret, dotted_path_for
-from nmdc_runtime.api.db.mongo import get_mongo_db
-from nmdc_runtime.api.endpoints.util import persist_content_and_get_drs_object
+from nmdc_runtime.api.db.mongo import ID_ROUTES_COLLECTION_NAME, get_mongo_db
+from nmdc_runtime.api.endpoints.find import find_data_objects_by_biosample_id
+from nmdc_runtime.api.endpoints.util import (
+    find_resources,
+    find_resources_spanning,
+    list_resources,
+    persist_content_and_get_drs_object,
+)
 from nmdc_runtime.api.models.job import Job, JobOperationMetadata
 from nmdc_runtime.api.models.metadata import ChangesheetIn
+from nmdc_runtime.api.models.util import FindRequest, ListRequest
 from nmdc_runtime.api.models.site import SiteInDB, SiteClientInDB
 from nmdc_runtime.api.models.user import UserInDB, UserIn, User
 from nmdc_runtime.site.ops import materialize_alldocs
@@ -434,6 +445,26 @@ def test_get_class_name_and_collection_names_by_doc_id():
     assert response.status_code == 404
 
 
+def test_get_collection_stats_and_metrics():
+    base_url = os.getenv("API_HOST")
+    mdb = get_mongo_db()
+    study = {"id": "nmdc:sty-1-foobar", "type": "nmdc:Study"}
+    mdb.study_set.replace_one(study, study, upsert=True)
+
+    response = requests.request("GET", f"{base_url}/nmdcschema/collection_stats")
+    assert response.status_code == 200
+    stats = {s["ns"].split(".", 1)[1]: s["storageStats"] for s in response.json()}
+    assert stats["study_set"]["count"] >= 1
+
+    response = requests.request(
+        "GET", f"{base_url}/nmdcschema/collection_stats/metrics"
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE nmdc_collection_documents gauge" in response.text
+    assert 'nmdc_collection_documents{collection="study_set"}' in response.text
+
+
 def test_find_data_objects_for_nonexistent_study(api_site_client):
     r"""
     Confirms the endpoint returns an unsuccessful status code when no `Study` having the specified `id` exists.
@@ -633,6 +664,86 @@ def test_find_data_objects_for_study_having_one(api_site_client):
     mdb.get_collection(name="alldocs").delete_many({})
 
 
+def test_find_data_objects_by_biosample_id_issues_constant_number_of_queries():
+    # Seed a scratch database with an `alldocs`-like graph for several biosamples, each of which reaches
+    # a data object via: biosample → extraction → processed sample → data generation ← workflow execution.
+    class FindCommandCounter(CommandListener):
+        count = 0
+
+        def started(self, event):
+            if event.command_name == "find":
+                self.count += 1
+
+        def succeeded(self, event):
+            pass
+
+        def failed(self, event):
+            pass
+
+    counter = FindCommandCounter()
+    client = MongoClient(
+        host=os.getenv("MONGO_HOST"),
+        username=os.getenv("MONGO_USERNAME"),
+        password=os.getenv("MONGO_PASSWORD"),
+        directConnection=True,
+        event_listeners=[counter],
+    )
+    mdb = client["test_find_data_objects_by_biosample_id"]
+    client.drop_database(mdb.name)
+
+    def seed(n_biosamples: int):
+        biosample_ids = [f"nmdc:bsm-11-{i:08d}" for i in range(n_biosamples)]
+        for i, biosample_id in enumerate(biosample_ids):
+            processed_sample_id = f"nmdc:procsm-11-{i:08d}"
+            data_generation_id = f"nmdc:dgns-11-{i:08d}"
+            data_object_id = f"nmdc:dobj-11-{i:08d}"
+            mdb.alldocs.insert_many(
+                [
+                    {
+                        "id": f"nmdc:extrp-11-{i:08d}",
+                        "_type_and_ancestors": ["Extraction", "PlannedProcess"],
+                        "has_input": [biosample_id],
+                        "has_output": [processed_sample_id],
+                    },
+                    {
+                        "id": data_generation_id,
+                        "_type_and_ancestors": [
+                            "NucleotideSequencing",
+                            "DataGeneration",
+                            "PlannedProcess",
+                        ],
+                        "has_input": [processed_sample_id],
+                    },
+                ]
+            )
+            mdb.workflow_execution_set.insert_one(
+                {
+                    "id": f"nmdc:wfmsa-11-{i:08d}.1",
+                    "was_informed_by": data_generation_id,
+                    "has_output": [data_object_id],
+                }
+            )
+            mdb.data_object_set.insert_one({"id": data_object_id})
+        return biosample_ids
+
+    try:
+        n_finds = []
+        for n_biosamples in (1, 10):
+            for collection_name in mdb.list_collection_names():
+                mdb.drop_collection(collection_name)
+            biosample_ids = seed(n_biosamples)
+            counter.count = 0
+            rv = find_data_objects_by_biosample_id(mdb, biosample_ids)
+            n_finds.append(counter.count)
+            assert list(rv) == biosample_ids
+            for i, biosample_id in enumerate(biosample_ids):
+                assert rv[biosample_id] == [{"id": f"nmdc:dobj-11-{i:08d}"}]
+        assert n_finds[0] == n_finds[1]
+    finally:
+        client.drop_database(mdb.name)
+        client.close()
+
+
 def test_find_planned_processes(api_site_client):
     mdb = get_mongo_db()
     database_dict = json.loads(
@@ -842,3 +953,279 @@ def test_run_query_update(api_user_client):
                 ],
             },
         )
+
+
+def test_run_query_update_backs_up_and_applies(api_user_client):
+    mdb = get_mongo_db()
+    allow_spec = {
+        "username": api_user_client.username,
+        "action": "/queries:run(query_cmd:UpdateCommand)",
+    }
+    mdb["_runtime.api.allow"].replace_one(allow_spec, allow_spec, upsert=True)
+    ids = [f"nmdc:bsm-12-updateme{i}" for i in range(3)]
+    term_value = {
+        "has_raw_value": "ENVO_00001998",
+        "term": {"id": "ENVO:00001998", "type": "nmdc:OntologyClass"},
+        "type": "nmdc:ControlledIdentifiedTermValue",
+    }
+    mdb.biosample_set.delete_many({"id": {"$in": ids}})
+    mdb.biosample_set.insert_many(
+        [
+            {
+                "id": id_,
+                "type": "nmdc:Biosample",
+                "associated_studies": ["nmdc:sty-11-r2h77870"],
+                "env_broad_scale": term_value,
+                "env_local_scale": term_value,
+                "env_medium": term_value,
+            }
+            for id_ in ids
+        ]
+    )
+    try:
+        rv = api_user_client.request(
+            "POST",
+            "/queries:run",
+            {
+                "update": "biosample_set",
+                "updates": [
+                    {
+                        "q": {"id": {"$in": ids[:2]}},
+                        "u": {"$set": {"name": "updated"}},
+                        "multi": True,
+                    },
+                    {"q": {"id": ids[2]}, "u": {"$set": {"name": "updated"}}},
+                ],
+            },
+        ).json()
+        assert rv["n"] == 3 and rv["nModified"] == 3
+        assert (
+            mdb.biosample_set.count_documents({"id": {"$in": ids}, "name": "updated"})
+            == 3
+        )
+        backups = mdb.client["nmdc_updated"]["biosample_set"]
+        assert backups.count_documents({"doc.id": {"$in": ids}}) >= 3
+    finally:
+        mdb.biosample_set.delete_many({"id": {"$in": ids}})
+        mdb["_runtime.api.allow"].delete_one(allow_spec)
+
+
+def test_run_query_update_logs_upserted_and_renamed_ids(api_user_client):
+    mdb = get_mongo_db()
+    allow_spec = {
+        "username": api_user_client.username,
+        "action": "/queries:run(query_cmd:UpdateCommand)",
+    }
+    mdb["_runtime.api.allow"].replace_one(allow_spec, allow_spec, upsert=True)
+    old_id, new_id, upserted_id = [
+        f"nmdc:bsm-12-{name}" for name in ("renameme", "renamed", "upserted")
+    ]
+    term_value = {
+        "has_raw_value": "ENVO_00001998",
+        "term": {"id": "ENVO:00001998", "type": "nmdc:OntologyClass"},
+        "type": "nmdc:ControlledIdentifiedTermValue",
+    }
+    required_fields = {
+        "type": "nmdc:Biosample",
+        "associated_studies": ["nmdc:sty-11-r2h77870"],
+        "env_broad_scale": term_value,
+        "env_local_scale": term_value,
+        "env_medium": term_value,
+    }
+    all_ids = [old_id, new_id, upserted_id]
+    mdb.biosample_set.delete_many({"id": {"$in": all_ids}})
+    mdb.biosample_set.insert_one({"id": old_id, **required_fields})
+    try:
+        api_user_client.request(
+            "POST",
+            "/queries:run",
+            {
+                "update": "biosample_set",
+                "updates": [
+                    {"q": {"id": old_id}, "u": {"$set": {"id": new_id}}},
+                    {
+                        "q": {"id": upserted_id},
+                        "u": {"$set": required_fields},
+                        "upsert": True,
+                    },
+                ],
+            },
+        )
+        logged_ids = {
+            d["tgt"]["id"]
+            for d in mdb.txn_log.find({"tgt.id": {"$in": all_ids}, "type": "update"})
+        }
+        assert logged_ids == set(all_ids)
+        routed_ids = {
+            d["_id"]
+            for d in mdb[ID_ROUTES_COLLECTION_NAME].find({"_id": {"$in": all_ids}})
+        }
+        assert routed_ids == {new_id, upserted_id}
+    finally:
+        mdb.biosample_set.delete_many({"id": {"$in": all_ids}})
+        mdb.txn_log.delete_many({"tgt.id": {"$in": all_ids}})
+        mdb[ID_ROUTES_COLLECTION_NAME].delete_many({"_id": {"$in": all_ids}})
+        mdb["_runtime.api.allow"].delete_one(allow_spec)
+
+
+def test_run_query_find_with_next_batches_and_stream(api_user_client):
+    mdb = get_mongo_db()
+    collection_name = "test_run_query_find_with_next_batches"
+    mdb.drop_collection(collection_name)
+    mdb[collection_name].insert_many([{"id": f"x:{i:02d}"} for i in range(10)])
+    try:
+        rv = api_user_client.request(
+            "POST", "/queries:run", {"find": collection_name, "batchSize": 4}
+        ).json()
+        seen_ids = [d["id"] for d in rv["cursor"]["firstBatch"]]
+        cursor_id = rv["cursor"]["id"]
+        while cursor_id:
+            rv = api_user_client.request(
+                "POST", "/queries:next", {"cursor_id": cursor_id, "batchSize": 4}
+            ).json()
+            seen_ids.extend(d["id"] for d in rv["cursor"]["nextBatch"])
+            cursor_id = rv["cursor"]["id"]
+        assert sorted(seen_ids) == [f"x:{i:02d}" for i in range(10)]
+
+        response = api_user_client.request(
+            "POST",
+            "/queries:run?stream=true",
+            {"aggregate": collection_name, "pipeline": [{"$sort": {"id": -1}}]},
+        )
+        assert response.headers["content-type"] == "application/x-ndjson"
+        docs = [json.loads(line) for line in response.text.splitlines()]
+        assert [d["id"] for d in docs] == [f"x:{i:02d}" for i in reversed(range(10))]
+        streamed_query = mdb.queries.find_one(
+            {"cmd.aggregate": collection_name}, sort=[("saved_at", -1)]
+        )
+        assert mdb.query_runs.find_one({"qid": streamed_query["id"]}) is not None
+    finally:
+        mdb.drop_collection(collection_name)
+
+
+def test_find_resources_cursor_pagination():
+    mdb = get_mongo_db()
+    collection_name = "test_find_resources_cursor_pagination"
+    mdb.drop_collection(collection_name)
+    mdb[collection_name].create_index("id", unique=True)
+    # Sort values of mixed types, which MongoDB's comparison operators only compare within a type.
+    mdb[collection_name].insert_many(
+        [
+            {"id": f"nmdc:bsm-11-{i:06d}", "depth": [0, 1, 2.5, "deep", None][i % 5]}
+            for i in range(10)
+        ]
+    )
+    try:
+        for sort in (None, "depth:desc", "depth"):
+            seen_ids, cursor = [], "*"
+            while cursor is not None:
+                rv = find_resources(
+                    FindRequest(cursor=cursor, per_page=4, sort=sort, count="exact"),
+                    mdb,
+                    collection_name,
+                )
+                assert rv["meta"]["count"] == 10
+                seen_ids.extend(d["id"] for d in rv["results"])
+                cursor = rv["meta"]["next_cursor"]
+            assert sorted(seen_ids) == [f"nmdc:bsm-11-{i:06d}" for i in range(10)]
+            assert len(seen_ids) == 10
+
+        # A cursor is only good for the query it was issued for.
+        rv = find_resources(FindRequest(cursor="*", per_page=4), mdb, collection_name)
+        with pytest.raises(HTTPException):
+            find_resources(
+                FindRequest(cursor=rv["meta"]["next_cursor"], filter="depth:1"),
+                mdb,
+                collection_name,
+            )
+    finally:
+        mdb.drop_collection(collection_name)
+
+
+def test_find_resources_spanning_pagination():
+    mdb = get_mongo_db()
+    collection_names = {f"test_find_resources_spanning_{n}" for n in range(3)}
+    for n, collection_name in enumerate(sorted(collection_names)):
+        mdb.drop_collection(collection_name)
+        mdb[collection_name].insert_many(
+            [{"id": f"nmdc:wfmgan-11-{i:06d}", "depth": i % 4} for i in range(n, 30, 3)]
+        )
+    try:
+        for sort in (None, "depth:desc"):
+            expected = sorted(
+                [(i % 4, f"nmdc:wfmgan-11-{i:06d}") for i in range(30)],
+                key=lambda d_id: (-d_id[0] if sort else 0, d_id[1]),
+            )
+            seen_ids, page = [], 1
+            while rv := find_resources_spanning(
+                FindRequest(page=page, per_page=7, sort=sort), mdb, collection_names
+            )["results"]:
+                seen_ids.extend(d["id"] for d in rv)
+                page += 1
+            assert seen_ids == [id_ for _, id_ in expected]
+
+            seen_ids, cursor = [], "*"
+            while cursor is not None:
+                rv = find_resources_spanning(
+                    FindRequest(cursor=cursor, per_page=7, sort=sort),
+                    mdb,
+                    collection_names,
+                )
+                assert rv["meta"]["count"] == 30
+                seen_ids.extend(d["id"] for d in rv["results"])
+                cursor = rv["meta"]["next_cursor"]
+            assert seen_ids == [id_ for _, id_ in expected]
+    finally:
+        for collection_name in collection_names:
+            mdb.drop_collection(collection_name)
+
+
+def test_list_resources_pagination_writes_nothing():
+    mdb = get_mongo_db()
+    collection_name = "test_list_resources_pagination"
+    mdb.drop_collection(collection_name)
+    mdb[collection_name].create_index("id", unique=True)
+    mdb[collection_name].insert_many(
+        [{"id": f"nmdc:bsm-11-{i:06d}"} for i in range(10)]
+    )
+    collection_names_before = set(mdb.list_collection_names())
+    try:
+        seen_ids, page_token = [], None
+        while True:
+            rv = list_resources(
+                ListRequest(max_page_size=4, page_token=page_token),
+                mdb,
+                collection_name,
+            )
+            seen_ids.extend(d["id"] for d in rv["resources"])
+            page_token = rv.get("next_page_token")
+            if page_token is None:
+                break
+        assert seen_ids == [f"nmdc:bsm-11-{i:06d}" for i in range(10)]
+        assert set(mdb.list_collection_names()) == collection_names_before
+    finally:
+        mdb.drop_collection(collection_name)
+
+
+def test_export_collection(api_site_client):
+    mdb = get_mongo_db()
+    collection_name = "study_set"
+    expected_ids = sorted(d["id"] for d in mdb[collection_name].find({}, ["id"]))
+
+    response = api_site_client.request(
+        "GET", f"/nmdcschema/{collection_name}:export", {"format": "ndjson"}
+    )
+    assert response.status_code == 200
+    docs = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(d["id"] for d in docs) == expected_ids
+    assert all("_id" not in d for d in docs)
+
+    response = api_site_client.request(
+        "GET",
+        f"/nmdcschema/{collection_name}:export",
+        {"format": "json.gz", "projection": "name"},
+    )
+    assert response.status_code == 200
+    docs = json.loads(gzip.decompress(response.content))
+    assert sorted(d["id"] for d in docs) == expected_ids
+    assert all(set(d) <= {"id", "name"} for d in docs)
@@ -1,5 +1,6 @@
 import json
 from functools import lru_cache
+from io import StringIO
 from typing import Optional
 
 import fastjsonschema
@@ -148,7 +149,10 @@ def test_update_01():
     )
     results = update_mongo_db(mdb_scratch, update_cmd)
     first_result = results[0]
-    assert first_result["update_info"]["nModified"] == 11
+    assert first_result["update_info"]["statements_applied"] == 11
+    assert first_result["update_info"]["doc_modified"]
+    assert first_result["update_info"]["n"] == 11
+    assert first_result["update_info"]["nModified"] == 1
     assert first_result["doc_after"]["principal_investigator"] == pi_info
     assert first_result["doc_after"]["name"] == "NEW STUDY NAME 2"
     assert first_result["doc_after"]["ecosystem"] == "NEW ECOSYSTEM 2"
@@ -257,6 +261,33 @@ def test_update_biosample_ph():
     )
 
 
+def test_load_changesheet_spanning_collections():
+    mdb = get_mongo_db()
+    for collection_name, local_id in [
+        ("study_set", "sty-11-pzmd0x14"),
+        ("biosample_set", "bsm-11-5nhz3402"),
+    ]:
+        doc = json.loads(
+            (REPO_ROOT_DIR / "tests" / "files" / f"nmdc_{local_id}.json").read_text()
+        )
+        mdb[collection_name].replace_one({"id": doc["id"]}, doc, upsert=True)
+    sheet_text = "\n".join(
+        [
+            "id\taction\tattribute\tvalue",
+            "nmdc:sty-11-pzmd0x14\tupdate\tname\tNEW STUDY NAME",
+            "nmdc:bsm-11-5nhz3402\tupdate\tph\t5.58",
+        ]
+    )
+    df = load_changesheet(StringIO(sheet_text), mdb)
+
+    # each row is resolved against the collection and class of its own `id`
+    assert df["collection_name"].tolist() == ["study_set", "biosample_set"]
+    assert df["linkml_class"].tolist() == ["Study", "Biosample"]
+    update_cmd = mongo_update_command_for(df)
+    assert update_cmd["nmdc:sty-11-pzmd0x14"]["update"] == "study_set"
+    assert update_cmd["nmdc:bsm-11-5nhz3402"]["update"] == "biosample_set"
+
+
 def test_ensure_data_object_type():
     docs_test = {
         "data_object_set": [
@@ -278,3 +309,49 @@ def test_ensure_data_object_type():
     nmdc_jsonschema_validator = fastjsonschema.compile(nmdc_jsonschema)
 
     _ = nmdc_jsonschema_validator(docs)  # raises JsonSchemaValueException if wrong
+
+
+def test_update_mongo_db_in_batches_skips_rest_of_failed_document():
+    mdb = get_mongo_db()
+    mdb_scratch = mdb.client["nmdc_runtime_test"]
+    mdb.client.drop_database(mdb_scratch.name)
+    for local_id in ["bsm-11-0pyv7738", "bsm-11-5nhz3402"]:
+        doc = json.loads(
+            (REPO_ROOT_DIR / "tests" / "files" / f"nmdc_{local_id}.json").read_text()
+        )
+        mdb_scratch.biosample_set.insert_one(doc)
+    update_cmd = {
+        "nmdc:bsm-11-0pyv7738": {
+            "update": "biosample_set",
+            "updates": [
+                {"q": {"id": "nmdc:bsm-11-0pyv7738"}, "u": {"$set": {"ph": 6.0}}},
+                {"q": {"id": "nmdc:bsm-11-0pyv7738"}, "u": {"$set": {"_id": 1}}},
+                {"q": {"id": "nmdc:bsm-11-0pyv7738"}, "u": {"$set": {"ph": 7.0}}},
+            ],
+        },
+        "nmdc:bsm-11-5nhz3402": {
+            "update": "biosample_set",
+            "updates": [
+                {"q": {"id": "nmdc:bsm-11-5nhz3402"}, "u": {"$set": {"ph": 8.0}}}
+            ],
+        },
+    }
+    results = update_mongo_db(mdb_scratch, update_cmd, batch_size=2)
+    mdb.client.drop_database(mdb_scratch.name)
+
+    assert [r["id"] for r in results] == list(update_cmd)
+    failed, updated = results
+    assert failed["doc_after"]["ph"] == 6.0
+    assert failed["update_info"]["statements_applied"] == 1
+    assert failed["update_info"]["writeErrors"][0]["index"] == 1
+    assert failed["update_info"]["n"] == 1
+    assert updated["doc_before"].get("ph") != 8.0
+    assert updated["doc_after"]["ph"] == 8.0
+    assert updated["update_info"] == {
+        "statements_applied": 1,
+        "doc_modified": True,
+        "n": 1,
+        "nModified": 1,
+        "ok": 1.0,
+    }
+    assert "_id" not in updated["doc_after"]
@@ -5,6 +5,7 @@ import random
 import yaml
 from linkml_runtime.dumpers import json_dumper
 
+from nmdc_runtime.site.translation import submission_portal_translator
 from nmdc_runtime.site.translation.submission_portal_translator import (
     SubmissionPortalTranslator,
 )
@@ -272,6 +273,69 @@ def test_get_from():
     assert translator._get_from(metadata, ["one", "some_empty"]) == ["one", "three"]
 
 
+def test_transform_dict_for_class():
+    translator = SubmissionPortalTranslator()
+
+    transformed = translator._transform_dict_for_class(
+        {
+            "samp_name": "  sample 1  ",
+            "depth": "0 - 10 cm",
+            "alternative_identifiers": "gold:Gb0000001 | gold:Gb0000002",
+            "not_a_biosample_slot": "value",
+        },
+        "Biosample",
+    )
+    assert transformed["samp_name"] == "sample 1"
+    assert transformed["depth"].has_minimum_numeric_value == 0
+    assert transformed["depth"].has_maximum_numeric_value == 10
+    assert transformed["depth"].has_unit == "cm"
+    assert transformed["alternative_identifiers"] == [
+        "gold:Gb0000001",
+        "gold:Gb0000002",
+    ]
+    assert "not_a_biosample_slot" not in transformed
+
+    # the transform plan is reused, and slot mappings can rename columns and supply units
+    transformed = translator._transform_dict_for_class(
+        {"sampling_depth": "5"},
+        "Biosample",
+        {"sampling_depth": {"object_id": "nmdc:depth", "subject_unit": "m"}},
+    )
+    assert transformed["depth"].has_numeric_value == 5
+    assert transformed["depth"].has_unit == "m"
+
+    # the transform plan is shared by translator instances
+    assert SubmissionPortalTranslator()._get_slot_transform(
+        "Biosample", "depth"
+    ) is translator._get_slot_transform("Biosample", "depth")
+
+
+def test_transform_plan_looks_up_each_slot_once(monkeypatch):
+    translator = SubmissionPortalTranslator()
+    looked_up = []
+    get_slot_multivalued_and_range = (
+        submission_portal_translator._get_slot_multivalued_and_range
+    )
+
+    def spy(schema_view, class_name, slot_name):
+        looked_up.append(slot_name)
+        return get_slot_multivalued_and_range(schema_view, class_name, slot_name)
+
+    monkeypatch.setattr(
+        submission_portal_translator, "_get_slot_multivalued_and_range", spy
+    )
+    submission_portal_translator._get_transform_plan.cache_clear()
+
+    rows = [
+        {"samp_name": f"sample {i}", "depth": "0 - 10 cm", "ph": "7", "not_a_slot": ""}
+        for i in range(100)
+    ]
+    for row in rows:
+        translator._transform_dict_for_class(row, "Biosample")
+    # Once the class's plan knows a slot, transforming that slot's values in later rows is a dict lookup.
+    assert sorted(looked_up) == ["depth", "ph", "samp_name"]
+
+
 def test_get_dataset(test_minter, monkeypatch):
     # OmicsProcess objects have an add_date and a mod_date slot that are populated with the
     # current date. In order to compare with a static expected output we need to patch
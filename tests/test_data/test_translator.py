@@ -23,3 +23,21 @@ def test_ensure_curie():
         TestTranslator._ensure_curie("gold:Gb0123456", default_prefix="nmdc")
         == "gold:Gb0123456"
     )
+
+
+def test_id_pool_mints_reserved_ids_in_bulk(test_minter):
+    calls = []
+
+    def id_minter(schema_class, how_many=1):
+        calls.append((schema_class, how_many))
+        return test_minter(schema_class, how_many)
+
+    translator = TestTranslator(id_minter=id_minter)
+    translator._id_minter.reserve("nmdc:DataObject", 3)
+    data_object_ids = [translator._id_minter("nmdc:DataObject", 1)[0] for _ in range(3)]
+    assert len(set(data_object_ids)) == 3
+    assert calls == [("nmdc:DataObject", 3)]
+
+    # ids beyond those reserved are minted on demand
+    assert len(translator._id_minter("nmdc:DataObject", 2)) == 2
+    assert calls == [("nmdc:DataObject", 3), ("nmdc:DataObject", 2)]
@@ -1,13 +1,21 @@
+import json
 import os
+from datetime import timedelta
+from pathlib import Path
 
 import pytest
 from toolz import assoc, dissoc
 
 from dagster import build_op_context
 
+from nmdc_runtime.api.db.mongo import get_txn_log_checkpoint, log_txns
 from nmdc_runtime.site.resources import mongo_resource
 from nmdc_runtime.site.ops import (
+    ALLDOCS_TXN_LOG_CONSUMER,
+    alldocs_doc_for,
+    get_alldocs_projection,
     materialize_alldocs,
+    materialize_alldocs_incrementally,
 )
 from nmdc_runtime.util import populated_schema_collection_names_with_id_field
 
@@ -130,3 +138,81 @@ def test_materialize_alldocs(op_context):
     for document in field_research_site_documents:
         field_research_site_set_collection.delete_one(document)
     alldocs_collection.delete_many({})
+
+
+def test_materialize_alldocs_incrementally(op_context):
+    mdb = op_context.resources.mongo.db
+    field_research_site_set_collection = mdb.get_collection("field_research_site_set")
+    documents = [
+        {"id": "frsite-99-00000004", "type": "nmdc:FieldResearchSite", "name": "D"},
+        {"id": "frsite-99-00000005", "type": "nmdc:FieldResearchSite", "name": "E"},
+    ]
+    field_research_site_set_collection.insert_one(documents[0])
+    materialize_alldocs(op_context)  # full rebuild, which sets the checkpoint
+    alldocs_collection = mdb.get_collection("alldocs")
+    assert alldocs_collection.count_documents({"id": documents[0]["id"]}) == 1
+
+    # Delete one document and insert another, logging both transactions.
+    field_research_site_set_collection.delete_one({"id": documents[0]["id"]})
+    log_txns(mdb, "field_research_site_set", [documents[0]["id"]], "delete")
+    field_research_site_set_collection.insert_one(documents[1])
+    log_txns(mdb, "field_research_site_set", [documents[1]["id"]], "upsert")
+
+    assert materialize_alldocs_incrementally(op_context) == 2
+    assert alldocs_collection.count_documents({"id": documents[0]["id"]}) == 0
+    assert (
+        alldocs_collection.count_documents(
+            {"id": documents[1]["id"], "_type_and_ancestors": "Site"}
+        )
+        == 1
+    )
+
+    # Re-applying the transactions within the overlap window before the checkpoint leaves `alldocs` as it was.
+    materialize_alldocs_incrementally(op_context)
+    assert alldocs_collection.count_documents({"id": documents[0]["id"]}) == 0
+    assert alldocs_collection.count_documents({"id": documents[1]["id"]}) == 1
+
+    # A transaction that became visible only after its timestamp was read past (e.g. due to clock skew) is applied.
+    field_research_site_set_collection.insert_one(documents[0])
+    checkpoint = get_txn_log_checkpoint(mdb, ALLDOCS_TXN_LOG_CONSUMER)
+    mdb.txn_log.insert_one(
+        {
+            "tgt": {"id": documents[0]["id"], "c": "field_research_site_set"},
+            "type": "upsert",
+            "ts": checkpoint - timedelta(seconds=1),
+        }
+    )
+    materialize_alldocs_incrementally(op_context)
+    assert alldocs_collection.count_documents({"id": documents[0]["id"]}) == 1
+
+    # Clean up: Delete the documents we created within this test, from the database.
+    field_research_site_set_collection.delete_many(
+        {"id": {"$in": [d["id"] for d in documents]}}
+    )
+    alldocs_collection.delete_many({})
+
+
+def test_alldocs_doc_for_skips_documents_without_a_known_type():
+    doc = {"id": "frsite-99-00000006", "type": "nmdc:FieldResearchSite", "name": "F"}
+    assert alldocs_doc_for(doc)["_type_and_ancestors"][0] == "FieldResearchSite"
+    assert alldocs_doc_for(dissoc(doc, "type")) is None
+    assert alldocs_doc_for(assoc(doc, "type", "nmdc:NotAClass")) is None
+
+
+@pytest.mark.parametrize(
+    "collection_name, filename",
+    [
+        ("biosample_set", "nmdc_bsm-11-0pyv7738.json"),
+        ("data_object_set", "nmdc_dobj-11-000n1286.json"),
+        ("study_set", "nmdc_sty-11-pzmd0x14.json"),
+    ],
+)
+def test_alldocs_projection_fetches_only_what_alldocs_docs_need(
+    collection_name, filename
+):
+    doc = json.loads((Path(__file__).parent.parent / "files" / filename).read_text())
+    projection = get_alldocs_projection(collection_name)
+    projected_doc = {k: v for k, v in doc.items() if projection.get(k)}
+    assert alldocs_doc_for(projected_doc) == alldocs_doc_for(doc)
+    # Most fields of a document are not needed for `alldocs`, so they are not transferred from the database.
+    assert len(json.dumps(projected_doc)) < len(json.dumps(doc)) / 4
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from dagster import build_op_context
+
+from nmdc_runtime.site.ops import neon_data_by_product
+from nmdc_runtime.site.resources import NeonApiClient
+
+CSV_FILES = {
+    "/files/mms_rawDataFiles.SITE1.2019-01.expanded.csv": "id,value\n1,a\n2,b\n",
+    "/files/mms_rawDataFiles.SITE1.2019-02.expanded.csv": "id,value\n3,c\n",
+    "/files/mms_rawDataFiles.SITE2.2019-01.expanded.csv": "id,value\n4,d\n",
+    "/files/mms_rawDataFiles.SITE2.2019-01.basic.csv": "id,value\n5,e\n",
+}
+
+
+@pytest.fixture
+def neon_server():
+    requested_paths = []
+    contents = dict(CSV_FILES)
+    listed_md5s = (
+        {}
+    )  # overrides the checksums listed for files, e.g. to simulate corrupted downloads
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            base_url = f"http://localhost:{self.server.server_port}"
+            path = self.path.split("?", 1)[0]
+            requested_paths.append(path)
+            if path == "/api/v0/products/DP1.TEST.001":
+                body = {
+                    "data": {
+                        "siteCodes": [
+                            {
+                                "availableDataUrls": [
+                                    f"{base_url}/api/v0/data/SITE1/2019-01",
+                                    f"{base_url}/api/v0/data/SITE1/2019-02",
+                                ]
+                            },
+                            {
+                                "availableDataUrls": [
+                                    f"{base_url}/api/v0/data/SITE2/2019-01"
+                                ]
+                            },
+                        ]
+                    }
+                }
+            elif path.startswith("/api/v0/data/"):
+                site, month = path.split("/")[-2:]
+                body = {
+                    "data": {
+                        "files": [
+                            {
+                                "name": p.rsplit("/", 1)[-1],
+                                "md5": (
+                                    listed_md5s[p]
+                                    if p in listed_md5s
+                                    else hashlib.md5(contents[p].encode()).hexdigest()
+                                ),
+                                "url": f"{base_url}{p}?signature={len(requested_paths)}",
+                            }
+                            for p in contents
+                            if f"{site}.{month}" in p
+                        ]
+                    }
+                }
+            elif path in contents:
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(contents[path].encode())
+                return
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("localhost", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.requested_paths = requested_paths
+    server.contents = contents
+    server.listed_md5s = listed_md5s
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def neon_api_client(server, tmp_path, **kwargs):
+    # A plain (uncached) session, so that every listing is fetched from the fixture server.
+    return NeonApiClient(
+        base_url=f"http://localhost:{server.server_port}/api/v0",
+        api_token="token",
+        cache_dir=str(tmp_path / "files"),
+        session=requests.Session(),
+        **kwargs,
+    )
+
+
+def csv_requests(server):
+    return [p for p in server.requested_paths if p.startswith("/files/")]
+
+
+def test_neon_data_by_product_concatenates_and_caches_files(neon_server, tmp_path):
+    client = neon_api_client(neon_server, tmp_path)
+    context = build_op_context(resources={"neon_api_client": client})
+    data_product = {"product_id": "DP1.TEST.001", "product_tables": "mms_rawDataFiles"}
+
+    df = neon_data_by_product(context, data_product)["mms_rawDataFiles"]
+    assert df["id"].tolist() == [1, 2, 3, 4]
+    assert df.index.tolist() == [0, 1, 2, 3]
+    assert len(csv_requests(neon_server)) == 3
+
+    # Cached files are not downloaded again, even though their (signed) URLs differ.
+    neon_data_by_product(context, data_product)
+    assert len(csv_requests(neon_server)) == 3
+
+    # A file whose content (and thus checksum) changed is downloaded again.
+    neon_server.contents[
+        "/files/mms_rawDataFiles.SITE2.2019-01.expanded.csv"
+    ] += "6,f\n"
+    df = neon_data_by_product(context, data_product)["mms_rawDataFiles"]
+    assert df["id"].tolist() == [1, 2, 3, 4, 6]
+    assert len(csv_requests(neon_server)) == 4
+
+
+def test_neon_data_by_product_does_not_cache_corrupted_files(neon_server, tmp_path):
+    client = neon_api_client(neon_server, tmp_path)
+    context = build_op_context(resources={"neon_api_client": client})
+    data_product = {"product_id": "DP1.TEST.001", "product_tables": "mms_rawDataFiles"}
+    corrupted_path = "/files/mms_rawDataFiles.SITE1.2019-02.expanded.csv"
+    neon_server.listed_md5s[corrupted_path] = hashlib.md5(b"other").hexdigest()
+
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        neon_data_by_product(context, data_product)
+    cached_files = list((tmp_path / "files").iterdir())
+    assert len(cached_files) == 2
+    assert not any(p.suffix == ".part" for p in cached_files)
+
+
+def test_neon_data_by_product_does_not_cache_unverifiable_files(neon_server, tmp_path):
+    client = neon_api_client(neon_server, tmp_path)
+    context = build_op_context(resources={"neon_api_client": client})
+    data_product = {"product_id": "DP1.TEST.001", "product_tables": "mms_rawDataFiles"}
+    neon_server.listed_md5s["/files/mms_rawDataFiles.SITE1.2019-02.expanded.csv"] = None
+
+    df = neon_data_by_product(context, data_product)["mms_rawDataFiles"]
+    assert df["id"].tolist() == [1, 2, 3, 4]
+    assert len(list((tmp_path / "files").iterdir())) == 2
+
+    neon_data_by_product(context, data_product)
+    assert len(csv_requests(neon_server)) == 4
+
+
+def test_neon_file_cache_evicts_least_recently_used_files(neon_server, tmp_path):
+    client = neon_api_client(neon_server, tmp_path)
+    client.fetch_product_tables("DP1.TEST.001", ["mms_rawDataFiles"])
+    cached_files = sorted((tmp_path / "files").iterdir())
+    assert len(cached_files) == 3
+    for last_used, path in enumerate(cached_files):
+        os.utime(path, (last_used, last_used))
+
+    client.cache_max_bytes = sum(p.stat().st_size for p in cached_files[1:])
+    assert client.evict_cached_files() == 1
+    assert sorted((tmp_path / "files").iterdir()) == sorted(cached_files[1:])
+
+
+def test_neon_data_by_product_persists_tables_as_parquet(neon_server, tmp_path):
+    pytest.importorskip("pyarrow")
+    client = neon_api_client(
+        neon_server, tmp_path, parquet_dir=str(tmp_path / "tables")
+    )
+    tables = client.fetch_product_tables("DP1.TEST.001", ["mms_rawDataFiles"])
+    assert len(list((tmp_path / "tables" / "DP1.TEST.001").iterdir())) == 1
+
+    (tmp_path / "files").rename(tmp_path / "files-removed")
+    tables_again = client.fetch_product_tables("DP1.TEST.001", ["mms_rawDataFiles"])
+    assert tables_again["mms_rawDataFiles"].equals(tables["mms_rawDataFiles"])
+    assert not (tmp_path / "files").exists()
@@ -1,7 +1,11 @@
 import pytest
 
 from nmdc_runtime.api.db.mongo import get_mongo_db
-from nmdc_runtime.util import validate_json
+from nmdc_runtime.util import (
+    get_nmdc_jsonschema_collection_validator,
+    get_nmdc_jsonschema_dict,
+    validate_json,
+)
 
 # Tip: At the time of this writing, you can run the tests in this file without running other tests in this repo,
 #      by issuing the following command from the root directory of the repository within the `fastapi` container:
@@ -215,3 +219,102 @@ def test_validate_json_considers_existing_documents_when_checking_references(db)
     assert validate_json(in_docs=database_dict, mdb=db, **check_refs) == ok_result
 
     db.get_collection("study_set").delete_one({"id": existing_study_id})
+
+
+def test_validate_json_does_not_modify_documents(db):
+    study = {
+        "id": "nmdc:sty-00-000001",
+        "type": "nmdc:Study",
+        "study_category": "research_study",
+    }
+    database_dict = {"study_set": [study]}
+    assert validate_json(in_docs=database_dict, mdb=db) == ok_result
+    assert (
+        validate_json(in_docs=database_dict, mdb=db, instantiate_dataclasses=False)
+        == ok_result
+    )
+    assert "_id" not in study
+
+
+def test_validate_json_reports_each_schema_violation(db):
+    database_dict = {
+        "study_set": [
+            {
+                "id": "nmdc:sty-00-000001",
+                "type": "nmdc:Study",
+            },  # missing `study_category`
+            {
+                "id": "nmdc:sty-00-000002",
+                "type": "nmdc:Study",
+                "study_category": "research_study",
+                "not_a_slot": "foo",
+            },
+        ]
+    }
+    result = validate_json(in_docs=database_dict, mdb=db)
+    assert result["result"] == "errors"
+    assert len(result["detail"]["study_set"]) == 2
+
+
+def test_validate_json_returns_invalid_when_payload_has_duplicate_ids(db):
+    study = {
+        "id": "nmdc:sty-00-000001",
+        "type": "nmdc:Study",
+        "study_category": "research_study",
+    }
+    result = validate_json(in_docs={"study_set": [study, dict(study)]}, mdb=db)
+    assert result["result"] == "errors"
+    assert len(result["detail"]["study_set"]) == 1
+
+
+def test_validate_json_reports_each_unresolved_reference(db):
+    missing_study_id = "nmdc:sty-00-000099"
+    assert db.get_collection("study_set").find_one({"id": missing_study_id}) is None
+    database_dict = {
+        "study_set": [
+            {
+                "id": "nmdc:sty-00-000001",
+                "type": "nmdc:Study",
+                "study_category": "research_study",
+            },
+            {
+                "id": "nmdc:sty-00-000002",
+                "type": "nmdc:Study",
+                "study_category": "research_study",
+                "part_of": ["nmdc:sty-00-000001", missing_study_id],
+            },
+            {
+                "id": "nmdc:sty-00-000003",
+                "type": "nmdc:Study",
+                "study_category": "research_study",
+                "part_of": [missing_study_id],
+            },
+        ]
+    }
+    result = validate_json(in_docs=database_dict, mdb=db, **check_refs)
+    assert result["result"] == "errors"
+    assert len(result["detail"]["study_set"]) == 2
+
+
+def test_collection_validator_leaves_shared_schema_refs_relative():
+    validate = get_nmdc_jsonschema_collection_validator("study_set")
+    validate(
+        [
+            {
+                "id": "nmdc:sty-00-000001",
+                "type": "nmdc:Study",
+                "study_category": "research_study",
+            }
+        ]
+    )
+
+    # Compiling must not rewrite the `$ref`s of the cached schema, which other validators are built from.
+    study_spec = get_nmdc_jsonschema_dict()["properties"]["study_set"]
+    assert study_spec["items"]["$ref"] == "#/$defs/Study"
+
+
+def test_collection_validator_is_compiled_once_per_collection():
+    # Compiling takes most of a second, so `validate_json` must reuse each collection's validator across calls.
+    validate = get_nmdc_jsonschema_collection_validator("biosample_set")
+    assert get_nmdc_jsonschema_collection_validator("biosample_set") is validate
+    assert get_nmdc_jsonschema_collection_validator("study_set") is not validate
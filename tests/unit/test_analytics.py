@@ -0,0 +1,67 @@
+import asyncio
+
+from nmdc_runtime.api.analytics import Analytics
+
+
+class InMemoryAnalytics(Analytics):
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        self.batches = []
+
+    def insert_many(self, batch):
+        self.batches.append(batch)
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request"}
+
+
+async def send(message):
+    pass
+
+
+scope = {
+    "type": "http",
+    "method": "GET",
+    "path": "/version",
+    "headers": [(b"host", b"api.example.org:8000")],
+    "client": ("127.0.0.1", 1234),
+}
+
+
+def test_analytics_writes_batches_and_drops_events_beyond_queue_bound():
+    async def run():
+        analytics = InMemoryAnalytics(
+            app, max_queued=10, batch_size=4, flush_interval_s=60
+        )
+        for _ in range(12):
+            await analytics(scope, receive, send)
+        assert analytics.n_dropped == 2
+        await asyncio.sleep(0.1)  # let the writer write the full batches
+        await analytics.aclose()
+        return analytics
+
+    analytics = asyncio.run(run())
+    assert [len(b) for b in analytics.batches] == [4, 4, 2]
+    event = analytics.batches[0][0]
+    assert event["path"] == "/version"
+    assert event["status"] == 204
+    assert event["hostname"] == "api.example.org"
+    assert event["ip_address"] == "127.0.0.1"
+
+
+def test_analytics_writes_partial_batch_after_flush_interval():
+    async def run():
+        analytics = InMemoryAnalytics(app, batch_size=100, flush_interval_s=0.05)
+        await analytics(scope, receive, send)
+        await asyncio.sleep(0.2)
+        batches = list(analytics.batches)
+        await analytics.aclose()
+        return batches
+
+    assert [len(b) for b in asyncio.run(run())] == [1]
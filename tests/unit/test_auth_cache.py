@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+
+from nmdc_runtime.api.core import util as core_util
+from nmdc_runtime.api.core.auth import (
+    INVALIDATED_TOKEN_CHECK_TTL_S,
+    PRINCIPAL_CACHE_TTL_S,
+    cache_principal,
+    create_access_token,
+    forget_cached_principals,
+    get_cached_principal,
+    is_token_invalidated,
+)
+from nmdc_runtime.api.models.user import get_current_user
+
+
+class FakeInvalidatedTokens:
+    def __init__(self, token_ids):
+        self.token_ids = set(token_ids)
+        self.n_lookups = 0
+
+    def find_one(self, filter_, projection=None):
+        self.n_lookups += 1
+        return filter_ if filter_["_id"] in self.token_ids else None
+
+
+class FakeUsers:
+    def __init__(self):
+        self.n_lookups = 0
+
+    def find_one(self, filter_, projection=None):
+        self.n_lookups += 1
+        return {"username": filter_["username"], "hashed_password": "hash"}
+
+
+class FakeDatabase:
+    def __init__(self, invalidated_token_ids):
+        self.invalidated_tokens = FakeInvalidatedTokens(invalidated_token_ids)
+        self.users = FakeUsers()
+
+
+def test_cached_principal_is_not_returned_after_token_expires():
+    now = datetime.now(timezone.utc).timestamp()
+    cache_principal("user", "token-1", "alice", now + 60)
+    cache_principal("user", "token-2", "bob", now - 1)
+    assert get_cached_principal("user", "token-1") == "alice"
+    assert get_cached_principal("site", "token-1") is None
+    assert get_cached_principal("user", "token-2") is None
+
+    forget_cached_principals()
+    assert get_cached_principal("user", "token-1") is None
+
+
+def test_cached_principal_is_dropped_within_the_invalidation_window(monkeypatch):
+    # Other processes do not see `forget_cached_principals`, so a cached principal must not outlive the window
+    # in which an invalidated token is still accepted.
+    assert PRINCIPAL_CACHE_TTL_S <= INVALIDATED_TOKEN_CHECK_TTL_S
+    now = datetime.now(timezone.utc).timestamp()
+    cache_principal("user", "token-3", "carol", now + 3600)
+    later = monotonic() + PRINCIPAL_CACHE_TTL_S
+    monkeypatch.setattr(core_util, "monotonic", lambda: later)
+    assert get_cached_principal("user", "token-3") is None
+
+
+def test_token_invalidation_is_looked_up_per_token_and_reused_briefly():
+    mdb = FakeDatabase(["revoked-token"])
+    assert is_token_invalidated(mdb, "revoked-token")
+    assert not is_token_invalidated(mdb, "valid-token")
+    assert not is_token_invalidated(mdb, "valid-token")
+    assert mdb.invalidated_tokens.n_lookups == 2
+
+
+def test_burst_of_requests_bearing_one_token_makes_one_lookup_of_each_kind():
+    forget_cached_principals()
+    mdb = FakeDatabase([])
+    token = create_access_token({"sub": "user:dave"}, timedelta(minutes=30))
+    for _ in range(100):
+        assert get_current_user(token, None, mdb).username == "dave"
+    assert mdb.invalidated_tokens.n_lookups == 1
+    assert mdb.users.n_lookups == 1
@@ -0,0 +1,33 @@
+import inspect
+
+import pytest
+
+from nmdc_runtime.api.endpoints.metadata import (
+    get_stored_metadata_object,
+    submit_changesheet,
+    submit_json_nmdcdb,
+    validate_changesheet,
+    validate_json_nmdcdb,
+)
+from nmdc_runtime.api.endpoints.workflows import post_workflow_execution
+from nmdc_runtime.api.models.site import get_current_client_site
+from nmdc_runtime.api.models.user import get_current_user
+
+
+@pytest.mark.parametrize(
+    "handler",
+    [
+        get_current_client_site,
+        get_current_user,
+        get_stored_metadata_object,
+        post_workflow_execution,
+        submit_changesheet,
+        submit_json_nmdcdb,
+        validate_changesheet,
+        validate_json_nmdcdb,
+    ],
+)
+def test_handler_doing_blocking_work_runs_in_worker_thread(handler):
+    # FastAPI runs `def` (but not `async def`) handlers and dependencies in its worker thread pool. These ones make
+    # synchronous pymongo calls or validate payloads, which would otherwise stall every request on the event loop.
+    assert not inspect.iscoroutinefunction(handler)
@@ -0,0 +1,59 @@
+from io import StringIO
+
+from nmdc_runtime.api.core.metadata import load_changesheet, mongo_update_command_for
+from nmdc_runtime.api.db.mongo import ID_ROUTES_COLLECTION_NAME
+
+
+class FakeCollection:
+    r"""Serves `$in` queries on one field, counting them."""
+
+    def __init__(self, db, field, docs):
+        self.db = db
+        self.field = field
+        self.docs = docs
+
+    def find(self, filter_, projection=None):
+        self.db.n_queries += 1
+        wanted = set(filter_[self.field]["$in"])
+        return [dict(d) for d in self.docs if d[self.field] in wanted]
+
+
+class FakeDatabase:
+    def __init__(self, biosample_ids):
+        self.n_queries = 0
+        self.collections = {
+            ID_ROUTES_COLLECTION_NAME: FakeCollection(
+                self,
+                "_id",
+                [{"_id": i, "collection_name": "biosample_set"} for i in biosample_ids],
+            ),
+            "biosample_set": FakeCollection(
+                self,
+                "id",
+                [{"id": i, "type": "nmdc:Biosample"} for i in biosample_ids],
+            ),
+        }
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+
+def changesheet_for(biosample_ids) -> str:
+    rows = ["id\taction\tattribute\tvalue"]
+    for biosample_id in biosample_ids:
+        rows += [
+            f"{biosample_id}\tupdate\tph\t5.5",
+            "\tupdate\tdepth.has_raw_value\t1 m",
+            "\tinsert items\talternative_identifiers\tx:1",
+        ]
+    return "\n".join(rows)
+
+
+def test_changesheet_ids_are_resolved_in_a_constant_number_of_queries():
+    for n_ids in (1, 100):
+        biosample_ids = [f"nmdc:bsm-11-{i:06d}" for i in range(n_ids)]
+        mdb = FakeDatabase(biosample_ids)
+        df = load_changesheet(StringIO(changesheet_for(biosample_ids)), mdb)
+        assert len(mongo_update_command_for(df)) == n_ids
+        # The routes, one confirming query per routed collection, and one query for the documents' `type`s.
+        assert mdb.n_queries == 3
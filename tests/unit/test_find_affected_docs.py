@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+from pymongo import DeleteMany
+
+from nmdc_runtime.api.endpoints import queries
+from nmdc_runtime.api.endpoints.queries import (
+    _backup_and_bulk_write,
+    _find_affected_docs,
+)
+
+
+class FakeCollection:
+    r"""Records the filters it is queried with, and matches documents on their `id` (via `id` or `$or` filters)."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def _matches(self, doc, filter_):
+        if "$or" in filter_:
+            return any(self._matches(doc, f) for f in filter_["$or"])
+        return filter_.get("id", doc["id"]) == doc["id"]
+
+    def find(self, filter_, session=None):
+        self.queries.append((filter_, session))
+        return [d for d in self.docs if self._matches(d, filter_)]
+
+    def find_one(self, filter_, session=None):
+        return next(iter(self.find(filter_, session=session)), None)
+
+    def insert_many(self, docs, session=None):
+        self.queries.append(("insert_many", len(docs)))
+
+    def bulk_write(self, requests, session=None, comment=None):
+        self.queries.append(("bulk_write", len(requests)))
+        return SimpleNamespace(upserted_ids={})
+
+
+class FakeDatabase:
+    def __init__(self, collection, client):
+        self.collection = collection
+        self.client = client
+
+    def __getitem__(self, name):
+        return self.collection
+
+
+DOCS = [{"_id": i, "id": f"nmdc:bsm-11-{i}"} for i in range(3)]
+
+
+def test_find_affected_docs_merges_plain_filters_into_one_query():
+    collection = FakeCollection(DOCS)
+    docs = _find_affected_docs(
+        collection,
+        [
+            {"filter": {"id": "nmdc:bsm-11-0"}, "limit": 0},
+            {"filter": {"id": "nmdc:bsm-11-1"}, "limit": 0},
+            {"filter": {"id": "nmdc:bsm-11-1"}, "limit": 1},
+        ],
+        session="session",
+    )
+    assert [d["_id"] for d in docs] == [0, 1]
+    assert collection.queries[0] == (
+        {"$or": [{"id": "nmdc:bsm-11-0"}, {"id": "nmdc:bsm-11-1"}]},
+        "session",
+    )
+    assert len(collection.queries) == 2
+
+
+def test_find_affected_docs_queries_filters_with_top_level_operators_on_their_own():
+    collection = FakeCollection(DOCS)
+    text_filter = {"$text": {"$search": "soil"}, "id": "nmdc:bsm-11-2"}
+    expr_filter = {"$expr": {"$eq": ["$id", "nmdc:bsm-11-1"]}, "id": "nmdc:bsm-11-1"}
+    docs = _find_affected_docs(
+        collection,
+        [
+            {"filter": {"id": "nmdc:bsm-11-0"}, "limit": 0},
+            {"filter": text_filter, "limit": 0},
+            {"filter": expr_filter, "limit": 0},
+        ],
+    )
+    assert sorted(d["_id"] for d in docs) == [0, 1, 2]
+    assert [f for f, _ in collection.queries] == [
+        {"id": "nmdc:bsm-11-0"},
+        text_filter,
+        expr_filter,
+    ]
+
+
+def test_backup_and_bulk_write_costs_three_commands_for_many_statements(monkeypatch):
+    monkeypatch.setattr(queries, "supports_transactions", lambda mdb: False)
+    docs = [{"_id": i, "id": f"nmdc:bsm-11-{i}"} for i in range(200)]
+    collection, backup_collection = FakeCollection(docs), FakeCollection([])
+    mdb = FakeDatabase(
+        collection, {"nmdc_deleted": {"biosample_set": backup_collection}}
+    )
+    specs = [{"filter": {"id": d["id"]}, "limit": 0} for d in docs]
+    affected_docs, _, _ = _backup_and_bulk_write(
+        mdb,
+        "biosample_set",
+        specs,
+        "nmdc_deleted",
+        lambda d: {"doc": d},
+        [DeleteMany(spec["filter"]) for spec in specs],
+    )
+    assert len(affected_docs) == 200
+    # One `$or` find for all statements, one backup insert, and one bulk write (rather than a find and a
+    # backup insert per statement).
+    assert len(collection.queries) == 2
+    assert collection.queries[1] == ("bulk_write", 200)
+    assert backup_collection.queries == [("insert_many", 200)]
@@ -0,0 +1,76 @@
+from nmdc_runtime.api.endpoints.find import find_data_objects_by_biosample_id
+
+
+class FakeCollection:
+    r"""Matches documents on one (possibly multivalued) field, counting the queries it serves."""
+
+    def __init__(self, db, field, docs):
+        self.db = db
+        self.field = field
+        self.docs = docs
+
+    def find(self, filter_, projection=None):
+        self.db.n_queries += 1
+        wanted = set(filter_[self.field]["$in"])
+        for doc in self.docs:
+            values = doc.get(self.field)
+            if wanted & set(values if isinstance(values, list) else [values]):
+                yield dict(doc)
+
+
+class FakeDatabase:
+    r"""
+    Holds, for each biosample, the graph: biosample → extraction → processed sample → data generation → data object,
+    plus a workflow execution (informed by the data generation) that outputs a second data object.
+    """
+
+    def __init__(self, n_biosamples):
+        self.n_queries = 0
+        self.biosample_ids = [f"nmdc:bsm-11-{i:08d}" for i in range(n_biosamples)]
+        alldocs, workflow_executions, data_objects = [], [], []
+        for i, biosample_id in enumerate(self.biosample_ids):
+            processed_sample_id = f"nmdc:procsm-11-{i:08d}"
+            data_generation_id = f"nmdc:dgns-11-{i:08d}"
+            raw_data_object_id = f"nmdc:dobj-11-{i:08d}r"
+            data_object_id = f"nmdc:dobj-11-{i:08d}"
+            alldocs += [
+                {
+                    "id": f"nmdc:extrp-11-{i:08d}",
+                    "_type_and_ancestors": ["Extraction", "PlannedProcess"],
+                    "has_input": [biosample_id],
+                    "has_output": [processed_sample_id],
+                },
+                {
+                    "id": data_generation_id,
+                    "_type_and_ancestors": ["DataGeneration", "PlannedProcess"],
+                    "has_input": [processed_sample_id],
+                    "has_output": [raw_data_object_id],
+                },
+            ]
+            workflow_executions.append(
+                {
+                    "id": f"nmdc:wfmsa-11-{i:08d}.1",
+                    "was_informed_by": data_generation_id,
+                    "has_input": [raw_data_object_id],
+                    "has_output": [data_object_id],
+                }
+            )
+            data_objects += [{"id": raw_data_object_id}, {"id": data_object_id}]
+        self.alldocs = FakeCollection(self, "has_input", alldocs)
+        self.workflow_execution_set = FakeCollection(
+            self, "was_informed_by", workflow_executions
+        )
+        self.data_object_set = FakeCollection(self, "id", data_objects)
+
+
+def test_data_objects_of_all_biosamples_are_found_in_one_query_per_hop():
+    for n_biosamples in (1, 100):
+        mdb = FakeDatabase(n_biosamples)
+        data_objects = find_data_objects_by_biosample_id(mdb, mdb.biosample_ids)
+        assert data_objects["nmdc:bsm-11-00000000"] == [
+            {"id": "nmdc:dobj-11-00000000r"},
+            {"id": "nmdc:dobj-11-00000000"},
+        ]
+        assert all(len(d) == 2 for d in data_objects.values())
+        # Two `alldocs` hops, one `was_informed_by` query, and one query for the data objects themselves.
+        assert mdb.n_queries == 4
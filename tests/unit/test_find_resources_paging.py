@@ -0,0 +1,68 @@
+from nmdc_runtime.api.endpoints.util import find_resources
+from nmdc_runtime.api.models.util import FindRequest
+
+
+class FakeCollection:
+    r"""Holds documents having string `id`s, recording the name of each command it serves."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.commands = []
+
+    def _matches(self, doc, filter_):
+        for key, value in filter_.items():
+            if key == "$or":
+                if not any(self._matches(doc, f) for f in value):
+                    return False
+            elif "$gt" in value:
+                if not doc[key] > value["$gt"]:
+                    return False
+            else:  # a `$type` clause, which string `id`s never match
+                return False
+        return True
+
+    def index_information(self):
+        self.commands.append("index_information")
+        return {"_id_": {}, "id_1": {}}
+
+    def count_documents(self, filter):
+        self.commands.append("count_documents")
+        return len(self.docs)
+
+    def find(self, filter, limit, sort, projection):
+        self.commands.append("find")
+        return [
+            dict(d)
+            for d in sorted(self.docs, key=lambda d: d["id"])
+            if self._matches(d, filter)
+        ][:limit]
+
+
+class FakeDatabase:
+    name = "test_find_resources_paging"
+
+    def __init__(self, docs):
+        self.study_set = FakeCollection(docs)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+def test_cursor_pages_after_the_first_cost_one_find_each():
+    mdb = FakeDatabase([{"id": f"nmdc:sty-11-{i:04d}"} for i in range(25)])
+    ids, cursor, commands_per_page = [], "*", []
+    while cursor:
+        rv = find_resources(FindRequest(cursor=cursor, per_page=10), mdb, "study_set")
+        ids += [d["id"] for d in rv["results"]]
+        cursor = rv["meta"]["next_cursor"]
+        commands_per_page.append(mdb.study_set.commands)
+        mdb.study_set.commands = []
+        assert rv["meta"]["count"] == 25
+
+    assert ids == [f"nmdc:sty-11-{i:04d}" for i in range(25)]
+    # No page reads or writes page tokens, and only the first page counts documents.
+    assert commands_per_page == [
+        ["index_information", "count_documents", "find"],
+        ["find"],
+        ["find"],
+    ]
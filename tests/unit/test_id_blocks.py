@@ -0,0 +1,83 @@
+from itertools import count
+
+from nmdc_runtime.api.core import idgen
+
+
+class FakeDeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class FakeIdCollection:
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+        self.docs = {}
+        self.commands = []
+
+    def estimated_document_count(self):
+        self.commands.append("estimated_document_count")
+        return 10**9  # so that the minted ids are long enough not to collide
+
+    def insert_many(self, docs, ordered=True):
+        self.commands.append("insert_many")
+        self.docs.update((d["_id"], d) for d in docs)
+
+    def delete_many(self, filter_):
+        ids = [_id for _id in filter_["_id"]["$in"] if _id in self.docs]
+        for _id in ids:
+            del self.docs[_id]
+        return FakeDeleteResult(len(ids))
+
+
+class FakeDatabase:
+    def __init__(self, name):
+        self.name = name
+        self.collections = {}
+
+    def get_collection(self, name):
+        return self.collections.setdefault(name, FakeIdCollection(self, name))
+
+
+def test_id_blocks_are_refilled_and_released(monkeypatch):
+    serial = count()
+    n_mints = []
+
+    def mint_id_docs(mdb, owner, populator, number, naa, shoulder):
+        n_mints.append(number)
+        docs = [
+            {"_id": i, "where": f"{naa}:{shoulder}{i}"}
+            for i in (next(serial) for _ in range(number))
+        ]
+        mdb.get_collection(idgen.collection_name(naa, shoulder)).docs.update(
+            (d["_id"], d) for d in docs
+        )
+        return docs
+
+    monkeypatch.setattr(idgen, "_mint_id_docs", mint_id_docs)
+    monkeypatch.setattr(idgen, "_reserved_id_docs", idgen.defaultdict(list))
+    mdb, other_mdb = FakeDatabase("a"), FakeDatabase("b")
+
+    ids = [idgen.generate_one_id(mdb) for _ in range(idgen.ID_BLOCK_SIZE + 1)]
+    idgen.generate_one_id(other_mdb)
+    assert len(set(ids)) == len(ids)
+    assert n_mints == [idgen.ID_BLOCK_SIZE] * 3
+
+    # Only the ids reserved in the specified database but not handed out are released.
+    assert idgen.release_reserved_ids(mdb) == idgen.ID_BLOCK_SIZE - 1
+    sys_ids = mdb.get_collection(idgen.collection_name("nmdc", "sys0")).docs
+    assert sorted(d["where"] for d in sys_ids.values()) == sorted(ids)
+    assert idgen.release_reserved_ids(mdb) == 0
+    assert len(
+        other_mdb.get_collection(idgen.collection_name("nmdc", "sys0")).docs
+    ) == (idgen.ID_BLOCK_SIZE)
+
+
+def test_system_ids_are_minted_in_one_insert_per_block(monkeypatch):
+    monkeypatch.setattr(idgen, "_reserved_id_docs", idgen.defaultdict(list))
+    mdb = FakeDatabase("test_system_ids_are_minted_in_one_insert_per_block")
+    ids = [idgen.generate_one_id(mdb) for _ in range(5 * idgen.ID_BLOCK_SIZE)]
+    assert len(set(ids)) == len(ids)
+    # No per-id count or collision check: the unique `_id` index detects collisions on insert.
+    collection = mdb.get_collection(idgen.collection_name("nmdc", "sys0"))
+    assert collection.commands == ["estimated_document_count"] + ["insert_many"] * 5
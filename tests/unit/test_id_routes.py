@@ -0,0 +1,79 @@
+from nmdc_runtime.api.db.mongo import (
+    ID_ROUTES_COLLECTION_NAME,
+    get_collection_name_for_id,
+    get_collection_names_for_ids,
+)
+from nmdc_runtime.util import schema_collection_names_with_id_field
+
+
+class FakeCollection:
+    r"""Matches documents on their `id` (or, for routes, `_id`), counting the queries and documents it serves."""
+
+    def __init__(self, db, key, docs):
+        self.db = db
+        self.key = key
+        self.docs = {d[key]: d for d in docs}
+
+    def _served(self, docs):
+        self.db.n_queries += 1
+        self.db.n_docs_read += len(docs)
+        return docs
+
+    def find(self, filter_, projection=None):
+        ids = filter_[self.key]["$in"]
+        return self._served([self.docs[i] for i in ids if i in self.docs])
+
+    def find_one(self, filter_, projection=None):
+        doc = self.docs.get(filter_[self.key])
+        self._served([doc] if doc else [])
+        return doc
+
+    def bulk_write(self, requests, ordered=True):
+        self.db.n_queries += 1
+        for r in requests:
+            route = dict(r._doc["$set"], _id=r._filter["_id"])
+            self.docs[route["_id"]] = route
+
+    def delete_many(self, filter_):
+        self.db.n_queries += 1
+        for id_ in filter_["_id"]["$in"]:
+            self.docs.pop(id_, None)
+
+
+class FakeDatabase:
+    def __init__(self, n_docs_per_collection):
+        self.n_queries = 0
+        self.n_docs_read = 0
+        self.collections = {
+            name: FakeCollection(
+                self,
+                "id",
+                [{"id": f"{name}:{i}"} for i in range(n_docs_per_collection)],
+            )
+            for name in schema_collection_names_with_id_field()
+        }
+        self.collections[ID_ROUTES_COLLECTION_NAME] = FakeCollection(self, "_id", [])
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+
+def test_routed_ids_are_resolved_in_a_constant_number_of_queries():
+    mdb = FakeDatabase(n_docs_per_collection=1_000)
+    assert get_collection_name_for_id(mdb, "study_set:7") == "study_set"
+
+    # Once routed, resolving an id costs one route lookup plus one confirming query,
+    # no matter how many documents (or collections) there are.
+    mdb.n_queries = mdb.n_docs_read = 0
+    assert get_collection_name_for_id(mdb, "study_set:7") == "study_set"
+    assert (mdb.n_queries, mdb.n_docs_read) == (2, 2)
+
+    ids = [f"{name}:{i}" for name in ("study_set", "biosample_set") for i in range(50)]
+    assert get_collection_names_for_ids(mdb, ids) == {
+        id_: id_.split(":")[0] for id_ in ids
+    }
+    mdb.n_queries = mdb.n_docs_read = 0
+    assert len(get_collection_names_for_ids(mdb, ids)) == 100
+    assert mdb.n_queries == 3  # the routes, then one confirming query per collection
+    assert mdb.n_docs_read == 200
+    assert get_collection_name_for_id(mdb, "nmdc:unknown") is None
@@ -8,6 +8,8 @@ from nmdc_runtime.minter.config import (
     schema_classes,
     typecodes,
     shoulders,
+    typecode_table,
+    get_schema_class_name_for_id,
 )
 from tests.conftest import (
     minting_request,
@@ -30,3 +32,11 @@ def test_draft_identifier():
     assert re.fullmatch(r"nmdc:[a-z]{2,6}-..-.*", did.name)
     assert did.typecode.id in list(pluck("id", typecodes()))
     assert did.shoulder.id in list(pluck("id", shoulders()))
+
+
+def test_typecode_table():
+    table = typecode_table()
+    assert set(table) == set(pluck("name", typecodes()))
+    assert table["bsm"]["collection_names"] == ("biosample_set",)
+    assert get_schema_class_name_for_id("nmdc:dobj-11-abc123") == "DataObject"
+    assert get_schema_class_name_for_id("gold:Gb0123456") is None
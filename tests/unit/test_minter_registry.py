@@ -0,0 +1,92 @@
+import pytest
+
+from nmdc_runtime.minter.adapters.repository import (
+    MinterError,
+    MongoIDStore,
+    forget_minter_registries,
+)
+from nmdc_runtime.minter.config import (
+    schema_classes,
+    services,
+    shoulders,
+    typecodes,
+)
+from nmdc_runtime.minter.domain.model import MintingRequest
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+        self.commands = []
+
+    def find(self, filter_, projection=None):
+        self.commands.append("find")
+        return iter(self.docs)
+
+    def insert_many(self, docs, ordered=True):
+        self.commands.append("insert_many")
+        self.docs.extend(docs)
+
+
+class FakeDatabase:
+    r"""Serves the minter's registry collections, counting how often the registry is (re-)read."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.collections = {
+            "minter.services": FakeCollection(services()),
+            "minter.requesters": FakeCollection([{"id": "nmdc-runtime-site"}]),
+            "minter.schema_classes": FakeCollection(schema_classes()),
+            "minter.typecodes": FakeCollection(typecodes()),
+            "minter.shoulders": FakeCollection(shoulders()),
+            "minter.id_records": FakeCollection([]),
+        }
+        self.n_registry_reads = 0
+
+    def __getitem__(self, name):
+        if name == "minter.services":
+            self.n_registry_reads += 1
+        return self.collections[name]
+
+
+def test_unknown_requesters_do_not_force_a_registry_read_per_request():
+    forget_minter_registries()
+    mdb = FakeDatabase()
+    s = MongoIDStore(mdb)
+    req_mint = MintingRequest(
+        service=services()[0],
+        requester={"id": "nmdc:bogus-requester"},
+        schema_class=schema_classes()[0],
+        how_many=1,
+    )
+    for _ in range(10):
+        with pytest.raises(MinterError):
+            s.mint(req_mint)
+    # One read to populate the snapshot, and one refresh before the requester is remembered as unknown.
+    assert mdb.n_registry_reads == 2
+
+    forget_minter_registries()
+    with pytest.raises(MinterError):
+        s.mint(req_mint)
+    assert mdb.n_registry_reads == 4
+
+
+def test_each_minting_request_costs_one_insert():
+    forget_minter_registries()
+    mdb = FakeDatabase()
+    s = MongoIDStore(mdb)
+    req_mint = MintingRequest(
+        service=services()[0],
+        requester={"id": "nmdc-runtime-site"},
+        schema_class=schema_classes()[0],
+        how_many=100,
+    )
+    for _ in range(10):
+        assert len(set(s.mint_id_names(req_mint))) == 100
+    # The registry is read once, and names are not checked for availability before being inserted.
+    assert mdb.n_registry_reads == 1
+    id_records = mdb["minter.id_records"]
+    assert id_records.commands == ["insert_many"] * 10
+    assert len(id_records.docs) == 1_000
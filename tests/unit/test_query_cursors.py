@@ -0,0 +1,100 @@
+import threading
+from time import monotonic
+
+import pytest
+from fastapi import HTTPException
+
+from nmdc_runtime.api.endpoints import queries
+
+STALE = monotonic() - queries.QUERY_CURSOR_IDLE_TIMEOUT_S - 1
+
+
+class FakeSession:
+    def __init__(self):
+        self.ended = False
+
+    def end_session(self):
+        self.ended = True
+
+
+class FakeDatabase:
+    def command(self, cmd, session=None):
+        assert not session.ended
+        return {"cursor": {"id": cmd.get("getMore", 0), "nextBatch": []}}
+
+
+class LockRacedByIdleCursorCloser:
+    r"""A cursor lock that, just before being acquired, lets the cursor go idle and idle cursors be closed."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entry = None
+
+    def locked(self):
+        return self.lock.locked()
+
+    def __enter__(self):
+        self.entry["last_used"] = STALE
+        queries._close_idle_query_cursors()
+        return self.lock.__enter__()
+
+    def __exit__(self, *args):
+        return self.lock.__exit__(*args)
+
+
+def register_cursor(cursor_id, last_used, lock):
+    entry = {
+        "session": FakeSession(),
+        "db": FakeDatabase(),
+        "collection": "biosample_set",
+        "username": "alice",
+        "last_used": last_used,
+        "n_in_use": 0,
+        "lock": lock,
+    }
+    queries._query_cursors[cursor_id] = entry
+    return entry
+
+
+def test_cursor_being_fetched_from_is_not_closed_as_idle():
+    lock = LockRacedByIdleCursorCloser()
+    in_use = register_cursor(1, monotonic(), lock)
+    lock.entry = in_use
+    idle = register_cursor(2, STALE, threading.Lock())
+    try:
+        queries._get_more(1, None, "alice")
+        assert 1 in queries._query_cursors and not in_use["session"].ended
+        assert 2 not in queries._query_cursors and idle["session"].ended
+        assert in_use["n_in_use"] == 0
+
+        with pytest.raises(HTTPException):
+            queries._get_more(1, None, "bob")
+    finally:
+        queries._query_cursors.clear()
+
+
+class FakeClient:
+    def start_session(self):
+        return FakeSession()
+
+
+class FakeCursorDatabase:
+    client = FakeClient()
+
+    def __init__(self):
+        self.commands = []
+
+    def command(self, cmd, session=None):
+        self.commands.append(cmd)
+        cursor = {"id": 7, "ns": "nmdc.biosample_set", "firstBatch": [{"id": "x"}]}
+        return {"ok": 1, "cursor": cursor}
+
+
+def test_cursors_are_not_held_unless_enabled(monkeypatch):
+    monkeypatch.setattr(queries, "QUERY_CURSORS_ENABLED", False)
+    mdb = FakeCursorDatabase()
+    q_response = queries._run_cursor_command({"find": "biosample_set"}, mdb, "alice")
+    assert q_response["cursor"]["id"] == 0
+    assert q_response["cursor"]["partialResultsReturned"]
+    assert mdb.commands[-1] == {"killCursors": "biosample_set", "cursors": [7]}
+    assert not queries._query_cursors